@@ -58,6 +58,13 @@ USE_ANTHROPIC = bool(ANTHROPIC_API_KEY)
 
 
 # ── SET UP LLM CLIENTS ─────────────────────────────────────────────────
+# Each client is created ONCE, here, and shared by every agent instance
+# and every call. The SDK clients keep a pool of open HTTP connections,
+# so the orchestrator's concurrent batch calls reuse warm keep-alive
+# connections instead of paying a fresh TLS handshake per batch. The
+# SDK's default pool (100 keep-alive connections) is far above
+# MAX_CONCURRENT_BATCHES, so it needs no tuning. Never construct a
+# client inside an agent or per request — that throws the pool away.
 
 # OpenRouter client (primary) — uses the OpenAI SDK pointed at OpenRouter's URL.
 openrouter_client = None
@@ -99,6 +106,9 @@ class _Block(dict):
     can handle dicts natively). Attribute access (block.type, block.text)
     is supported via __getattr__ for compatibility with the agentic loop.
     """
+    # All data lives in the dict itself — no per-block __dict__ needed
+    __slots__ = ()
+
     def __init__(self, block_type, **kwargs):
         super().__init__(type=block_type, **kwargs)
 
@@ -130,7 +140,8 @@ class _ContentList(list):
     _messages_to_openai() can replay the exact original message instead
     of reconstructing it from the blocks.
     """
-    pass
+    # The one extra attribute we carry — a slot instead of a per-list __dict__
+    __slots__ = ('_openai_message_dict',)
 
 
 class _AdaptedResponse:
@@ -148,6 +159,10 @@ class _AdaptedResponse:
 
     This class bridges the gap.
     """
+    # One of these is built per LLM call, and it only ever has these two
+    # attributes — slots make it smaller and skip the instance __dict__
+    __slots__ = ('stop_reason', 'content')
+
     def __init__(self, openai_response):
         choice = openai_response.choices[0]
         message = choice.message
@@ -337,6 +352,12 @@ class BaseAgent:
                    and returns the final answer
     """
 
+    # The attributes every agent has live in fixed slots rather than the
+    # instance __dict__. Subclasses don't declare __slots__, so they still
+    # get a __dict__ for their own extras (and for tests that patch
+    # methods on an instance).
+    __slots__ = ('system_prompt', 'tools', 'conversation_history', 'on_retry')
+
     def __init__(self):
         self.system_prompt = "You are a helpful assistant."
         self.tools = []
@@ -478,7 +499,8 @@ class BaseAgent:
 
     # ── THE AGENTIC LOOP ─────────────────────────────────────────────
 
-    def run(self, user_message: str, max_tool_rounds: int = 10) -> str:
+    def run(self, user_message: str, max_tool_rounds: int = 10,
+            on_tool_call=None) -> str:
         """
         THE AGENTIC LOOP — the heart of every agent.
 
@@ -494,6 +516,11 @@ class BaseAgent:
            b) Final text — it has an answer
               → We return it
         4. Safety limit: max_tool_rounds prevents infinite loops
+
+        on_tool_call is an optional function(tool_name, tool_args) run just
+        before each tool call, so a caller can show what the agent is doing
+        while it works. It's an argument rather than an attribute because
+        one agent can serve several requests at once.
         """
         # Step 1: Add the user's message to history
         self.conversation_history.append({
@@ -521,6 +548,8 @@ class BaseAgent:
                 for block in response.content:
                     if block.type == "tool_use":
                         print(f"   [TOOL] Calling tool: {block.name}")
+                        if on_tool_call is not None:
+                            on_tool_call(block.name, block.input)
 
                         try:
                             result = self.execute_tool(block.name, block.input)
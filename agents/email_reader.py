@@ -27,6 +27,10 @@ import json
 import sys
 from pathlib import Path
 
+# "threading" gives each worker thread its own conversation history
+# (see the conversation_history property below)
+import threading
+
 # This line adds the project root folder to Python's import search path.
 # Without this, Python wouldn't know where to find "agents.base_agent"
 # or "tools.gmail_tools" when running this file directly.
@@ -41,36 +45,11 @@ from agents.base_agent import BaseAgent
 from tools.gmail_tools import fetch_emails
 
 
-# ── THE EMAIL READER AGENT CLASS ──────────────────────────────────────
-
-class EmailReaderAgent(BaseAgent):
-    """
-    Agent 1: Reads emails and extracts observations about the user.
-
-    This class "inherits from" (is built on top of) BaseAgent.
-    That means it automatically gets the agentic loop (run() method).
-    It just needs to define three things:
-        1. Its system prompt (what role Claude plays)
-        2. Its tools (what functions it can call)
-        3. How to execute those tools
-    """
-
-    def __init__(self):
-        """
-        Set up the Email Reader Agent with its prompt and tools.
-
-        "super().__init__()" calls the BaseAgent's __init__ first,
-        which sets up conversation_history and other defaults.
-        Then we override the prompt and tools with our specific ones.
-        """
-        # Call the parent class's setup first
-        super().__init__()
-
-        # ── The System Prompt ──────────────────────────────────
-        # This is a detailed instruction telling Claude exactly what
-        # role to play and what output format to produce.
-        # Think of it as a job description for the AI.
-        self.system_prompt = """You are the Email Reader Agent in a multi-agent system.
+# ── The System Prompt ──────────────────────────────────────────────
+# This is a detailed instruction telling Claude exactly what
+# role to play and what output format to produce.
+# Think of it as a job description for the AI.
+_SYSTEM_PROMPT = """You are the Email Reader Agent in a multi-agent system.
 
 YOUR ROLE: Fetch emails and produce a structured analysis of what they reveal about the user.
 
@@ -249,52 +228,98 @@ IMPORTANT RULES:
 - CRITICAL: If a decision/commitment mentions people, create SEPARATE person observations for each person mentioned
 """
 
-        # ── Tool Definitions ───────────────────────────────────
-        # "self.tools" is a list of tool schemas that tell Claude what
-        # tools are available. Each schema has:
-        #   - name: what to call the tool
-        #   - description: what the tool does (Claude reads this!)
-        #   - input_schema: what arguments the tool accepts
-        #
-        # This follows the MCP (Model Context Protocol) format —
-        # the standard way to describe tools for AI agents.
-        self.tools = [
-            {
-                # The tool's name — Claude uses this to request the tool
-                "name": "read_emails",
-
-                # Description — Claude reads this to understand when/how
-                # to use the tool. Be clear and specific!
-                "description": (
-                    "Fetch emails from Gmail. Returns list of emails with "
-                    "subject, sender, date, body, and labels."
-                ),
-
-                # Input schema — defines what arguments the tool accepts.
-                # This follows JSON Schema format (a standard for describing
-                # data structures).
-                "input_schema": {
-                    "type": "object",  # The input is a dictionary/object
-                    "properties": {
-                        "max_results": {
-                            "type": "integer",
-                            "description": "Max emails to fetch (default: 50)",
-                            "default": 50
-                        },
-                        "query": {
-                            "type": "string",
-                            "description": "Gmail search query (e.g., 'is:important')",
-                            "default": ""
-                        },
-                        "days_back": {
-                            "type": "integer",
-                            "description": "Fetch from last N days (default: 30)",
-                            "default": 30
-                        }
-                    }
+# ── Tool Definitions ───────────────────────────────────────────────
+# "_TOOLS" is a list of tool schemas that tell Claude what
+# tools are available. Each schema has:
+#   - name: what to call the tool
+#   - description: what the tool does (Claude reads this!)
+#   - input_schema: what arguments the tool accepts
+#
+# This follows the MCP (Model Context Protocol) format —
+# the standard way to describe tools for AI agents.
+_TOOLS = [
+    {
+        # The tool's name — Claude uses this to request the tool
+        "name": "read_emails",
+
+        # Description — Claude reads this to understand when/how
+        # to use the tool. Be clear and specific!
+        "description": (
+            "Fetch emails from Gmail. Returns list of emails with "
+            "subject, sender, date, body, and labels."
+        ),
+
+        # Input schema — defines what arguments the tool accepts.
+        # This follows JSON Schema format (a standard for describing
+        # data structures).
+        "input_schema": {
+            "type": "object",  # The input is a dictionary/object
+            "properties": {
+                "max_results": {
+                    "type": "integer",
+                    "description": "Max emails to fetch (default: 50)",
+                    "default": 50
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Gmail search query (e.g., 'is:important')",
+                    "default": ""
+                },
+                "days_back": {
+                    "type": "integer",
+                    "description": "Fetch from last N days (default: 30)",
+                    "default": 30
                 }
             }
-        ]
+        }
+    }
+]
+
+# ── Batch Prompt Template ──────────────────────────────────────────────
+# The message analyze_batch() sends for each pre-fetched batch. Only the
+# batch numbers and the email JSON change between batches.
+_BATCH_PROMPT_TEMPLATE = (
+    "You are processing email batch {batch_num} of {total_batches}. "
+    "The emails below have already been fetched — analyze them directly "
+    "without calling the read_emails tool.\n\n"
+    "EMAILS:\n{emails_json}"
+)
+
+
+# ── THE EMAIL READER AGENT CLASS ──────────────────────────────────────
+
+class EmailReaderAgent(BaseAgent):
+    """
+    Agent 1: Reads emails and extracts observations about the user.
+
+    This class "inherits from" (is built on top of) BaseAgent.
+    That means it automatically gets the agentic loop (run() method).
+    It just needs to define three things:
+        1. Its system prompt (what role Claude plays)
+        2. Its tools (what functions it can call)
+        3. How to execute those tools
+    """
+
+    def __init__(self):
+        """
+        Set up the Email Reader Agent with its prompt and tools.
+
+        "super().__init__()" calls the BaseAgent's __init__ first,
+        which sets up conversation_history and other defaults.
+        Then we override the prompt and tools with our specific ones.
+        """
+        # Per-thread storage for conversation history. Must exist before
+        # super().__init__(), which assigns conversation_history.
+        self._local = threading.local()
+
+        # Call the parent class's setup first
+        super().__init__()
+
+        # Both are module-level constants, built once at import time and
+        # shared by every instance — constructing an agent (or resetting it
+        # between batches) never rebuilds them.
+        self.system_prompt = _SYSTEM_PROMPT
+        self.tools = _TOOLS
 
     def execute_tool(self, tool_name: str, tool_args: dict) -> str:
         """
@@ -331,6 +356,22 @@ IMPORTANT RULES:
         # If Claude asked for a tool we don't have, raise an error
         raise ValueError(f"Unknown tool: {tool_name}")
 
+    # ── Thread-local conversation history ─────────────────────
+    # The orchestrator analyzes several batches at the same time, each on
+    # its own thread but all through this one agent. Keeping the history
+    # per thread means those runs never see (or wipe) each other's
+    # messages. Each batch starts from a fresh history anyway.
+    @property
+    def conversation_history(self) -> list:
+        """This thread's conversation history."""
+        if not hasattr(self._local, 'history'):
+            self._local.history = []
+        return self._local.history
+
+    @conversation_history.setter
+    def conversation_history(self, value: list):
+        self._local.history = value
+
     def analyze_batch(self, emails_json: str, batch_num: int, total_batches: int) -> str:
         """
         Analyze a pre-fetched batch of emails without calling the read_emails tool.
@@ -351,11 +392,10 @@ IMPORTANT RULES:
         # Without this, previous batches would accumulate and eventually overflow.
         self.reset()
 
-        prompt = (
-            f"You are processing email batch {batch_num} of {total_batches}. "
-            f"The emails below have already been fetched — analyze them directly "
-            f"without calling the read_emails tool.\n\n"
-            f"EMAILS:\n{emails_json}"
+        prompt = _BATCH_PROMPT_TEMPLATE.format(
+            batch_num=batch_num,
+            total_batches=total_batches,
+            emails_json=emails_json,
         )
 
         return self.run(prompt)
@@ -31,13 +31,14 @@ from agents.base_agent import BaseAgent
 
 # Import memory vault functions — these handle the actual file operations.
 # "write_memory" creates or updates a memory file
+# "write_memory_batch" writes several memory files in one call
 # "read_memory" reads a specific memory file (used to load existing people files)
 # "search_vault" searches existing files (to check for duplicates)
 # "list_memories" lists all files in a category
 # "get_vault_stats" counts memories per category
 # "MEMORY_TYPES" is the list of valid categories
 from memory.vault import (
-    write_memory, read_memory, search_vault, list_memories,
+    write_memory, write_memory_batch, read_memory, search_vault, list_memories,
     get_vault_stats, MEMORY_TYPES
 )
 
@@ -72,6 +73,7 @@ For "people" observations, there is also a "person_data" object with structured
 
 YOUR PROCESS FOR NON-PEOPLE OBSERVATIONS:
 1. For each observation, call write_memory to create a memory file
+   (or write_memories to write several observations in one call)
    (the vault handles duplicate detection automatically — if a similar memory
    already exists, the vault will merge instead of creating a duplicate)
 2. Choose appropriate wiki-links (related_to) to connect related memories
@@ -232,7 +234,8 @@ When you receive a Knowledge Index in your prompt, USE IT to resolve entities:
 """
 
         # ── Tool Definitions ───────────────────────────────────
-        # This agent has FIVE tools: write, read, search, list, and stats.
+        # This agent has SIX tools: write, batch write, read, search, list,
+        # and stats.
         # For people: search → read (if exists) → merge → write.
         # For others: search (dedup check) → write.
         self.tools = [
@@ -378,12 +381,35 @@ When you receive a Knowledge Index in your prompt, USE IT to resolve entities:
             }
         ]
 
+        # Batch version of write_memory: same fields per memory, but many
+        # memories in one tool call. Saves a full LLM round-trip per file.
+        self.tools.insert(1, {
+            "name": "write_memories",
+            "description": (
+                "Write or update several memory files in one call. Each item "
+                "takes the same fields as write_memory. Prefer this when you "
+                "have multiple observations ready to write."
+            ),
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "memories": {
+                        "type": "array",
+                        "items": self.tools[0]["input_schema"],
+                        "description": "The memories to write"
+                    }
+                },
+                "required": ["memories"]
+            }
+        })
+
     def execute_tool(self, tool_name: str, tool_args: dict) -> str:
         """
         Run the requested tool and return the result.
 
-        This method handles five tools:
+        This method handles six tools:
         - write_memory:   Create or update a memory file in the vault
+        - write_memories: Create or update several memory files at once
         - read_memory:    Read a specific memory file (for merge workflows)
         - search_vault:   Search existing memories (for duplicate checking)
         - list_memories:  List all memories in a category
@@ -395,9 +421,18 @@ When you receive a Knowledge Index in your prompt, USE IT to resolve entities:
             # It takes the dictionary {"title": "X", "memory_type": "Y", ...}
             # and passes each key-value pair as a separate argument to the function.
             # It's shorthand for: write_memory(title="X", memory_type="Y", ...)
-            filepath = write_memory(**tool_args)
+            #
+            # update_graph=False: the Memory Writer only runs inside
+            # build_memory(), which rebuilds the graph once after this
+            # agent finishes — rebuilding after every write is wasted work.
+            filepath = write_memory(**tool_args, update_graph=False)
             return f"Memory written to: {filepath}"
 
+        elif tool_name == "write_memories":
+            # Same as write_memory, for a list of memories
+            filepaths = write_memory_batch(tool_args['memories'], update_graph=False)
+            return "Memories written to:\n" + "\n".join(filepaths)
+
         elif tool_name == "read_memory":
             # Read a specific memory file — used to load existing person files
             # before merging in new data from fresh observations.
@@ -207,10 +207,13 @@ class ReconciliationAgent(BaseAgent):
             return f"Memory written to: {filepath}"
 
         elif tool_name == "fetch_sent_emails":
+            # Matching replies needs the headers and the opening of each
+            # reply (the snippet), not full bodies — skip downloading them
             emails = fetch_emails(
                 max_results=tool_args.get('max_results', 100),
                 query='in:sent',
                 days_back=tool_args.get('days_back', 30),
+                need_body=False,
             )
             return json.dumps(emails, indent=2, default=str)
 
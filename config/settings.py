@@ -43,7 +43,7 @@ CREDENTIALS_PATH = CONFIG_DIR / "credentials.json"
 
 # "TOKEN_PATH" is where we save the Gmail login token after you authenticate.
 # Once saved, you won't need to log in again (until the token expires).
-TOKEN_PATH = CONFIG_DIR / "token.pickle"
+TOKEN_PATH = CONFIG_DIR / "token.json"
 
 
 # ── LLM (Large Language Model) SETTINGS ────────────────────────────────
@@ -95,6 +95,12 @@ DEFAULT_DAYS_BACK = 180
 # well within Claude's limits.
 EMAIL_BATCH_SIZE = 10
 
+# "MAX_CONCURRENT_BATCHES" is how many batches are analyzed at the same
+# time. Each batch is one slow LLM round-trip, so overlapping a few of
+# them cuts total build time. Keep it modest — more parallel calls means
+# more 429 rate-limit retries.
+MAX_CONCURRENT_BATCHES = 4
+
 # ── RETRY SETTINGS ──────────────────────────────────────────────────
 # These control how the system retries when the Claude API is overloaded
 # or rate-limited. Uses exponential backoff: wait 1s, 2s, 4s, 8s, 16s.
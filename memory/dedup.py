@@ -8,14 +8,19 @@
 #
 # Two matching strategies:
 #   - People: exact match on the `name` frontmatter field (case-insensitive)
-#   - Non-people: normalized title containment + fuzzy matching (SequenceMatcher)
+#   - Non-people: normalized title containment + fuzzy matching (RapidFuzz)
 #
 # Also provides merge logic and a one-time cleanup function for existing dupes.
 # ============================================================================
 
+import os
 import re
+import copy
 import yaml
-from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from rapidfuzz import fuzz, process
 from datetime import datetime
 from pathlib import Path
 
@@ -25,12 +30,17 @@ VAULT_ROOT = Path('vault')
 # Words stripped during title normalization (common email prefixes + articles)
 FILLER_WORDS = {'the', 'a', 'an', 're', 'fw', 'fwd'}
 
-# Fuzzy match threshold — titles with SequenceMatcher ratio >= this are dupes
+# Fuzzy match threshold — titles with similarity ratio >= this are dupes
 FUZZY_THRESHOLD = 0.70
 
 # Content similarity threshold — below this, new content is appended during merge
 CONTENT_SIMILARITY_THRESHOLD = 0.85
 
+# Thread count for reading vault files in parallel during cleanup. File
+# reads spend their time waiting on the disk (the GIL is released), so
+# we use more threads than CPU cores, capped to avoid thrashing.
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 # Minimum length for a new section to be considered "substantive" enough to
 # replace an existing section during merge.  Short stubs like "N/A" or
 # "No information" should not overwrite richer existing content.
@@ -148,32 +158,136 @@ def normalize_title(title: str) -> str:
     return ' '.join(words)
 
 
+# ============================================================================
+# FUZZY SIMILARITY
+# ============================================================================
+
+def _similarity(a: str, b: str, cutoff: float = 0.0) -> float:
+    """
+    How similar two strings are, from 0.0 (nothing shared) to 1.0 (identical).
+
+    Uses RapidFuzz's ratio — the same 2 * matches / total_length measure
+    as difflib's SequenceMatcher, but computed in C with bit-parallel
+    algorithms, so it's many times faster on long strings. RapidFuzz
+    counts the true longest common subsequence, so it can score slightly
+    higher than difflib's greedy matching blocks.
+
+    Args:
+        a, b:   The strings to compare.
+        cutoff: Scores below this come back as 0.0, which lets RapidFuzz
+                stop early once the threshold can't be reached.
+    """
+    return fuzz.ratio(a, b, score_cutoff=cutoff * 100) / 100
+
+
 # ============================================================================
 # FRONTMATTER PARSING (lightweight, no full vault.read_memory dependency)
 # ============================================================================
 
+# ── Per-build stat cache ─────────────────────────────────────────────
+# The caches below check a file's mtime and size before reusing a parsed
+# result, so a single build_memory() run stats the same files again and
+# again (every dedup check, every graph rebuild). Within one run, the
+# vault only changes through code that calls _forget_frontmatter() right
+# after writing, so inside a stat_cache_scope() each file is stat'd once
+# and the result reused until it is forgotten. Outside a scope (the
+# default) every call goes to the disk as before.
+#
+# A ContextVar keeps the scope private to the thread that opened it —
+# a concurrent request, or a worker thread, never sees another run's
+# stats. Maps file path -> os.stat_result.
+_run_stats: ContextVar[dict | None] = ContextVar('_run_stats', default=None)
+
+
+@contextmanager
+def stat_cache_scope():
+    """Reuse file stats for the duration of the with block (one build)."""
+    token = _run_stats.set({})
+    try:
+        yield
+    finally:
+        _run_stats.reset(token)
+
+
+def _cached_stat(filepath: Path) -> os.stat_result:
+    """
+    os.stat() a file, reusing the result inside a stat_cache_scope().
+
+    Raises OSError like os.stat() if the file is missing (failures are
+    never cached).
+    """
+    stats = _run_stats.get()
+    if stats is None:
+        return os.stat(filepath)
+
+    key = str(filepath)
+    st = stats.get(key)
+    if st is None:
+        st = stats[key] = os.stat(filepath)
+    return st
+
+
+# Parsed frontmatter, keyed by file path: {path: (mtime_ns, size, frontmatter)}.
+# Every write_memory() dedup check and every cleanup pass parses the
+# frontmatter of each file in a folder, and most of those files haven't
+# changed since the last time. YAML parsing is slow, so we keep the
+# parsed result and reuse it while the file's mtime and size match.
+_frontmatter_cache: dict[str, tuple[int, int, dict]] = {}
+
+
+def _forget_frontmatter(filepath: Path):
+    """Drop a file's cached frontmatter (call after rewriting the file)."""
+    _frontmatter_cache.pop(str(filepath), None)
+
+    stats = _run_stats.get()
+    if stats is not None:
+        stats.pop(str(filepath), None)
+
+    # The file's name may have changed too — re-index it on next lookup
+    index = _name_index.get(str(filepath.parent))
+    if index is not None:
+        index['stale'].add(filepath.name)
+
+
 def _parse_frontmatter(filepath: Path) -> dict:
     """
     Read a markdown file and return its YAML frontmatter as a dict.
     Returns empty dict on any error.
+
+    Results are cached until the file's mtime or size changes. Callers
+    get their own copy, so modifying the returned dict is safe.
     """
+    key = str(filepath)
     try:
-        text = filepath.read_text(encoding='utf-8')
-    except (OSError, UnicodeDecodeError):
+        st = _cached_stat(filepath)
+    except OSError:
+        _frontmatter_cache.pop(key, None)
         return {}
 
-    if not text.startswith('---'):
-        return {}
+    cached = _frontmatter_cache.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return copy.deepcopy(cached[2])
 
-    parts = text.split('---', 2)
-    if len(parts) < 3:
-        return {}
+    # Lazy import: vault.py imports from this module
+    from memory.vault import _load_yaml, _read_frontmatter_text
 
+    # Read just the frontmatter block — the body can be long and
+    # isn't needed here
     try:
-        return yaml.safe_load(parts[1]) or {}
-    except yaml.YAMLError:
+        yaml_text = _read_frontmatter_text(filepath)
+    except (OSError, UnicodeDecodeError):
         return {}
 
+    frontmatter = {}
+    if yaml_text is not None:
+        try:
+            frontmatter = _load_yaml(yaml_text) or {}
+        except yaml.YAMLError:
+            frontmatter = {}
+
+    _frontmatter_cache[key] = (st.st_mtime_ns, st.st_size, frontmatter)
+    return copy.deepcopy(frontmatter)
+
 
 def _parse_body(filepath: Path) -> str:
     """
@@ -194,6 +308,77 @@ def _parse_body(filepath: Path) -> str:
     return parts[2].strip()
 
 
+def _read_frontmatters(files: list[Path]) -> dict[Path, dict]:
+    """
+    Parse the frontmatter of many files at once, reading them in parallel.
+
+    Returns:
+        Dict mapping each path to its frontmatter (empty dict on error).
+    """
+    with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(files) or 1)) as pool:
+        return dict(zip(files, pool.map(_parse_frontmatter, files)))
+
+
+# ── People name index ─────────────────────────────────────────────────
+# Every people write checks whether that person already has a file. Most
+# of the time the match is an exact cleaned name, so we keep a
+# {cleaned name: filename} map per people folder and try it first —
+# one dict lookup instead of walking the folder.
+#
+# Maps folder path -> {'names': {name: filename}, 'files': {filename: name},
+# 'stale': filenames rewritten since they were indexed}.
+_name_index: dict[str, dict] = {}
+
+
+def _index_person_file(index: dict, folder: Path, filename: str):
+    """(Re)index one people file under its current cleaned name."""
+    old_name = index['files'].pop(filename, None)
+    if old_name is not None and index['names'].get(old_name) == filename:
+        del index['names'][old_name]
+
+    if not (folder / filename).exists():
+        return
+    fm = _parse_frontmatter(folder / filename)
+    clean = clean_person_name(str(fm.get('name', '')).strip()).lower()
+    if clean:
+        index['files'][filename] = clean
+        index['names'].setdefault(clean, filename)
+
+
+def _lookup_person(folder: Path, search_clean: str) -> Path | None:
+    """
+    Find the file whose cleaned name is exactly search_clean, via the index.
+
+    Builds the folder's index on first use. A hit is checked against the
+    file's current frontmatter, so a stale entry never yields a wrong
+    match — callers fall back to a full scan on None.
+    """
+    key = str(folder)
+    index = _name_index.get(key)
+    if index is None:
+        from memory.vault import _list_md_raw
+        index = {'names': {}, 'files': {}, 'stale': set()}
+        for filename in _list_md_raw(folder):
+            _index_person_file(index, folder, filename)
+        _name_index[key] = index
+    else:
+        while index['stale']:
+            _index_person_file(index, folder, index['stale'].pop())
+
+    filename = index['names'].get(search_clean)
+    if filename is None:
+        return None
+
+    md_file = folder / filename
+    fm = _parse_frontmatter(md_file)
+    if clean_person_name(str(fm.get('name', '')).strip()).lower() == search_clean:
+        return md_file
+
+    # Changed behind our back (e.g., edited outside the app) — rebuild next time
+    _name_index.pop(key, None)
+    return None
+
+
 # ============================================================================
 # DUPLICATE FINDING
 # ============================================================================
@@ -255,7 +440,15 @@ def _find_people_duplicate(title: str, name: str | None, folder: Path) -> Path |
         if me_file.exists():
             return me_file
 
-    for md_file in folder.glob('*.md'):
+    # Fast path: exact cleaned-name match from the index
+    indexed = _lookup_person(folder, search_clean)
+    if indexed is not None:
+        return indexed
+
+    from memory.vault import _list_md_raw
+
+    for filename in _list_md_raw(folder):
+        md_file = folder / filename
         fm = _parse_frontmatter(md_file)
         existing_raw = str(fm.get('name', '')).strip()
         existing_clean = clean_person_name(existing_raw).lower()
@@ -280,7 +473,7 @@ def _find_people_duplicate(title: str, name: str | None, folder: Path) -> Path |
 def _find_non_people_duplicate(title: str, memory_type: str, folder: Path) -> Path | None:
     """
     Find a duplicate non-people file by normalized title containment,
-    word-set overlap, or fuzzy matching (SequenceMatcher >= FUZZY_THRESHOLD).
+    word-set overlap, or fuzzy matching (similarity >= FUZZY_THRESHOLD).
 
     Multiple strategies are used to handle:
     - Different word order: "AITX Meetup Feb" vs "Feb Meetup AITX"
@@ -295,7 +488,10 @@ def _find_non_people_duplicate(title: str, memory_type: str, folder: Path) -> Pa
     incoming_compact = incoming_norm.replace(' ', '')
     incoming_words = set(incoming_norm.split())
 
-    for md_file in folder.glob('*.md'):
+    from memory.vault import _list_md_raw
+
+    for filename in _list_md_raw(folder):
+        md_file = folder / filename
         fm = _parse_frontmatter(md_file)
         existing_title = fm.get('title', '')
         if not existing_title:
@@ -323,19 +519,19 @@ def _find_non_people_duplicate(title: str, memory_type: str, folder: Path) -> Pa
 
         # Check 3: sorted-word fuzzy similarity (handles different word order
         # plus acronym variations — sorting removes order sensitivity,
-        # SequenceMatcher handles partial matches like "aitx" ≈ "ai" + "tx")
+        # fuzzy matching handles partial matches like "aitx" ≈ "ai" + "tx")
         incoming_sorted = ' '.join(sorted(incoming_words))
         existing_sorted = ' '.join(sorted(existing_words))
-        sorted_ratio = SequenceMatcher(None, incoming_sorted, existing_sorted).ratio()
+        sorted_ratio = _similarity(incoming_sorted, existing_sorted, FUZZY_THRESHOLD)
         if sorted_ratio >= FUZZY_THRESHOLD:
             return md_file
 
         # Check 4: raw fuzzy similarity (with and without spaces)
-        ratio = SequenceMatcher(None, incoming_norm, existing_norm).ratio()
+        ratio = _similarity(incoming_norm, existing_norm, FUZZY_THRESHOLD)
         if ratio >= FUZZY_THRESHOLD:
             return md_file
 
-        compact_ratio = SequenceMatcher(None, incoming_compact, existing_compact).ratio()
+        compact_ratio = _similarity(incoming_compact, existing_compact, FUZZY_THRESHOLD)
         if compact_ratio >= FUZZY_THRESHOLD:
             return md_file
 
@@ -435,6 +631,15 @@ def _extract_dated_entries(ki_content: str) -> dict[str, str]:
 # CONTENT MERGING
 # ============================================================================
 
+# Frontmatter fields holding lists, merged as a set union
+_LIST_FIELDS = ('tags', 'related_to', 'source_emails', 'source_memories')
+
+# People-specific scalar fields that should be UPDATED (not just gap-filled)
+# when new data provides a non-empty value.  These represent current state
+# that can change (e.g., a promotion changes role/organization).
+_UPDATABLE_SCALARS = {'role', 'organization', 'email', 'phone', 'location', 'timezone'}
+
+
 def merge_contents(
     existing_path: Path,
     new_content: str,
@@ -452,6 +657,27 @@ def merge_contents(
         new_content:      The new markdown body content.
         new_frontmatter:  Dict of new frontmatter fields to merge.
 
+    Returns:
+        (merged_frontmatter, merged_body_content)
+    """
+    return _merge_many(existing_path, [(new_content, new_frontmatter)])
+
+
+def _merge_many(
+    existing_path: Path,
+    updates: list[tuple[str, dict]],
+) -> tuple[dict, str]:
+    """
+    Merge several (content, frontmatter) updates into an existing file.
+
+    Same result as calling merge_contents() once per update and writing
+    the file in between, but the file is read once and each list field
+    is unioned in a single pass over all updates.
+
+    Args:
+        existing_path: Path to the existing vault file.
+        updates:       (new_content, new_frontmatter) pairs, in merge order.
+
     Returns:
         (merged_frontmatter, merged_body_content)
     """
@@ -461,23 +687,27 @@ def merge_contents(
     # ── Merge frontmatter ─────────────────────────────────────
     merged_fm = dict(existing_fm)
 
-    # People-specific scalar fields that should be UPDATED (not just gap-filled)
-    # when new data provides a non-empty value.  These represent current state
-    # that can change (e.g., a promotion changes role/organization).
-    _UPDATABLE_SCALARS = {'role', 'organization', 'email', 'phone', 'location', 'timezone'}
-
-    for key, new_val in new_frontmatter.items():
-        if key in ('tags', 'related_to', 'source_emails', 'source_memories'):
-            # List fields: union as sets
-            existing_list = merged_fm.get(key, []) or []
-            new_list = new_val if isinstance(new_val, list) else []
-            merged_fm[key] = sorted(set(existing_list) | set(new_list))
-        elif key in _UPDATABLE_SCALARS and new_val:
-            # Updatable scalars: always prefer the latest non-empty value
-            merged_fm[key] = new_val
-        elif not merged_fm.get(key) and new_val:
-            # Other scalar fields: only fill if existing is empty/falsy
-            merged_fm[key] = new_val
+    for _, new_frontmatter in updates:
+        for key, new_val in new_frontmatter.items():
+            if key in _LIST_FIELDS:
+                continue  # Unioned below, across all updates at once
+            elif key in _UPDATABLE_SCALARS and new_val:
+                # Updatable scalars: always prefer the latest non-empty value
+                merged_fm[key] = new_val
+            elif not merged_fm.get(key) and new_val:
+                # Other scalar fields: only fill if existing is empty/falsy
+                merged_fm[key] = new_val
+
+    # List fields: one set union over the existing list plus every
+    # update's list (only for fields the updates actually mention)
+    for key in _LIST_FIELDS:
+        new_lists = [fm[key] for _, fm in updates if key in fm]
+        if not new_lists:
+            continue
+        existing_list = merged_fm.get(key, []) or []
+        merged_fm[key] = sorted(set(existing_list).union(
+            *(new_list for new_list in new_lists if isinstance(new_list, list))
+        ))
 
     # Always update the 'updated' timestamp
     merged_fm['updated'] = datetime.now().strftime('%Y-%m-%d')
@@ -488,16 +718,17 @@ def merge_contents(
     # Strip the leading # heading from existing body before merging.
     # write_memory() adds its own # heading from frontmatter, so we must
     # not return one — otherwise the heading gets duplicated.
-    existing_body_clean = re.sub(r'^#\s+[^\n]+\n*', '', existing_body.strip()).strip()
+    merged_body = re.sub(r'^#\s+[^\n]+\n*', '', existing_body.strip()).strip()
 
-    # Also strip any leading # heading from new content (LLM sometimes
-    # includes it even though write_memory adds one).
-    new_content_clean = re.sub(r'^#\s+[^\n]+\n*', '', new_content.strip()).strip()
+    for new_content, _ in updates:
+        # Also strip any leading # heading from new content (LLM sometimes
+        # includes it even though write_memory adds one).
+        new_content_clean = re.sub(r'^#\s+[^\n]+\n*', '', new_content.strip()).strip()
 
-    if memory_type in ('people', 'person'):
-        merged_body = _merge_people_content(existing_body_clean, new_content_clean)
-    else:
-        merged_body = _merge_generic_content(existing_body_clean, new_content_clean)
+        if memory_type in ('people', 'person'):
+            merged_body = _merge_people_content(merged_body, new_content_clean)
+        else:
+            merged_body = _merge_generic_content(merged_body, new_content_clean)
 
     return merged_fm, merged_body
 
@@ -631,7 +862,7 @@ def _merge_generic_content(existing_body: str, new_body: str) -> str:
     existing_stripped = re.sub(r'^#\s+[^\n]+\n*', '', existing_body.strip()).strip()
     new_stripped = new_body.strip()
 
-    ratio = SequenceMatcher(None, existing_stripped, new_stripped).ratio()
+    ratio = _similarity(existing_stripped, new_stripped, CONTENT_SIMILARITY_THRESHOLD)
 
     if ratio >= CONTENT_SIMILARITY_THRESHOLD:
         return existing_body
@@ -662,7 +893,7 @@ def cleanup_duplicates() -> dict:
     Returns:
         Stats dict: {"merged": int, "deleted": int, "by_type": {...}}
     """
-    from memory.vault import MEMORY_TYPES
+    from memory.vault import MEMORY_TYPES, _list_md_raw
 
     stats = {'merged': 0, 'deleted': 0, 'by_type': {}}
 
@@ -671,14 +902,18 @@ def cleanup_duplicates() -> dict:
         if not folder.exists():
             continue
 
-        files = sorted(folder.glob('*.md'))
+        files = [folder / filename for filename in sorted(_list_md_raw(folder))]
         if len(files) < 2:
             continue
 
+        # Read every file's frontmatter once, up front and in parallel.
+        # Grouping, sorting and merging below all reuse these results.
+        frontmatters = _read_frontmatters(files)
+
         if memory_type == 'people':
-            groups = _group_people_files(files)
+            groups = _group_people_files(files, frontmatters)
         else:
-            groups = _group_non_people_files(files)
+            groups = _group_non_people_files(files, frontmatters)
 
         type_deleted = 0
         type_merged = 0
@@ -690,7 +925,7 @@ def cleanup_duplicates() -> dict:
             # Sort by date — oldest first (canonical).
             # Special case: me.md is ALWAYS canonical for "me" group,
             # regardless of date, because it's the singleton filename.
-            group_files.sort(key=lambda f: _parse_frontmatter(f).get('date', '9999'))
+            group_files.sort(key=lambda f: frontmatters[f].get('date', '9999'))
             me_file = next((f for f in group_files if f.name == 'me.md'), None)
             if me_file:
                 canonical = me_file
@@ -699,18 +934,17 @@ def cleanup_duplicates() -> dict:
                 canonical = group_files[0]
                 duplicates = group_files[1:]
 
-            # Merge each duplicate into canonical
-            for dup_path in duplicates:
-                dup_fm = _parse_frontmatter(dup_path)
-                dup_body = _parse_body(dup_path)
-
-                merged_fm, merged_body = merge_contents(canonical, dup_body, dup_fm)
-
-                # Rewrite canonical with merged data
-                _rewrite_file(canonical, merged_fm, merged_body)
+            # Merge every duplicate into canonical, then write it once
+            merged_fm, merged_body = _merge_many(canonical, [
+                (_parse_body(dup_path), frontmatters[dup_path])
+                for dup_path in duplicates
+            ])
+            _rewrite_file(canonical, merged_fm, merged_body)
 
+            for dup_path in duplicates:
                 # Delete the duplicate
                 dup_path.unlink()
+                _forget_frontmatter(dup_path)
 
                 # Remove from _index.md
                 _remove_from_index(dup_path)
@@ -724,19 +958,30 @@ def cleanup_duplicates() -> dict:
             stats['merged'] += type_merged
             stats['deleted'] += type_deleted
 
+    if stats['deleted'] > 0:
+        # Files were removed, so the cached per-type counts are stale —
+        # and the whole pass counts as one change to the vault
+        from memory.vault import _bump_vault_generation, invalidate_vault_stats
+        _bump_vault_generation()
+        invalidate_vault_stats()
+
     return stats
 
 
-def _group_people_files(files: list[Path]) -> dict[str, list[Path]]:
+def _group_people_files(files: list[Path],
+                        frontmatters: dict[Path, dict] | None = None) -> dict[str, list[Path]]:
     """Group people files by cleaned, normalized name.
 
     Special handling: any file whose cleaned name is "me" OR whose
     filename is "me.md" gets grouped under the "me" key, so all
     "Me" variants merge into the canonical me.md file.
+
+    If "frontmatters" (path -> parsed frontmatter) is given, it's used
+    instead of re-reading each file.
     """
     groups = {}
     for f in files:
-        fm = _parse_frontmatter(f)
+        fm = frontmatters[f] if frontmatters is not None else _parse_frontmatter(f)
         raw_name = str(fm.get('name', '')).strip()
         name = clean_person_name(raw_name).lower() if raw_name else f.stem
 
@@ -752,18 +997,23 @@ def _group_people_files(files: list[Path]) -> dict[str, list[Path]]:
     return groups
 
 
-def _group_non_people_files(files: list[Path]) -> dict[str, list[Path]]:
+def _group_non_people_files(files: list[Path],
+                            frontmatters: dict[Path, dict] | None = None) -> dict[str, list[Path]]:
     """
     Group non-people files by fuzzy title clustering.
 
     Uses a simple leader-based clustering: each file is compared to existing
     group leaders. If it matches any leader (containment or fuzzy >= threshold),
     it joins that group. Otherwise it becomes a new group leader.
+
+    If "frontmatters" (path -> parsed frontmatter) is given, it's used
+    instead of re-reading each file.
     """
-    groups = {}  # leader_norm_title -> [files]
+    groups = {}   # leader_norm_title -> [files]
+    leaders = []  # the same leader titles, in the order they were created
 
     for f in files:
-        fm = _parse_frontmatter(f)
+        fm = frontmatters[f] if frontmatters is not None else _parse_frontmatter(f)
         title = fm.get('title', '')
         if not title:
             continue
@@ -772,25 +1022,39 @@ def _group_non_people_files(files: list[Path]) -> dict[str, list[Path]]:
         if not norm:
             continue
 
-        matched_leader = None
-        for leader_norm in groups:
-            # Containment check
-            if norm in leader_norm or leader_norm in norm:
-                matched_leader = leader_norm
-                break
-            # Fuzzy check
-            if SequenceMatcher(None, norm, leader_norm).ratio() >= FUZZY_THRESHOLD:
-                matched_leader = leader_norm
-                break
+        matched_leader = _first_matching_leader(norm, leaders)
 
         if matched_leader:
             groups[matched_leader].append(f)
         else:
             groups[norm] = [f]
+            leaders.append(norm)
 
     return groups
 
 
+def _first_matching_leader(norm: str, leaders: list[str]) -> str | None:
+    """
+    Return the first leader (in order) that contains or is contained in
+    `norm`, or is at least FUZZY_THRESHOLD similar to it.
+
+    The fuzzy comparisons — the expensive part — run in one RapidFuzz call
+    that loops over the leaders in C and stops at the first one over the
+    threshold. Only the leaders before that one still need the (cheap)
+    containment check.
+    """
+    fuzzy_hit = next(process.extract_iter(
+        norm, leaders, scorer=fuzz.ratio, score_cutoff=FUZZY_THRESHOLD * 100
+    ), None)
+    stop = fuzzy_hit[2] if fuzzy_hit else len(leaders)
+
+    for leader in leaders[:stop]:
+        if norm in leader or leader in norm:
+            return leader
+
+    return fuzzy_hit[0] if fuzzy_hit else None
+
+
 def _rewrite_file(filepath: Path, frontmatter: dict, body: str):
     """Rewrite a vault file with updated frontmatter and body."""
     # Clean person names before rewriting (skip me.md — it stores the real name)
@@ -814,6 +1078,7 @@ def _rewrite_file(filepath: Path, frontmatter: dict, body: str):
 {body}
 """
     filepath.write_text(content, encoding='utf-8')
+    _forget_frontmatter(filepath)
 
 
 def _remove_from_index(deleted_path: Path):
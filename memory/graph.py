@@ -6,7 +6,8 @@
 # map of all relationships between memories in the vault.
 #
 # The graph is stored as `vault/_graph.json` and rebuilt after every
-# vault write. It enables:
+# vault write. Rebuilds only re-read files that changed since the last
+# one (see the parse cache below). It enables:
 #   - Bidirectional links: if A references B, B knows about A
 #   - Graph traversal: find all entities connected within N hops
 #   - Backlink injection: update file frontmatter with reverse links
@@ -18,6 +19,9 @@ from datetime import datetime
 from pathlib import Path
 from collections import deque
 
+from memory.dedup import _cached_stat, _forget_frontmatter
+from memory.vault import _list_md_raw, _load_yaml, _read_frontmatter_text
+
 # Vault root — same as vault.py
 VAULT_ROOT = Path('vault')
 
@@ -27,6 +31,72 @@ MEMORY_CATEGORIES = ['decisions', 'people', 'commitments', 'action_required']
 GRAPH_FILE = VAULT_ROOT / '_graph.json'
 
 
+# ── PARSE CACHE ────────────────────────────────────────────────────────
+# rebuild_graph() runs after every vault write, but a write only changes
+# one or two files. So we remember what each file parsed to — its node
+# and its outgoing links — and only re-read a file when its mtime or size
+# changes. A rebuild then costs one stat() per file plus the in-memory
+# edge resolution, instead of reading and parsing the whole vault.
+#
+# Maps file path -> (mtime_ns, size, (node, links, related_to))
+_node_cache = {}
+
+
+def _scan_file(md_file: Path, category: str):
+    """
+    Parse one memory file into its graph node and outgoing links.
+
+    Uses the parse cache when the file hasn't changed since it was last
+    read. Returns None if the file has disappeared.
+
+    Returns:
+        (node, links, related_to) — links is a list of (target, relation)
+        pairs; related_to is the file's current related_to list.
+    """
+    key = str(md_file)
+    try:
+        st = _cached_stat(md_file)
+    except OSError:
+        _node_cache.pop(key, None)
+        return None
+
+    cached = _node_cache.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    # Parse YAML frontmatter (the body isn't needed, so it isn't read)
+    frontmatter = {}
+    yaml_text = _read_frontmatter_text(md_file)
+    if yaml_text is not None:
+        try:
+            frontmatter = _load_yaml(yaml_text) or {}
+        except yaml.YAMLError:
+            pass
+
+    # Build node
+    title = frontmatter.get('title') or frontmatter.get('name', md_file.stem)
+    node = {
+        'title': title,
+        'type': category,
+        'date': str(frontmatter.get('date', '')),
+    }
+    # Add type-specific fields
+    if category == 'action_required':
+        node['quadrant'] = frontmatter.get('quadrant', '')
+    else:
+        node['priority'] = frontmatter.get('priority', '')
+
+    # Outgoing links from related_to and source_memories
+    related_to = frontmatter.get('related_to', [])
+    links = [(entity, 'related_to') for entity in related_to]
+    links.extend((mem_path, 'source_memory')
+                 for mem_path in frontmatter.get('source_memories', []))
+
+    entry = (node, links, related_to)
+    _node_cache[key] = (st.st_mtime_ns, st.st_size, entry)
+    return entry
+
+
 def rebuild_graph() -> dict:
     """
     Scan all vault files, build a bidirectional adjacency map,
@@ -34,7 +104,8 @@ def rebuild_graph() -> dict:
 
     Process:
     1. Scan all .md files across all memory type folders
-    2. Parse YAML frontmatter from each file
+    2. Parse YAML frontmatter from each file (cached — only changed
+       files are re-read)
     3. Build nodes (one per file) and edges (from related_to + source_memories)
     4. Add reverse edges (backlinks) for every forward edge
     5. Write _graph.json
@@ -45,6 +116,7 @@ def rebuild_graph() -> dict:
     """
     nodes = {}
     forward_edges = []  # (from_path, to_entity_or_path, relation)
+    related = {}        # rel_path -> current related_to list
 
     # ── Step 1-2: Scan files and parse frontmatter ──────────
     for category in MEMORY_CATEGORIES:
@@ -52,42 +124,18 @@ def rebuild_graph() -> dict:
         if not folder.exists():
             continue
 
-        for md_file in folder.glob('*.md'):
-            rel_path = md_file.relative_to(VAULT_ROOT).as_posix()
-            text = md_file.read_text(encoding='utf-8')
-
-            # Parse YAML frontmatter
-            frontmatter = {}
-            if text.startswith('---'):
-                parts = text.split('---', 2)
-                if len(parts) >= 3:
-                    try:
-                        frontmatter = yaml.safe_load(parts[1]) or {}
-                    except yaml.YAMLError:
-                        pass
-
-            # Build node
-            title = frontmatter.get('title') or frontmatter.get('name', md_file.stem)
-            node = {
-                'title': title,
-                'type': category,
-                'date': str(frontmatter.get('date', '')),
-            }
-            # Add type-specific fields
-            if category == 'action_required':
-                node['quadrant'] = frontmatter.get('quadrant', '')
-            else:
-                node['priority'] = frontmatter.get('priority', '')
-
-            nodes[rel_path] = node
-
-            # Collect forward edges from related_to
-            for entity in frontmatter.get('related_to', []):
-                forward_edges.append((rel_path, entity, 'related_to'))
-
-            # Collect forward edges from source_memories
-            for mem_path in frontmatter.get('source_memories', []):
-                forward_edges.append((rel_path, mem_path, 'source_memory'))
+        for name in _list_md_raw(folder):
+            entry = _scan_file(folder / name, category)
+            if entry is None:
+                continue
+            node, links, related_to = entry
+
+            rel_path = f"{category}/{name}"
+            # Copy so callers can't modify the cached node
+            nodes[rel_path] = dict(node)
+            related[rel_path] = related_to
+            forward_edges.extend((rel_path, target, relation)
+                                 for target, relation in links)
 
     # ── Step 3: Build a title-to-filepath lookup ─────────────
     title_to_path = {}
@@ -136,17 +184,24 @@ def rebuild_graph() -> dict:
     GRAPH_FILE.write_text(json.dumps(graph, indent=2), encoding='utf-8')
 
     # ── Step 6: Inject backlinks into file frontmatter ────────
-    _inject_backlinks(nodes, edges)
+    _inject_backlinks(nodes, edges, related)
 
     return graph
 
 
-def _inject_backlinks(nodes: dict, edges: list):
+def _inject_backlinks(nodes: dict, edges: list, related: dict = None):
     """
     For each file in the vault, ensure its related_to frontmatter
     includes all entities that reference it (backlinks).
 
     Only modifies frontmatter — never touches the markdown body.
+
+    Args:
+        nodes:   Graph nodes, keyed by relative file path.
+        edges:   Resolved graph edges (forward and reverse).
+        related: Optional map of relative path -> the file's current
+                 related_to list. Files whose list already holds every
+                 backlink are skipped without being read.
     """
     backlink_map = {}
     for edge in edges:
@@ -158,6 +213,9 @@ def _inject_backlinks(nodes: dict, edges: list):
                 backlink_map.setdefault(target_file, set()).add(source_title)
 
     for filepath, titles_to_add in backlink_map.items():
+        if related is not None and titles_to_add <= set(related.get(filepath, ())):
+            continue
+
         full_path = VAULT_ROOT / filepath
         if not full_path.exists():
             continue
@@ -171,7 +229,7 @@ def _inject_backlinks(nodes: dict, edges: list):
             continue
 
         try:
-            frontmatter = yaml.safe_load(parts[1]) or {}
+            frontmatter = _load_yaml(parts[1]) or {}
         except yaml.YAMLError:
             continue
 
@@ -188,6 +246,7 @@ def _inject_backlinks(nodes: dict, edges: list):
         body = parts[2]
         updated_text = f"---\n{yaml_str.strip()}\n---{body}"
         full_path.write_text(updated_text, encoding='utf-8')
+        _forget_frontmatter(full_path)
 
 
 def get_graph() -> dict:
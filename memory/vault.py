@@ -30,6 +30,13 @@ import json
 # and update the vault index.
 import re
 
+# "mmap" maps a file straight into memory, so big files can be sliced
+# without first copying them into a Python bytes object.
+import mmap
+
+# "copy" makes deep copies, so callers can't change a cached dict
+import copy
+
 # "hashlib" provides hashing functions. A "hash" is like a fingerprint
 # for data — it turns any text into a short, unique code. We use it
 # to make sure filenames are unique.
@@ -42,6 +49,9 @@ from datetime import datetime
 # "Path" makes file path handling easy and cross-platform.
 from pathlib import Path
 
+# "Iterator" is a type hint for functions that "yield" values one by one
+from typing import Iterator
+
 # "yaml" lets us read and write YAML — a human-friendly data format.
 # We use it for the "frontmatter" (metadata) at the top of each memory file.
 # YAML looks like this:
@@ -53,6 +63,242 @@ import yaml
 from memory.changelog import append_changelog
 
 
+# ── YAML LOADING ───────────────────────────────────────────────────────
+# Every memory file's frontmatter gets parsed — by dedup, the graph and
+# the index — so YAML loading is a hot spot. PyYAML's C loader (backed by
+# libyaml) parses the same documents as safe_load many times faster.
+# It's only present when PyYAML was built with libyaml, so fall back to
+# the pure-Python SafeLoader otherwise.
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _load_yaml(text: str):
+    """
+    Parse a YAML string — same result and errors as yaml.safe_load(),
+    but using the faster C loader when it's available.
+
+    Frontmatter in the simple shape write_memory() produces skips the
+    YAML parser entirely (see _parse_simple_yaml below).
+    """
+    data = _parse_simple_yaml(text)
+    if data is not None:
+        return data
+    return yaml.load(text, Loader=_YAML_LOADER)
+
+
+# ── FAST FRONTMATTER PARSING ───────────────────────────────────────────
+# The frontmatter write_memory() produces is a flat list of
+# "key: value" lines, where each value is a string or a "- item" list
+# of strings. Even the C loader builds a full YAML event stream for
+# that. _parse_simple_yaml reads this shape directly, line by line.
+# It gives up (returns None) on anything else (numbers, dates, nested
+# maps, block scalars, tags, comments, wrapped lines...), and
+# _load_yaml then hands the text to the real parser. The fast path only
+# ever returns what safe_load would.
+
+# Characters the line-by-line reading can't handle like YAML does: tabs
+# (yaml.dump never writes raw ones), line breaks other than "\n" and
+# "\r\n", and the characters PyYAML refuses to read at all (so those
+# keep raising the same error)
+_UNSIMPLE_CHARS_RE = re.compile(
+    '\t|\r(?!\n)|[\x85\u2028\u2029]|' + yaml.reader.Reader.NON_PRINTABLE.pattern
+)
+# PyYAML won't read a key longer than 1024 characters (ScannerError), so
+# longer ones go to the real parser to fail there the same way
+_SIMPLE_KEY_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]{0,1023}\Z')
+_SINGLE_QUOTED_RE = re.compile(r"'((?:[^']|'')*)'\Z")
+_DOUBLE_QUOTED_RE = re.compile(r'"((?:[^"\\]|\\.)*)"\Z')
+_ESCAPE_RE = re.compile(
+    r'\\(?:x([0-9A-Fa-f]{2})|u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))'
+)
+_SIMPLE_ESCAPES = {'\\': '\\', '"': '"', '/': '/', 'n': '\n', 't': '\t', '0': '\0'}
+
+# Characters that give a plain (unquoted) value a special meaning when
+# they come first — anything starting with one goes to the real parser
+_PLAIN_INDICATORS = frozenset('-?:,[]{}#&*!|>\'"%@`')
+
+# PyYAML's own rules for what an unquoted word means ("yes" is a bool,
+# "2026-02-19" a date, "12" an int, ...). Only plain strings stay fast.
+_RESOLVER = yaml.resolver.Resolver()
+_STR_TAG = 'tag:yaml.org,2002:str'
+
+
+class _NotSimple(Exception):
+    """Raised inside _parse_simple_yaml when the text needs the real parser."""
+
+
+def _unescape(match: re.Match) -> str:
+    hex_digits = match.group(1) or match.group(2) or match.group(3)
+    if hex_digits:
+        return chr(int(hex_digits, 16))
+    try:
+        return _SIMPLE_ESCAPES[match.group(4)]
+    except KeyError:
+        raise _NotSimple from None
+
+
+def _parse_simple_scalar(value: str) -> str:
+    """Parse one quoted or plain string value, or raise _NotSimple."""
+    first = value[:1]
+    if first == "'":
+        match = _SINGLE_QUOTED_RE.match(value)
+        if match is None:
+            raise _NotSimple
+        return match.group(1).replace("''", "'")
+    if first == '"':
+        match = _DOUBLE_QUOTED_RE.match(value)
+        if match is None:
+            raise _NotSimple
+        return _ESCAPE_RE.sub(_unescape, match.group(1))
+    if (not value or first in _PLAIN_INDICATORS or ': ' in value
+            or ' #' in value or value.endswith(':')
+            or _RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) != _STR_TAG):
+        raise _NotSimple
+    return value
+
+
+def _parse_simple_yaml(text: str) -> dict | None:
+    """
+    Parse frontmatter made only of "key: string" and "key:" + "- string"
+    lines, without the YAML parser.
+
+    Returns:
+        The same dict yaml.safe_load() would return, or None if the text
+        uses anything beyond that shape.
+    """
+    if _UNSIMPLE_CHARS_RE.search(text):
+        return None
+
+    data = {}
+    list_key = None  # the "key:" whose "- item" lines we're collecting
+    try:
+        for line in text.split('\n'):
+            line = line.rstrip()
+            if not line:
+                continue
+            if line.startswith('- '):
+                if list_key is None:
+                    raise _NotSimple
+                if data[list_key] is None:
+                    data[list_key] = []
+                data[list_key].append(_parse_simple_scalar(line[2:].lstrip(' ')))
+                continue
+
+            key, colon, value = line.partition(':')
+            if (not colon or not _SIMPLE_KEY_RE.match(key)
+                    or (value and value[0] != ' ')
+                    or _RESOLVER.resolve(yaml.ScalarNode, key, (True, False)) != _STR_TAG):
+                raise _NotSimple
+            value = value.lstrip(' ')
+            if not value:
+                # "key:" alone is null in YAML — unless "- item" lines follow
+                data[key] = None
+                list_key = key
+                continue
+            list_key = None
+            if value == '[]':
+                data[key] = []
+            else:
+                data[key] = _parse_simple_scalar(value)
+    except _NotSimple:
+        return None
+    return data or None
+
+
+# Frontmatter sits at the very top of a memory file and is almost always
+# well under this size, so reading this much is usually enough.
+_FRONTMATTER_READ_SIZE = 4096
+
+# Matches a leading "---", then everything up to the next "---" (the
+# same boundaries as text.split('---', 2)). Compiled once, and run on
+# raw bytes so only the YAML itself ever gets decoded.
+_FRONTMATTER_RE = re.compile(rb'---(.*?)---', re.DOTALL)
+
+
+def _read_frontmatter_text(filepath: Path) -> str | None:
+    """
+    Return the raw YAML between a file's opening and closing "---",
+    without reading the (possibly long) markdown body.
+
+    Reads only the first 4 KiB; falls back to reading the whole file when
+    the frontmatter is longer than that. The result is the same as
+    text.split('---', 2)[1] on the full text.
+
+    Returns:
+        The YAML text, or None if the file has no frontmatter.
+
+    Raises:
+        OSError, UnicodeDecodeError: If the file can't be read or decoded.
+    """
+    with open(filepath, 'rb') as f:
+        head = f.read(_FRONTMATTER_READ_SIZE)
+        match = _FRONTMATTER_RE.match(head)
+        if (match is None and head.startswith(b'---')
+                and len(head) == _FRONTMATTER_READ_SIZE):
+            # Frontmatter runs past the first chunk — read the rest
+            head += f.read()
+            match = _FRONTMATTER_RE.match(head)
+
+    if match is None:
+        return None
+    # "---" is plain ASCII, so the match never splits a UTF-8 character
+    return match.group(1).decode('utf-8')
+
+
+# Memory files bigger than this are memory-mapped by _split_memory_file.
+# For the usual few-KB note, mapping costs more than a plain read.
+_MMAP_THRESHOLD = 16 * 1024
+
+
+def _split_memory_file(filepath: Path) -> tuple[str | None, str]:
+    """
+    Split a memory file into its raw YAML frontmatter and markdown body.
+
+    Gives the same result as text.split('---', 2) on the full text:
+    (parts[1], parts[2].strip()), or (None, text) when the file has no
+    frontmatter. The "---" delimiters are found on the raw bytes and only
+    the two slices are decoded; files over _MMAP_THRESHOLD are
+    memory-mapped instead of read.
+
+    Raises:
+        OSError, UnicodeDecodeError: If the file can't be read or decoded.
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                split = _split_frontmatter_bytes(mm)
+        else:
+            split = _split_frontmatter_bytes(f.read())
+    if split is not None:
+        return split
+
+    # Carriage returns: let a text-mode read turn "\r\n" into "\n" first
+    text = filepath.read_text(encoding='utf-8')
+    # Check if the file starts with "---" (has frontmatter)
+    if text.startswith('---'):
+        # Split on "---" — this gives us: ['', 'yaml stuff', 'content stuff']
+        parts = text.split('---', 2)  # Split into at most 3 parts
+        if len(parts) >= 3:
+            # The content is everything after the second "---"
+            return parts[1], parts[2].strip()
+    return None, text
+
+
+def _split_frontmatter_bytes(buf) -> tuple[str | None, str] | None:
+    """
+    The _split_memory_file() result for a file's raw bytes (or mmap), or
+    None if the file has carriage returns and needs a text-mode read.
+    """
+    if buf.find(b'\r') != -1:
+        return None
+    # Two C-level scans: the opening "---" and the next one after it
+    end = buf.find(b'---', 3) if buf[:3] == b'---' else -1
+    if end == -1:
+        return None, buf[:].decode('utf-8')
+    # "---" is plain ASCII, so neither slice splits a UTF-8 character
+    return buf[3:end].decode('utf-8'), buf[end + 3:].decode('utf-8').strip()
+
+
 # ── CONSTANTS ──────────────────────────────────────────────────────────
 
 # "VAULT_ROOT" is the folder where all memory files are stored.
@@ -233,6 +479,9 @@ def write_memory(
     phone: str = None,
     location: str = None,
     timezone: str = None,
+    # Set to False when the caller rebuilds the graph itself after a run
+    # of writes (see write_memory_batch)
+    update_graph: bool = True,
 ) -> str:
     """
     Create or update a memory file in the vault.
@@ -263,6 +512,9 @@ def write_memory(
         phone:         (People only) Person's phone number.
         location:      (People only) Person's city/region.
         timezone:      (People only) Person's timezone.
+        update_graph:  Rebuild the knowledge graph after writing (default).
+                       Pass False when many writes are followed by a
+                       single rebuild_graph() call.
 
     Returns:
         str: The file path where the memory was saved.
@@ -282,7 +534,9 @@ def write_memory(
     # Programmatic safety net: catch duplicates the LLM missed.
     # If a matching file already exists, redirect the write there
     # instead of creating a new file with a different slug.
-    from memory.dedup import find_duplicate, merge_contents as dedup_merge, clean_person_name
+    from memory.dedup import (
+        find_duplicate, merge_contents as dedup_merge, clean_person_name, _forget_frontmatter
+    )
 
     duplicate_path = find_duplicate(title, memory_type, name=name)
 
@@ -361,12 +615,10 @@ def write_memory(
         original_date = today
         if filepath.exists():
             try:
-                text = filepath.read_text(encoding='utf-8')
-                if text.startswith('---'):
-                    parts = text.split('---', 2)
-                    if len(parts) >= 3:
-                        fm = yaml.safe_load(parts[1]) or {}
-                        original_date = fm.get('date', today)
+                yaml_text = _read_frontmatter_text(filepath)
+                if yaml_text is not None:
+                    fm = _load_yaml(yaml_text) or {}
+                    original_date = fm.get('date', today)
             except Exception:
                 pass
 
@@ -544,6 +796,12 @@ def write_memory(
 
     # ── Write to disk ──────────────────────────────────────────
     filepath.write_text(file_content, encoding='utf-8')
+    _bump_vault_generation()
+    invalidate_vault_stats()
+    invalidate_memory_list()
+    _forget_frontmatter(filepath)
+    _search_cache.pop(str(filepath), None)
+    _read_cache.pop(str(filepath), None)
 
     # ── Update the master index ────────────────────────────────
     update_index(
@@ -555,8 +813,9 @@ def write_memory(
     # ── Rebuild the knowledge graph ─────────────────────────────
     # This keeps the graph index up-to-date with every write,
     # including injecting backlinks into related files.
-    from memory.graph import rebuild_graph
-    rebuild_graph()
+    if update_graph:
+        from memory.graph import rebuild_graph
+        rebuild_graph()
 
     # ── Log to changelog ───────────────────────────────────────
     # Determine if this was a create or update.
@@ -577,10 +836,49 @@ def write_memory(
     return str(filepath)
 
 
+def write_memory_batch(memories: list[dict], update_graph: bool = True) -> list[str]:
+    """
+    Write several memories, rebuilding the knowledge graph once at the end.
+
+    write_memory() rebuilds the whole graph after every write, which means
+    re-scanning the vault each time. When writing many memories in a row,
+    that scan only needs to happen once, after the last write.
+
+    Args:
+        memories:     List of dicts, each holding write_memory() arguments
+                      (title, memory_type, content, ...).
+        update_graph: Rebuild the graph after the batch (default). Pass False
+                      if the caller rebuilds it afterwards anyway.
+
+    Returns:
+        list[str]: The file path of each written memory, in input order.
+
+    Raises:
+        ValueError: If any memory has an invalid memory_type. Memories
+                    before it in the list have already been written.
+    """
+    filepaths = [write_memory(**memory, update_graph=False) for memory in memories]
+
+    if update_graph and filepaths:
+        from memory.graph import rebuild_graph
+        rebuild_graph()
+
+    return filepaths
+
+
 # ============================================================================
 # READING MEMORIES
 # ============================================================================
 
+# ── READ CACHE ─────────────────────────────────────────────────────────
+# The web UI re-opens the same memories over and over, and agents read
+# the same files several times per build. Parsing YAML is the slow part,
+# so read_memory() keeps each file's parsed (frontmatter, content) and
+# reuses it while the file's mtime and size are unchanged.
+# {path: (mtime_ns, size, (frontmatter, content))}
+_read_cache: dict[str, tuple[int, int, tuple[dict, str]]] = {}
+
+
 def read_memory(filepath: str) -> dict | None:
     """
     Read a memory file and return its metadata and content separately.
@@ -602,6 +900,10 @@ def read_memory(filepath: str) -> dict | None:
             'filepath': '...'      ← The full file path
         }
         Returns None if the file doesn't exist.
+
+    Parsed files are cached until their mtime or size changes (see
+    _read_cache). The returned frontmatter is a fresh copy, so callers
+    may modify it.
     """
     # Convert the string path to a Path object for easier handling
     full_path = Path(filepath)
@@ -610,42 +912,129 @@ def read_memory(filepath: str) -> dict | None:
     if not full_path.is_absolute():
         full_path = VAULT_ROOT / filepath
 
-    # Check if the file exists
-    if not full_path.exists():
+    # Check if the file exists (the stat also keys the cache below)
+    key = str(full_path)
+    try:
+        st = os.stat(full_path)
+    except FileNotFoundError:
+        _read_cache.pop(key, None)
         return None
 
-    # Read the entire file as text
-    text = full_path.read_text(encoding='utf-8')
+    # Unchanged since we last parsed it? Reuse that parse
+    cached = _read_cache.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        frontmatter, content = cached[2]
+        return {
+            'frontmatter': copy.deepcopy(frontmatter),
+            'content': content,
+            'filepath': key,
+        }
 
     # ── Parse the YAML frontmatter ─────────────────────────────
     # Frontmatter is the section between two "---" lines at the top.
     # We need to split it from the rest of the content.
-    frontmatter = {}  # Default: empty metadata
-    content = text     # Default: entire file is content
+    yaml_text, content = _split_memory_file(full_path)
 
-    # Check if the file starts with "---" (has frontmatter)
-    if text.startswith('---'):
-        # Split on "---" — this gives us: ['', 'yaml stuff', 'content stuff']
-        parts = text.split('---', 2)  # Split into at most 3 parts
+    frontmatter = {}  # Default: empty metadata
+    if yaml_text is not None:
+        try:
+            # Parse the YAML section into a Python dictionary
+            frontmatter = _load_yaml(yaml_text) or {}
+        except yaml.YAMLError:
+            # If the YAML is malformed, just skip it
+            pass
 
-        if len(parts) >= 3:
-            try:
-                # Parse the YAML section (parts[1]) into a Python dictionary
-                frontmatter = yaml.safe_load(parts[1]) or {}
-            except yaml.YAMLError:
-                # If the YAML is malformed, just skip it
-                pass
-            # The content is everything after the second "---"
-            content = parts[2].strip()
+    _read_cache[key] = (st.st_mtime_ns, st.st_size, (frontmatter, content))
 
-    # Return the parsed result
+    # Return the parsed result (callers get their own frontmatter copy)
     return {
-        'frontmatter': frontmatter,
+        'frontmatter': copy.deepcopy(frontmatter),
         'content': content,
-        'filepath': str(full_path),
+        'filepath': key,
     }
 
 
+# ── WRITE GENERATION ───────────────────────────────────────────────────
+# A counter that goes up exactly once per change to the vault: each
+# write_memory() call, and each dedup pass that merges files. Callers
+# that keep vault data for a while without re-checking the files — the
+# web app's response cache — put it in their cache keys, so their copies
+# end with the next write. The invalidate_* functions below only clear
+# caches; they don't count as changes themselves.
+_write_generation = {'count': 0}
+
+
+def vault_generation() -> int:
+    """Return the vault's write counter (see above)."""
+    return _write_generation['count']
+
+
+def _bump_vault_generation():
+    """Count one change to the vault (call once per write, not per cache)."""
+    _write_generation['count'] += 1
+
+
+# ── LISTING CACHE ──────────────────────────────────────────────────────
+# list_memories() reads every memory file, while the web app asks for the
+# listing every time the vault view opens. Each result is remembered,
+# per memory_type, along with a "key": the name, mtime and size of every
+# .md file it covered. Checking the key only needs a stat per file
+# instead of a read and YAML parse. Unlike the folder mtimes used for the
+# stats cache, it also catches files rewritten in place.
+_list_cache = {}  # memory_type -> (key, etag, memories)
+
+
+def invalidate_memory_list():
+    """
+    Forget the cached listings so the next list_memories() rescans.
+
+    Called after every memory write, like invalidate_vault_stats().
+    """
+    _list_cache.clear()
+
+
+def _memory_list_key(types_to_scan: list[str]) -> tuple:
+    """Build the listing cache key: every .md file's name, mtime and size."""
+    key = [str(VAULT_ROOT)]
+    for mtype in types_to_scan:
+        files = []
+        try:
+            with os.scandir(VAULT_ROOT / mtype) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.md'):
+                        st = entry.stat()
+                        files.append((entry.name, st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            pass
+        files.sort()
+        key.append((mtype, tuple(files)))
+    return tuple(key)
+
+
+def list_memories_with_etag(memory_type: str = None) -> tuple[list[dict], str]:
+    """
+    Like list_memories(), but also return an ETag for the listing.
+
+    The ETag (a short quoted hash of the cache key) changes whenever any
+    listed file is added, removed or modified, so the web app can answer
+    "304 Not Modified" to a browser that already has this listing.
+
+    Returns:
+        (memories, etag)
+    """
+    types_to_scan = [memory_type] if memory_type else MEMORY_TYPES
+    key = _memory_list_key(types_to_scan)
+
+    cached = _list_cache.get(memory_type)
+    if cached is None or cached[0] != key:
+        etag = '"' + hashlib.blake2b(repr(key).encode('utf-8'), digest_size=8).hexdigest() + '"'
+        cached = (key, etag, _scan_memories(types_to_scan))
+        _list_cache[memory_type] = cached
+
+    # Hand back copies so callers can't modify the cached entries
+    return [dict(m) for m in cached[2]], cached[1]
+
+
 def list_memories(memory_type: str = None) -> list[dict]:
     """
     List all memories in the vault, with basic info about each one.
@@ -667,13 +1056,17 @@ def list_memories(memory_type: str = None) -> list[dict]:
             'priority': '🟡',
             'tags': ['contact', 'work']
         }
+
+    Results are cached until a listed file changes (see _list_cache).
     """
+    return list_memories_with_etag(memory_type)[0]
+
+
+def _scan_memories(types_to_scan: list[str]) -> list[dict]:
+    """Read the summary entries for list_memories() from disk."""
     # "memories" will collect all the results
     memories = []
 
-    # Decide which folders to scan: just one type, or all of them
-    types_to_scan = [memory_type] if memory_type else MEMORY_TYPES
-
     # Loop through each memory type folder
     for mtype in types_to_scan:
         # Build the folder path: vault/people, vault/decisions, etc.
@@ -717,6 +1110,75 @@ def list_memories(memory_type: str = None) -> list[dict]:
 # SEARCHING
 # ============================================================================
 
+# ── SEARCH CACHE ───────────────────────────────────────────────────────
+# search_vault() looks at the full text of every memory, and the agents
+# call it constantly (the Memory Writer once per person it checks), so
+# reading the whole vault from disk on every query dominated its cost.
+# Instead we keep each file's text — plus the lowercase copy we match
+# against, and the title and priority the results show — keyed by path,
+# and reuse it while the file's mtime and size match. A search then only
+# stats each file and re-reads the ones that changed: after a build,
+# just the new and updated memories. {path: (mtime_ns, size, entry)}
+_search_cache: dict[str, tuple[int, int, dict]] = {}
+
+
+def _load_search_entry(memory_type: str, filename: str) -> dict | None:
+    """Read one memory for the search cache (None if it has vanished)."""
+    try:
+        text = (VAULT_ROOT / memory_type / filename).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+    # Read the file's frontmatter for metadata
+    mem = read_memory(f"{memory_type}/{filename}")
+    frontmatter = mem['frontmatter'] if mem else {}
+    return {
+        'text': text,
+        'lower': text.lower(),
+        # People files use 'name' in frontmatter; others use 'title'
+        'title': frontmatter.get('title') or frontmatter.get('name', Path(filename).stem),
+        'priority': frontmatter.get('priority', ''),
+    }
+
+
+def _search_entries() -> Iterator[tuple[str, str, dict]]:
+    """
+    Yield (memory_type, filename, entry) for every memory in the vault,
+    re-reading only the files that changed since the last search.
+    """
+    seen = set()
+    for memory_type in MEMORY_TYPES:
+        try:
+            with os.scandir(VAULT_ROOT / memory_type) as entries:
+                files = [(e.name, e.path, e.stat()) for e in entries
+                         if e.name.endswith('.md') and e.is_file()]
+        except FileNotFoundError:
+            # Skip if folder doesn't exist
+            continue
+
+        for filename, path, st in files:
+            seen.add(path)
+            cached = _search_cache.get(path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                entry = cached[2]
+            else:
+                entry = _load_search_entry(memory_type, filename)
+                if entry is None:
+                    continue
+                _search_cache[path] = (st.st_mtime_ns, st.st_size, entry)
+            yield memory_type, filename, entry
+
+    # Forget files that are gone (deleted, or from another vault)
+    for path in _search_cache.keys() - seen:
+        _search_cache.pop(path, None)
+
+
+def warm_search_cache():
+    """Load every memory into the search cache ahead of the first search."""
+    for _ in _search_entries():
+        pass
+
+
 def search_vault(query: str) -> list[dict]:
     """
     Search across all memories using simple text matching.
@@ -726,8 +1188,9 @@ def search_vault(query: str) -> list[dict]:
     databases for LLM-based memory systems.
 
     HOW IT WORKS:
-    1. Loop through every .md file in every memory folder
-    2. Read the file's text
+    1. Go through every .md file in every memory folder
+    2. Take the file's text from the search cache (see _search_cache),
+       which only reads the file again if it changed
     3. Check if the search query appears anywhere in the text
     4. If yes, extract a snippet around the match and add it to results
 
@@ -744,45 +1207,27 @@ def search_vault(query: str) -> list[dict]:
     # "results" will hold all matching memories
     results = []
 
-    # Search through every memory type folder
-    for memory_type in MEMORY_TYPES:
-        folder = VAULT_ROOT / memory_type
-
-        # Skip if folder doesn't exist
-        if not folder.exists():
+    for memory_type, filename, entry in _search_entries():
+        # Check if our query appears in this file, and where
+        idx = entry['lower'].find(query_lower)
+        if idx == -1:
             continue
 
-        # Check every .md file in this folder
-        for md_file in folder.glob('*.md'):
-            # Read the file's text
-            text = md_file.read_text(encoding='utf-8')
-
-            # Convert to lowercase for comparison
-            text_lower = text.lower()
-
-            # Check if our query appears in this file
-            if query_lower in text_lower:
-                # ── Extract a snippet around the match ─────────
-                # Find where the match starts in the text
-                idx = text_lower.find(query_lower)
-
-                # Take 100 characters before and after the match for context
-                start = max(0, idx - 100)
-                end = min(len(text), idx + len(query) + 100)
-                snippet = text[start:end].strip()
-
-                # Read the file's frontmatter for metadata
-                mem = read_memory(str(md_file.relative_to(VAULT_ROOT)))
-
-                # Add to results with the snippet
-                results.append({
-                    'filepath': md_file.relative_to(VAULT_ROOT).as_posix(),
-                    'type': memory_type,
-                    # People files use 'name' in frontmatter; others use 'title'
-                    'title': mem['frontmatter'].get('title') or mem['frontmatter'].get('name', md_file.stem),
-                    'snippet': f"...{snippet}...",
-                    'priority': mem['frontmatter'].get('priority', ''),
-                })
+        # ── Extract a snippet around the match ─────────
+        # Take 100 characters before and after the match for context
+        text = entry['text']
+        start = max(0, idx - 100)
+        end = min(len(text), idx + len(query) + 100)
+        snippet = text[start:end].strip()
+
+        # Add to results with the snippet
+        results.append({
+            'filepath': f"{memory_type}/{filename}",
+            'type': memory_type,
+            'title': entry['title'],
+            'snippet': f"...{snippet}...",
+            'priority': entry['priority'],
+        })
 
     return results
 
@@ -854,10 +1299,66 @@ def update_index(filepath: str, memory_type: str, description: str):
 # STATISTICS
 # ============================================================================
 
+# ── STATS CACHE ────────────────────────────────────────────────────────
+# get_vault_stats() is called several times per build (progress events,
+# the final summary, the web dashboard). Counting means listing every
+# type folder, so we remember the last result along with a "key" made of
+# each folder's modification time. Adding or deleting a file changes its
+# folder's mtime, so a changed key means the counts may have changed.
+_stats_cache = {'key': None, 'stats': None}
+
+
+def invalidate_vault_stats():
+    """
+    Forget the cached vault stats so the next get_vault_stats() recounts.
+
+    Called after every memory write, as a belt-and-braces guard for
+    filesystems with coarse mtime resolution.
+    """
+    _stats_cache['key'] = None
+    _stats_cache['stats'] = None
+
+
+def _vault_stats_key() -> tuple:
+    """Build the cache key: the vault root plus each type folder's mtime."""
+    key = [str(VAULT_ROOT)]
+    for mtype in MEMORY_TYPES:
+        try:
+            key.append(os.stat(VAULT_ROOT / mtype).st_mtime_ns)
+        except FileNotFoundError:
+            key.append(None)
+    return tuple(key)
+
+
+def _list_md_raw(folder: Path) -> Iterator[str]:
+    """
+    Yield the names of the .md files directly inside a folder.
+
+    A faster alternative to folder.glob('*.md') for hot paths: os.scandir
+    reads the directory in one go and hands back plain strings, without
+    building a Path object per entry. Yields nothing if the folder is
+    missing. Order is whatever the filesystem returns (same as glob).
+    """
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.endswith('.md') and entry.is_file():
+                    yield entry.name
+    except FileNotFoundError:
+        return
+
+
+def _count_md_files(folder: Path) -> int:
+    """Count the .md files directly inside a folder (0 if it's missing)."""
+    return sum(1 for _ in _list_md_raw(folder))
+
+
 def get_vault_stats() -> dict:
     """
     Count how many memories exist in each category.
 
+    Results are cached until a type folder changes (see _stats_cache).
+
     Returns:
         A dictionary like:
         {
@@ -867,15 +1368,17 @@ def get_vault_stats() -> dict:
             'commitments': 1,
         }
     """
+    key = _vault_stats_key()
+    if _stats_cache['key'] == key:
+        # Hand back a copy so callers can't modify the cached dict
+        return dict(_stats_cache['stats'])
+
     # Start with a total counter at zero
     stats = {'total': 0}
 
     # Count .md files in each memory type folder
     for mtype in MEMORY_TYPES:
-        folder = VAULT_ROOT / mtype
-
-        # Count files if folder exists, otherwise 0
-        count = len(list(folder.glob('*.md'))) if folder.exists() else 0
+        count = _count_md_files(VAULT_ROOT / mtype)
 
         # Store the count for this type
         stats[mtype] = count
@@ -883,7 +1386,9 @@ def get_vault_stats() -> dict:
         # Add to the running total
         stats['total'] += count
 
-    return stats
+    _stats_cache['key'] = key
+    _stats_cache['stats'] = stats
+    return dict(stats)
 
 
 # ============================================================================
@@ -27,11 +27,26 @@
 
 # ── IMPORTS ────────────────────────────────────────────────────────────
 
-# "json" for data formatting
-import json
+# "orjson" is a fast (Rust-backed) JSON serializer. We use it for the
+# email batches sent to the Email Reader, which are serialized once per
+# batch and can be large (full email bodies).
+import orjson
 
-# "math" for ceiling division (calculating batch counts)
-import math
+# "islice" takes the next N items from an iterator (see _chunked below)
+from itertools import islice
+
+# "hashlib" gives us compact fingerprints for emails and observations
+# (see _dedupe_emails and _dedupe_observations below)
+import hashlib
+
+# "queue" and "threading" let progress events be delivered on a
+# background thread (see ProgressPublisher below)
+import queue
+import threading
+
+# "ThreadPoolExecutor" runs several email batches through the Email Reader
+# at the same time; "as_completed" hands back each one as it finishes
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # "Console" and "Panel" from "rich" make terminal output pretty.
 # "Console" is a printer that supports colors and formatting.
@@ -55,19 +70,228 @@ from memory.vault import (
 )
 from memory.graph import rebuild_graph
 from memory.knowledge_index import build_knowledge_index
+from memory.dedup import normalize_title, stat_cache_scope
 
 # Import Gmail fetch functions (incremental: list IDs first, then fetch by ID)
-from tools.gmail_tools import fetch_emails, list_email_ids, fetch_emails_by_ids
-from tools.email_filter import filter_emails
+from tools.gmail_tools import fetch_emails, list_email_ids, iter_emails_by_ids
+from tools.email_filter import classify_email
 
-# Import batch size config
-from config.settings import EMAIL_BATCH_SIZE
+# Import batch size and concurrency config
+from config.settings import EMAIL_BATCH_SIZE, MAX_CONCURRENT_BATCHES
 
 # Create a "console" object for pretty-printing to the terminal.
 # The web frontend doesn't see this — it's for the server logs.
 console = Console()
 
 
+# ── BATCHING ───────────────────────────────────────────────────────────
+
+def _chunked(items, size: int):
+    """
+    Yield consecutive lists of up to `size` items (the last may be shorter).
+
+    Walks one iterator with islice instead of slicing the list by index,
+    so there's no offset arithmetic and no clamping of the final batch.
+    Works on any iterable — including a generator still being filled,
+    so the first chunk is ready before the last item even exists.
+
+    Args:
+        items: The items to split up (e.g., emails as they're fetched).
+        size:  Maximum items per chunk (e.g., EMAIL_BATCH_SIZE).
+
+    Yields:
+        list: The next chunk of items, in order.
+    """
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+# ── EMAIL DEDUP ────────────────────────────────────────────────────────
+# Gmail often holds several copies of the same message — a newsletter
+# delivered twice, the same notice sent to two of your addresses. Each
+# copy would cost the same LLM tokens and yield nothing new, so we drop
+# exact repeats before batching.
+
+def _email_key(email: dict) -> bytes | None:
+    """
+    Fingerprint an email by sender and body, for spotting exact repeats.
+
+    Two emails are repeats when they have the same sender and the same
+    body (compared by SHA-256 digest, so long bodies aren't kept around
+    as dict keys). Emails with an empty body get None — without a body
+    there's nothing to compare, so they're always kept.
+    """
+    body = email.get('body') or ''
+    if not body.strip():
+        return None
+    sender = email.get('from_email') or email.get('from') or ''
+    return hashlib.sha256(f"{sender}\n{body}".encode('utf-8')).digest()
+
+
+# ── PROGRESS PUBLISHER ─────────────────────────────────────────────────
+
+class ProgressPublisher:
+    """
+    Delivers progress events to a callback on a background thread.
+
+    The pipeline only drops each event into a queue (instant), and a
+    worker thread hands them to the callback in order. That way a slow
+    consumer — e.g. a web client on a bad connection — never stalls the
+    batch loop.
+
+    Call close() when the pipeline finishes: it waits until every queued
+    event has been delivered.
+    """
+
+    # Marker put on the queue to tell the worker thread to stop
+    _CLOSE = object()
+
+    def __init__(self, callback=None):
+        """
+        Args:
+            callback: Optional function(dict) to receive each event.
+                      With no callback, emit() is a no-op.
+        """
+        self._callback = callback
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        if callback:
+            self._thread = threading.Thread(
+                target=self._drain, name="progress-publisher", daemon=True
+            )
+            self._thread.start()
+
+    def emit(self, event: dict):
+        """Queue an event for delivery (never blocks)."""
+        if self._thread is not None:
+            self._queue.put(event)
+
+    def close(self):
+        """Deliver any remaining events, then stop the worker thread."""
+        if self._thread is not None:
+            self._queue.put(self._CLOSE)
+            self._thread.join()
+            self._thread = None
+
+    def _drain(self):
+        """Worker loop: pass queued events to the callback until closed."""
+        while True:
+            event = self._queue.get()
+            if event is self._CLOSE:
+                return
+            try:
+                self._callback(event)
+            except Exception as e:
+                # A broken consumer shouldn't take the pipeline down
+                console.print(f"[red]Progress callback failed: {e}[/red]")
+
+
+# ── OBSERVATION DEDUP ──────────────────────────────────────────────────
+# Batches are analyzed independently, so the Email Reader sometimes
+# reports the exact same observation in more than one batch (e.g. a
+# thread that spans two batches). Sending those copies to the Memory
+# Writer just burns tokens, so we drop them before building its prompt.
+
+def _observation_key(observation: dict) -> int:
+    """
+    Fingerprint an observation as a 64-bit integer.
+
+    The key covers the type, the normalized title (or person name) and the
+    content, so only true repeats collide — two "Me" observations with
+    different details are both kept for the Memory Writer to merge.
+    Small int keys hash and compare faster than long strings.
+    """
+    title = observation.get('title') or observation.get('name') or ''
+    raw = "|".join((
+        str(observation.get('type', '')),
+        normalize_title(str(title)),
+        str(observation.get('content', '')),
+    ))
+    digest = hashlib.blake2b(raw.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _parse_batch_result(batch_result: str) -> dict | None:
+    """
+    Parse an Email Reader batch result into a dict, if it's valid JSON
+    with an "observations" list. Tolerates a ```json code fence.
+
+    Returns:
+        The parsed dict, or None if the result isn't in the expected shape.
+    """
+    text = batch_result.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else ''
+        text = text.rsplit('```', 1)[0]
+    try:
+        data = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get('observations'), list):
+        return None
+    return data
+
+
+def _dedupe_observations(batch_results: list[str]) -> list[str]:
+    """
+    Remove observations already seen in an earlier batch.
+
+    Results that can't be parsed are passed through untouched, so the
+    Memory Writer still sees everything the Email Reader produced.
+
+    Args:
+        batch_results: Raw Email Reader output, one string per batch.
+
+    Returns:
+        The batch results with repeated observations removed.
+    """
+    seen = set()
+    deduped = []
+    for batch_result in batch_results:
+        data = _parse_batch_result(batch_result)
+        if data is None:
+            deduped.append(batch_result)
+            continue
+
+        unique = []
+        for observation in data['observations']:
+            if not isinstance(observation, dict):
+                unique.append(observation)
+                continue
+            key = _observation_key(observation)
+            if key not in seen:
+                seen.add(key)
+                unique.append(observation)
+
+        if len(unique) == len(data['observations']):
+            # Nothing removed — keep the agent's original text as-is
+            deduped.append(batch_result)
+        else:
+            data['observations'] = unique
+            deduped.append(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8'))
+    return deduped
+
+
+# ── QUERY PROGRESS ─────────────────────────────────────────────────────
+
+def _describe_query_tool(tool_name: str, tool_args: dict) -> str:
+    """A short, human-readable line for a Query Agent tool call."""
+    if tool_name == 'search_vault':
+        return f'Searching your memories for "{tool_args.get("query", "")}"...'
+    if tool_name == 'read_memory':
+        return f"Reading {tool_args.get('filepath', 'a memory')}..."
+    if tool_name in ('get_graph', 'traverse_graph'):
+        return "Following connections in your knowledge graph..."
+    return "Looking through your vault..."
+
+
+# ── CANCELLATION ───────────────────────────────────────────────────────
+
+class BuildCancelled(Exception):
+    """Raised inside the build pipeline once its cancel_event is set."""
+
+
 # ── THE ORCHESTRATOR CLASS ─────────────────────────────────────────────
 
 class Orchestrator:
@@ -177,7 +401,7 @@ class Orchestrator:
 
     def build_memory(self, user_input: str, progress_callback=None,
                      max_emails: int = None, days_back: int = None,
-                     gmail_query: str = '') -> str:
+                     gmail_query: str = '', cancel_event=None) -> str:
         """
         Run the full pipeline: Fetch → Batch Analyze → Write Memories.
 
@@ -196,14 +420,57 @@ class Orchestrator:
             max_emails:        Max emails to fetch (overrides config default).
             days_back:         How many days back to look (overrides config default).
             gmail_query:       Gmail search query filter.
+            cancel_event:      Optional threading.Event. Once it's set, the
+                               pipeline stops at its next checkpoint (between
+                               batches and before each later step) — the
+                               LLM calls already running still finish.
 
         Returns:
             str: A summary of what was created.
         """
-        def emit(event):
-            """Send a progress event if a callback is registered."""
-            if progress_callback:
-                progress_callback(event)
+        # Progress events go through a publisher so a slow callback never
+        # holds up the pipeline. close() (in "finally", so it runs on every
+        # return path) waits until all events have been delivered.
+        #
+        # The stat cache scope lets the vault caches stat each file once per
+        # build instead of on every dedup check and graph rebuild.
+        publisher = ProgressPublisher(progress_callback)
+        try:
+            with stat_cache_scope():
+                return self._run_build_pipeline(
+                    publisher.emit, max_emails, days_back, gmail_query,
+                    cancel_event
+                )
+        except BuildCancelled:
+            console.print("[yellow]Build cancelled[/yellow]")
+            publisher.emit({"stage": "error", "status": "cancelled",
+                            "message": "Build cancelled."})
+            return "Build cancelled."
+        finally:
+            publisher.close()
+
+    def _run_build_pipeline(self, emit, max_emails: int = None,
+                            days_back: int = None, gmail_query: str = '',
+                            cancel_event=None) -> str:
+        """
+        The body of build_memory(), with progress events sent via emit().
+
+        Args:
+            emit:         Function(dict) that publishes a progress event.
+            max_emails:   Max emails to fetch (overrides config default).
+            days_back:    How many days back to look (overrides config default).
+            gmail_query:  Gmail search query filter.
+            cancel_event: Optional threading.Event that stops the pipeline.
+
+        Returns:
+            str: A summary of what was created.
+
+        Raises:
+            BuildCancelled: At a checkpoint after cancel_event was set.
+        """
+        def check_cancelled():
+            if cancel_event is not None and cancel_event.is_set():
+                raise BuildCancelled()
 
         # Use config defaults if not explicitly provided
         from config.settings import DEFAULT_MAX_EMAILS, DEFAULT_DAYS_BACK
@@ -264,55 +531,18 @@ class Orchestrator:
             "message": f"Found {len(new_ids)} new emails out of {len(all_ids)} total. Fetching content..."
         })
 
-        # Phase 3: Fetch full content only for new emails (the big savings)
-        emails = fetch_emails_by_ids(new_ids)
-
-        if not emails:
-            emit({"stage": "complete", "status": "complete",
-                  "message": "Failed to fetch any new email content.", "stats": get_vault_stats()})
-            return "Failed to fetch new email content. Try again later."
-
-        console.print(f"[green]OK - Fetched {len(emails)} new emails[/green]")
-
-        # ── Filter out noise emails ────────────────────────────
-        # Skip newsletters, receipts, notifications, cold outreach.
-        # This saves tokens and keeps the vault focused on real interactions.
-        signal_emails, noise_emails = filter_emails(emails)
-
-        if noise_emails:
-            console.print(f"   [dim]Filtered {len(noise_emails)} noise emails "
-                          f"(newsletters, notifications, etc.)[/dim]")
-        emit({
-            "stage": "fetching", "status": "complete",
-            "message": (f"Fetched {len(emails)} new emails "
-                        f"(skipped {len(all_ids) - len(new_ids)} already processed, "
-                        f"filtered {len(noise_emails)} noise)")
-        })
-
-        if not signal_emails:
-            emit({"stage": "complete", "status": "complete",
-                  "message": f"All {len(emails)} new emails were noise (newsletters, etc.). Nothing to process.",
-                  "stats": get_vault_stats()})
-            # Still mark them as processed so we don't re-fetch next time
-            updated_ids = processed_ids | {e['id'] for e in emails}
-            save_processed_email_ids(updated_ids)
-            return f"All {len(emails)} new emails were noise. Nothing to process."
-
-        # Use signal_emails for the rest of the pipeline
-        emails = signal_emails
-
-        # ── Step 2: Batch analyze ────────────────────────────
-        # Split emails into batches and run the Email Reader on each.
-        # Each batch gets a fresh agent context, so token limits are
-        # never exceeded regardless of total email count.
-        total_batches = math.ceil(len(emails) / EMAIL_BATCH_SIZE)
-        all_observations = []
-
-        console.print(f"\n[bold cyan]Step 2/5: Analyzing in {total_batches} batch(es)[/bold cyan]")
-        emit({
-            "stage": "email_reader", "status": "started",
-            "message": f"Analyzing {len(emails)} emails in {total_batches} batch(es)..."
-        })
+        # Phase 3: Fetch full content only for new emails (the big savings).
+        # Analysis overlaps the download: each batch goes to the Email
+        # Reader as soon as it fills up, so the LLM is already working
+        # while Gmail is still sending the rest. Batches come out exactly
+        # as if we'd fetched everything first and then split the list.
+        #
+        # The batch count isn't final until the fetch ends (noise and
+        # duplicates are dropped along the way), so the Email Reader is
+        # told the expected count — exact unless emails were skipped.
+        # (-(-a // b) is ceiling division in pure integer math — no float
+        # round-trip, and no math import needed)
+        expected_batches = -(-len(new_ids) // EMAIL_BATCH_SIZE)
 
         failed_batches = []
 
@@ -326,43 +556,143 @@ class Orchestrator:
             })
         self.email_reader.on_retry = on_api_retry
 
-        for batch_idx in range(total_batches):
-            # Slice out this batch
-            start = batch_idx * EMAIL_BATCH_SIZE
-            end = start + EMAIL_BATCH_SIZE
-            batch = emails[start:end]
-            batch_num = batch_idx + 1
+        def analyze(batch_num, batch):
+            """Serialize one batch and run the Email Reader on it (worker thread)."""
+            # Serialize the batch to JSON for the agent. Batches don't
+            # overlap, so each email is encoded exactly once. Compact output
+            # (no indentation) — the LLM doesn't need pretty-printing, and
+            # the whitespace would cost tokens on every email.
+            # orjson returns bytes, so decode to get the prompt string.
+            batch_json = orjson.dumps(batch, default=str).decode('utf-8')
+
+            # Fresh context each time — the Email Reader keeps a separate
+            # conversation history per thread, so parallel batches are safe.
+            return self.email_reader.analyze_batch(
+                batch_json, batch_num, expected_batches
+            )
 
-            console.print(f"   Batch {batch_num}/{total_batches} ({len(batch)} emails)...")
+        # Run up to MAX_CONCURRENT_BATCHES batches at once. Each batch is
+        # mostly waiting on the LLM API, so overlapping them cuts the total
+        # time roughly by the number of workers.
+        batch_results = {}  # batch_num -> result
+        workers = max(1, min(MAX_CONCURRENT_BATCHES, expected_batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+
+            def submit(batch):
+                batch_num = len(futures) + 1
+                console.print(f"   Batch {batch_num} ({len(batch)} emails) queued for analysis...")
+                futures[pool.submit(analyze, batch_num, batch)] = (batch_num, len(batch))
+
+            fetched = []            # every email fetched
+            emails = []             # signal emails, minus exact repeats
+            noise_emails = []
+            duplicate_emails = []
+            seen_keys = set()       # fingerprints from _email_key
+
+            def worth_analyzing(stream):
+                """Pass through the fetched emails worth analyzing, sorting out the rest."""
+                for email in stream:
+                    fetched.append(email)
+
+                    # Skip newsletters, receipts, notifications, cold outreach.
+                    # This saves tokens and keeps the vault focused on real interactions.
+                    if classify_email(email) != 'signal':
+                        noise_emails.append(email)
+                        continue
+
+                    # Skip exact repeats (same sender + body) — they'd only
+                    # waste LLM tokens
+                    key = _email_key(email)
+                    if key is not None:
+                        if key in seen_keys:
+                            duplicate_emails.append(email)
+                            continue
+                        seen_keys.add(key)
+
+                    emails.append(email)
+                    yield email
+
+            def stop_if_cancelled():
+                # Drop the batches still waiting for a worker; the ones
+                # already talking to the LLM finish as the pool closes
+                if cancel_event is not None and cancel_event.is_set():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                check_cancelled()
+
+            for batch in _chunked(worth_analyzing(iter_emails_by_ids(new_ids)), EMAIL_BATCH_SIZE):
+                stop_if_cancelled()
+                submit(batch)
+
+            if not fetched:
+                emit({"stage": "complete", "status": "complete",
+                      "message": "Failed to fetch any new email content.", "stats": get_vault_stats()})
+                return "Failed to fetch new email content. Try again later."
+
+            console.print(f"[green]OK - Fetched {len(fetched)} new emails[/green]")
+            if noise_emails:
+                console.print(f"   [dim]Filtered {len(noise_emails)} noise emails "
+                              f"(newsletters, notifications, etc.)[/dim]")
+            if duplicate_emails:
+                console.print(f"   [dim]Skipped {len(duplicate_emails)} duplicate emails[/dim]")
             emit({
-                "stage": "email_reader", "status": "in_progress",
-                "message": f"Analyzing batch {batch_num} of {total_batches} ({len(batch)} emails)..."
+                "stage": "fetching", "status": "complete",
+                "message": (f"Fetched {len(fetched)} new emails "
+                            f"(skipped {len(all_ids) - len(new_ids)} already processed, "
+                            f"filtered {len(noise_emails)} noise)")
             })
 
-            # Serialize the batch to JSON for the agent
-            batch_json = json.dumps(batch, indent=2, default=str)
+            if not emails:
+                emit({"stage": "complete", "status": "complete",
+                      "message": f"All {len(fetched)} new emails were noise (newsletters, etc.). Nothing to process.",
+                      "stats": get_vault_stats()})
+                # Still mark them as processed so we don't re-fetch next time
+                updated_ids = processed_ids | {e['id'] for e in fetched}
+                save_processed_email_ids(updated_ids)
+                return f"All {len(fetched)} new emails were noise. Nothing to process."
+
+            # ── Step 2: Batch analyze ────────────────────────────
+            # The batches are already running; now wait for each one.
+            # Each batch gets a fresh agent context, so token limits are
+            # never exceeded regardless of total email count.
+            total_batches = len(futures)
+
+            console.print(f"\n[bold cyan]Step 2/5: Analyzing in {total_batches} batch(es)[/bold cyan]")
+            emit({
+                "stage": "email_reader", "status": "started",
+                "message": f"Analyzing {len(emails)} emails in {total_batches} batch(es)..."
+            })
 
-            # Run the Email Reader on this batch (fresh context each time).
+            # Report each batch as it finishes (not necessarily in order).
             # Wrap in try/except so one failed batch doesn't kill the pipeline —
             # we skip it and continue with the remaining batches.
-            try:
-                batch_result = self.email_reader.analyze_batch(
-                    batch_json, batch_num, total_batches
-                )
-
-                all_observations.append(batch_result)
-                console.print(f"   [green]OK - Batch {batch_num} complete[/green]")
-
-            except Exception as e:
-                failed_batches.append(batch_num)
-                console.print(f"   [red]SKIP - Batch {batch_num} failed: {e}[/red]")
-                emit({
-                    "stage": "email_reader", "status": "in_progress",
-                    "message": f"Batch {batch_num} failed (API overloaded), skipping — continuing with remaining batches..."
-                })
-
-        # Combine all batch results into one observations block
-        combined_observations = "\n\n---\n\n".join(all_observations)
+            for future in as_completed(futures):
+                stop_if_cancelled()
+                batch_num, batch_size = futures[future]
+                try:
+                    batch_results[batch_num] = future.result()
+                    console.print(f"   [green]OK - Batch {batch_num} complete[/green]")
+                    emit({
+                        "stage": "email_reader", "status": "in_progress",
+                        "message": (f"Analyzed batch {batch_num} of {total_batches} "
+                                    f"({batch_size} emails) — {len(batch_results)} done")
+                    })
+
+                except Exception as e:
+                    failed_batches.append(batch_num)
+                    console.print(f"   [red]SKIP - Batch {batch_num} failed: {e}[/red]")
+                    emit({
+                        "stage": "email_reader", "status": "in_progress",
+                        "message": f"Batch {batch_num} failed (API overloaded), skipping — continuing with remaining batches..."
+                    })
+
+        # Keep the observations in batch order, whatever order they finished in
+        failed_batches.sort()
+        all_observations = [batch_results[n] for n in sorted(batch_results)]
+
+        # Drop observations repeated across batches (they're combined into
+        # one block when the writer prompt is built below)
+        observations = _dedupe_observations(all_observations)
 
         # Report batch completion (with info about any failures)
         succeeded = total_batches - len(failed_batches)
@@ -382,6 +712,7 @@ class Orchestrator:
             return error_msg
 
         # ── Step 3: Memory Writer ────────────────────────────
+        check_cancelled()
         console.print("\n[bold cyan]Step 3/5: Memory Writer Agent[/bold cyan]")
         emit({
             "stage": "memory_writer", "status": "started",
@@ -400,18 +731,25 @@ class Orchestrator:
         # Build the Knowledge Index so the agent knows what already exists
         knowledge_index = build_knowledge_index()
 
-        writer_prompt = (
+        # Collect every piece of the prompt in a list and join once at the
+        # end — the observations are copied a single time, straight into
+        # the final string, instead of first into a combined block.
+        prompt_parts = [
             "Here are observations about the user extracted from their emails. "
             "These observations come from multiple batches, so you may see "
             "duplicate people (especially 'Me') — merge them when writing. "
             "Process each observation and write it to the memory vault.\n\n"
             "IMPORTANT: Use the Knowledge Index below to check what already exists "
             "BEFORE creating new files. If an entity already appears in the index, "
-            "read it with read_memory and merge your new data.\n\n"
-            f"{knowledge_index}\n\n"
-            "---\n\n"
-            f"OBSERVATIONS:\n{combined_observations}"
-        )
+            "read it with read_memory and merge your new data.\n\n",
+            knowledge_index,
+            "\n\n---\n\nOBSERVATIONS:\n",
+        ]
+        for i, observation in enumerate(observations):
+            if i:
+                prompt_parts.append("\n\n---\n\n")
+            prompt_parts.append(observation)
+        writer_prompt = "".join(prompt_parts)
 
         writer_result = self.memory_writer.run(writer_prompt)
 
@@ -422,10 +760,14 @@ class Orchestrator:
         })
 
         # ── Track newly processed email IDs ───────────────────
-        updated_ids = processed_ids | {e['id'] for e in emails}
+        # (duplicates included, so they aren't fetched again next time)
+        updated_ids = (processed_ids | {e['id'] for e in emails}
+                       | {e['id'] for e in duplicate_emails})
         save_processed_email_ids(updated_ids)
 
         # ── Step 3.5: Rebuild knowledge graph ──────────────────
+        # The Memory Writer skips per-write graph rebuilds, so this single
+        # rebuild covers everything it wrote.
         console.print("\n[bold cyan]Step 3.5/5: Rebuilding knowledge graph[/bold cyan]")
         emit({
             "stage": "graph_rebuild", "status": "started",
@@ -439,24 +781,31 @@ class Orchestrator:
         })
 
         # ── Step 4: Action Agent ──────────────────────────────
+        # The follow-up steps publish through our emit(), so their events
+        # share the same queue and arrive in pipeline order.
+        # (The new memories are saved by now; cancelling only skips the
+        # steps that haven't started.)
+        check_cancelled()
         console.print("\n[bold cyan]Step 4/5: Action Agent[/bold cyan]")
         action_result = self.refresh_actions(
             "Generate action items from the newly updated vault.",
-            progress_callback=progress_callback
+            progress_callback=emit
         )
 
         # ── Step 5: Reconcile action items ────────────────────
+        check_cancelled()
         console.print("\n[bold cyan]Step 5/5: Reconciling action items[/bold cyan]")
         reconcile_result = self.reconcile_actions(
             "Reconcile action items against sent emails.",
-            progress_callback=progress_callback
+            progress_callback=emit
         )
 
         # ── Step 6: Generate insights ──────────────────────────
+        check_cancelled()
         console.print("\n[bold cyan]Step 6/6: Insights Agent[/bold cyan]")
         insights_result = self.generate_insights(
             "Generate insights from the full vault.",
-            progress_callback=progress_callback
+            progress_callback=emit
         )
 
         # ── Build summary ────────────────────────────────────
@@ -586,6 +935,7 @@ class Orchestrator:
         Updates the status field in the insight's YAML frontmatter to 'dismissed'.
         """
         import yaml as _yaml
+        from memory.vault import _load_yaml
 
         user_lower = user_input.lower().strip()
         dismiss_all = 'all' in user_lower
@@ -623,7 +973,7 @@ class Orchestrator:
                 continue
 
             try:
-                fm = _yaml.safe_load(parts[1]) or {}
+                fm = _load_yaml(parts[1]) or {}
             except _yaml.YAMLError:
                 continue
 
@@ -728,7 +1078,7 @@ class Orchestrator:
         console.print(f"[green]{summary}[/green]\n")
         return summary
 
-    def query_memory(self, user_input: str) -> str:
+    def query_memory(self, user_input: str, progress_callback=None) -> str:
         """
         Send a question to the Query Agent and return its answer.
 
@@ -736,15 +1086,28 @@ class Orchestrator:
         and synthesize a conversational answer.
 
         Args:
-            user_input: The user's question (e.g., "Who do I email most?")
+            user_input:        The user's question (e.g., "Who do I email most?")
+            progress_callback: Optional function(dict) called before each
+                               tool the agent uses, e.g. "Searching your
+                               memories for "Sarah"..."
 
         Returns:
             str: The Query Agent's answer.
         """
         console.print("[bold cyan]Query Agent[/bold cyan] searching vault...\n")
 
-        # Call the Query Agent's agentic loop
-        return self.query_agent.run(user_input)
+        if progress_callback is None:
+            # Call the Query Agent's agentic loop
+            return self.query_agent.run(user_input)
+
+        def on_tool_call(tool_name, tool_args):
+            progress_callback({
+                "stage": "query", "status": "in_progress",
+                "message": _describe_query_tool(tool_name, tool_args),
+            })
+
+        # Passed per call: other requests may be using the same agent
+        return self.query_agent.run(user_input, on_tool_call=on_tool_call)
 
     def show_stats(self) -> str:
         """
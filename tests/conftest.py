@@ -0,0 +1,87 @@
+# tests/conftest.py
+#
+# Shared pytest configuration for the test suite.
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+
+# ── Import path ──────────────────────────────────────────────────────
+# Make the project's top-level packages (agents, memory, tools, ...)
+# importable from every test module. pytest loads this file before
+# collecting any tests, so this runs once per session.
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+
+# ── Temporary directories on tmpfs ───────────────────────────────────
+# Vault tests write and re-read lots of small markdown files under
+# tmp_path. On Linux, /dev/shm is a RAM-backed filesystem, so pointing
+# pytest's temp root there keeps those writes off the disk.
+#
+# Only the root moves: pytest still makes its usual numbered, locked
+# pytest-of-<user>/pytest-N directories under it, so concurrent runs
+# don't wipe each other's tmp_path and the last few runs are kept for
+# debugging. An explicit PYTEST_DEBUG_TEMPROOT or --basetemp still wins.
+_SHM = '/dev/shm'
+
+
+def pytest_configure(config):
+    if config.option.basetemp or not os.path.isdir(_SHM):
+        return
+    os.environ.setdefault('PYTEST_DEBUG_TEMPROOT', _SHM)
+
+
+# ── API test client ──────────────────────────────────────────────────
+# One FastAPI TestClient for the whole run. Importing the web app is the
+# slow part, and the client holds no per-test state — every request
+# reads the vault through the module-level paths each test's vault
+# fixture points at its own tmp_path.
+@pytest.fixture(scope='session')
+def client():
+    from fastapi.testclient import TestClient
+    from web.app import app
+    return TestClient(app)
+
+
+
+# ── Empty vault template ─────────────────────────────────────────────
+# The skeleton initialize_vault() creates (a folder per memory type plus
+# _index.md), built once per session. Vault fixtures copy it into each
+# test's tmp_path with shutil.copytree instead of re-creating it.
+@pytest.fixture(scope='session')
+def _vault_template(tmp_path_factory):
+    from memory.vault import initialize_vault
+    template = tmp_path_factory.mktemp('vault_template') / 'vault'
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('memory.vault.VAULT_ROOT', template)
+        initialize_vault()
+    return template
+
+# ── Gmail stand-in for build_memory ──────────────────────────────────
+# build_memory lists message IDs first (list_email_ids), then streams the
+# new ones in (iter_emails_by_ids). Tests put the inbox in gmail.emails;
+# gmail.list_ids, gmail.fetch and gmail.save are the mocks, for asserting
+# on calls or swapping in a side_effect.
+@pytest.fixture
+def gmail():
+    """
+    Stand-in for the build's two-phase Gmail fetch. list_email_ids returns
+    the IDs of gmail.emails (empty unless a test adds some) and
+    iter_emails_by_ids yields those emails. Every email counts as new: no
+    processed-IDs file is read or written.
+    """
+    emails = []
+    by_id = lambda ids: iter([e for e in emails if e["id"] in set(ids)])
+    with patch('orchestrator.list_email_ids',
+               side_effect=lambda **kwargs: [e["id"] for e in emails]) as list_ids, \
+         patch('orchestrator.iter_emails_by_ids', side_effect=by_id) as fetch, \
+         patch('orchestrator.get_processed_email_ids', return_value=set()), \
+         patch('orchestrator.save_processed_email_ids') as save:
+        yield SimpleNamespace(emails=emails, list_ids=list_ids, fetch=fetch, save=save)
@@ -5,12 +5,15 @@
 
 import json
 import math
+import time
 import pytest
 from unittest.mock import patch, MagicMock, call
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Import once at module level — importing inside every test re-ran the
+# lookup (and pulled in memory/, config/, tools/) for each test method.
+from orchestrator import (
+    Orchestrator, ProgressPublisher, _chunked, _dedupe_observations, _email_key,
+)
 
 
 def _make_fake_emails(count: int) -> list[dict]:
@@ -95,41 +98,65 @@ class TestBatchSplitting:
 
         assert sizes == [10, 10, 3]
 
+    def test_chunked_matches_slicing(self):
+        """_chunked yields the same batches as index slicing, in order."""
+        emails = _make_fake_emails(23)
+
+        batches = list(_chunked(emails, 10))
+
+        assert [len(b) for b in batches] == [10, 10, 3]
+        assert batches == [emails[0:10], emails[10:20], emails[20:23]]
+
+    def test_chunked_empty(self):
+        """No emails → no batches."""
+        assert list(_chunked([], 10)) == []
+
+
+@pytest.fixture
+def orch():
+    """
+    A bare Orchestrator instance that skips __init__ (no real agents).
+    object.__new__ creates the instance without patching the class, so
+    each test just attaches the mock agents it needs.
+    """
+    return object.__new__(Orchestrator)
+
 
 class TestOrchestratorBuildMemory:
     """Test the orchestrator's build_memory method with mocked dependencies."""
 
+    @pytest.fixture(autouse=True)
+    def later_steps(self, orch):
+        """Stub out the steps after the Memory Writer (graph, actions, insights)."""
+        for step in ('refresh_actions', 'reconcile_actions', 'generate_insights'):
+            setattr(orch, step, MagicMock(return_value=""))
+        with patch('orchestrator.rebuild_graph', return_value={'nodes': {}, 'edges': []}), \
+             patch('orchestrator.build_knowledge_index', return_value=''):
+            yield
+
     @patch('orchestrator.get_vault_stats', return_value={"total": 5, "people": 3, "decisions": 1, "commitments": 1})
-    @patch('orchestrator.fetch_emails')
-    def test_build_memory_calls_fetch_emails(self, mock_fetch, mock_stats):
-        """build_memory should call fetch_emails with correct parameters."""
-        mock_fetch.return_value = _make_fake_emails(5)
+    def test_build_memory_lists_then_fetches_emails(self, mock_stats, orch, gmail):
+        """build_memory should list message IDs with the right parameters, then fetch those IDs."""
+        gmail.emails.extend(_make_fake_emails(5))
 
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.email_reader.analyze_batch.return_value = '{"observations": []}'
-            orch.memory_writer = MagicMock()
-            orch.memory_writer.run.return_value = "Done"
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.return_value = '{"observations": []}'
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.run.return_value = "Done"
 
-            orch.build_memory("test", max_emails=25, days_back=14, gmail_query="is:important")
+        orch.build_memory("test", max_emails=25, days_back=14, gmail_query="is:important")
 
-        mock_fetch.assert_called_once_with(max_results=25, query="is:important", days_back=14)
+        gmail.list_ids.assert_called_once_with(max_results=25, query="is:important", days_back=14)
+        gmail.fetch.assert_called_once_with([e["id"] for e in gmail.emails])
 
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_build_memory_no_emails_returns_early(self, mock_fetch, mock_stats):
+    def test_build_memory_no_emails_returns_early(self, mock_stats, orch, gmail):
         """When no emails are found, return early without calling agents."""
-        mock_fetch.return_value = []
 
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.memory_writer = MagicMock()
+        orch.email_reader = MagicMock()
+        orch.memory_writer = MagicMock()
 
-            result = orch.build_memory("test")
+        result = orch.build_memory("test")
 
         assert "No emails found" in result
         orch.email_reader.analyze_batch.assert_not_called()
@@ -137,44 +164,37 @@ class TestOrchestratorBuildMemory:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 5, "people": 3, "decisions": 2})
-    @patch('orchestrator.fetch_emails')
-    def test_build_memory_correct_batch_count(self, mock_fetch, mock_stats):
+    def test_build_memory_correct_batch_count(self, mock_stats, orch, gmail):
         """25 emails / batch 10 → analyze_batch called 3 times."""
-        mock_fetch.return_value = _make_fake_emails(25)
+        gmail.emails.extend(_make_fake_emails(25))
 
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.email_reader.analyze_batch.return_value = '{"observations": []}'
-            orch.memory_writer = MagicMock()
-            orch.memory_writer.reset = MagicMock()
-            orch.memory_writer.run.return_value = "Wrote 5 memories"
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.return_value = '{"observations": []}'
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.reset = MagicMock()
+        orch.memory_writer.run.return_value = "Wrote 5 memories"
 
-            orch.build_memory("test", max_emails=25)
+        orch.build_memory("test", max_emails=25)
 
         assert orch.email_reader.analyze_batch.call_count == 3
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 3, "people": 2, "decisions": 1})
-    @patch('orchestrator.fetch_emails')
-    def test_build_memory_batch_numbers_correct(self, mock_fetch, mock_stats):
+    def test_build_memory_batch_numbers_correct(self, mock_stats, orch, gmail):
         """Verify batch_num and total_batches passed correctly to analyze_batch."""
-        mock_fetch.return_value = _make_fake_emails(25)
+        gmail.emails.extend(_make_fake_emails(25))
 
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.email_reader.analyze_batch.return_value = '{"observations": []}'
-            orch.memory_writer = MagicMock()
-            orch.memory_writer.reset = MagicMock()
-            orch.memory_writer.run.return_value = "Done"
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.return_value = '{"observations": []}'
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.reset = MagicMock()
+        orch.memory_writer.run.return_value = "Done"
 
-            orch.build_memory("test", max_emails=25)
+        orch.build_memory("test", max_emails=25)
 
         # Verify batch numbers: (batch_json, 1, 3), (batch_json, 2, 3), (batch_json, 3, 3)
-        calls = orch.email_reader.analyze_batch.call_args_list
+        # Batches run concurrently, so order the calls by batch number
+        calls = sorted(orch.email_reader.analyze_batch.call_args_list, key=lambda c: c.args[1])
         for i, c in enumerate(calls):
             _, batch_num, total_batches = c.args
             assert batch_num == i + 1
@@ -182,23 +202,19 @@ class TestOrchestratorBuildMemory:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 5)
     @patch('orchestrator.get_vault_stats', return_value={"total": 2, "people": 2})
-    @patch('orchestrator.fetch_emails')
-    def test_build_memory_batch_sizes_in_json(self, mock_fetch, mock_stats):
+    def test_build_memory_batch_sizes_in_json(self, mock_stats, orch, gmail):
         """Verify each batch has the right number of emails in the JSON."""
-        mock_fetch.return_value = _make_fake_emails(12)
+        gmail.emails.extend(_make_fake_emails(12))
 
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.email_reader.analyze_batch.return_value = '{"observations": []}'
-            orch.memory_writer = MagicMock()
-            orch.memory_writer.reset = MagicMock()
-            orch.memory_writer.run.return_value = "Done"
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.return_value = '{"observations": []}'
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.reset = MagicMock()
+        orch.memory_writer.run.return_value = "Done"
 
-            orch.build_memory("test", max_emails=12)
+        orch.build_memory("test", max_emails=12)
 
-        calls = orch.email_reader.analyze_batch.call_args_list
+        calls = sorted(orch.email_reader.analyze_batch.call_args_list, key=lambda c: c.args[1])
         batch_sizes = []
         for c in calls:
             batch_json = c.args[0]
@@ -209,22 +225,18 @@ class TestOrchestratorBuildMemory:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_progress_callback_events(self, mock_fetch, mock_stats):
+    def test_progress_callback_events(self, mock_stats, orch, gmail):
         """Verify progress_callback receives events in the right order."""
-        mock_fetch.return_value = _make_fake_emails(15)
+        gmail.emails.extend(_make_fake_emails(15))
 
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.email_reader.analyze_batch.return_value = '{"observations": []}'
-            orch.memory_writer = MagicMock()
-            orch.memory_writer.reset = MagicMock()
-            orch.memory_writer.run.return_value = "Done"
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.return_value = '{"observations": []}'
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.reset = MagicMock()
+        orch.memory_writer.run.return_value = "Done"
 
-            events = []
-            orch.build_memory("test", progress_callback=lambda e: events.append(e), max_emails=15)
+        events = []
+        orch.build_memory("test", progress_callback=lambda e: events.append(e), max_emails=15)
 
         # Expected stages in order
         stages = [e["stage"] for e in events]
@@ -246,84 +258,241 @@ class TestOrchestratorBuildMemory:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_progress_callback_in_progress_per_batch(self, mock_fetch, mock_stats):
+    def test_progress_callback_in_progress_per_batch(self, mock_stats, orch, gmail):
         """Each batch should emit an 'in_progress' event."""
-        mock_fetch.return_value = _make_fake_emails(25)
-
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.email_reader.analyze_batch.return_value = '{"observations": []}'
-            orch.memory_writer = MagicMock()
-            orch.memory_writer.reset = MagicMock()
-            orch.memory_writer.run.return_value = "Done"
-
-            events = []
-            orch.build_memory("test", progress_callback=lambda e: events.append(e), max_emails=25)
-
-        # Should have 3 in_progress events (one per batch)
-        in_progress = [e for e in events if e.get("status") == "in_progress"]
+        gmail.emails.extend(_make_fake_emails(25))
+
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.return_value = '{"observations": []}'
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.reset = MagicMock()
+        orch.memory_writer.run.return_value = "Done"
+
+        events = []
+        orch.build_memory("test", progress_callback=lambda e: events.append(e), max_emails=25)
+
+        # Should have 3 email_reader in_progress events (one per batch);
+        # the fetch phase reports its own progress under "fetching"
+        in_progress = [e for e in events
+                       if e.get("stage") == "email_reader" and e.get("status") == "in_progress"]
         assert len(in_progress) == 3
 
     @patch('orchestrator.get_vault_stats', return_value={"total": 5, "people": 5})
-    @patch('orchestrator.fetch_emails')
-    def test_memory_writer_receives_combined_observations(self, mock_fetch, mock_stats):
+    def test_memory_writer_receives_combined_observations(self, mock_stats, orch, gmail):
         """Memory writer should receive all batch observations combined."""
-        mock_fetch.return_value = _make_fake_emails(5)
+        gmail.emails.extend(_make_fake_emails(5))
 
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.email_reader.analyze_batch.return_value = '{"observations": [{"type":"people"}]}'
-            orch.memory_writer = MagicMock()
-            orch.memory_writer.reset = MagicMock()
-            orch.memory_writer.run.return_value = "Done"
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.return_value = '{"observations": [{"type":"people"}]}'
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.reset = MagicMock()
+        orch.memory_writer.run.return_value = "Done"
 
-            orch.build_memory("test", max_emails=5)
+        orch.build_memory("test", max_emails=5)
 
         writer_prompt = orch.memory_writer.run.call_args.args[0]
         assert "observations" in writer_prompt.lower()
         assert "duplicate" in writer_prompt.lower()  # Mentions dedup
 
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_memory_writer_reset_called(self, mock_fetch, mock_stats):
+    def test_memory_writer_reset_called(self, mock_stats, orch, gmail):
         """Memory writer should be reset before processing."""
-        mock_fetch.return_value = _make_fake_emails(5)
+        gmail.emails.extend(_make_fake_emails(5))
 
-        from orchestrator import Orchestrator
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.email_reader.analyze_batch.return_value = '{}'
-            orch.memory_writer = MagicMock()
-            orch.memory_writer.reset = MagicMock()
-            orch.memory_writer.run.return_value = "Done"
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.return_value = '{}'
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.reset = MagicMock()
+        orch.memory_writer.run.return_value = "Done"
 
-            orch.build_memory("test")
+        orch.build_memory("test")
 
         orch.memory_writer.reset.assert_called_once()
 
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_defaults_from_config(self, mock_fetch, mock_stats):
+    def test_defaults_from_config(self, mock_stats, orch, gmail):
         """When no params given, use config defaults."""
-        mock_fetch.return_value = []
 
-        from orchestrator import Orchestrator
         from config.settings import DEFAULT_MAX_EMAILS, DEFAULT_DAYS_BACK
-        with patch.object(Orchestrator, '__init__', lambda self: None):
-            orch = Orchestrator()
-            orch.email_reader = MagicMock()
-            orch.memory_writer = MagicMock()
+        orch.email_reader = MagicMock()
+        orch.memory_writer = MagicMock()
 
-            orch.build_memory("test")
+        orch.build_memory("test")
 
-        mock_fetch.assert_called_once_with(
+        gmail.list_ids.assert_called_once_with(
             max_results=DEFAULT_MAX_EMAILS,
             query='',
             days_back=DEFAULT_DAYS_BACK
         )
+
+
+class TestFetchAnalyzeOverlap:
+    """Batches should start analyzing while later emails are still downloading."""
+
+    @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
+    @patch('orchestrator.rebuild_graph', return_value={'nodes': {}, 'edges': []})
+    @patch('orchestrator.build_knowledge_index', return_value='')
+    @patch('orchestrator.save_processed_email_ids')
+    @patch('orchestrator.get_processed_email_ids', return_value=set())
+    @patch('orchestrator.get_vault_stats', return_value={"total": 0})
+    def test_first_batch_analyzed_before_fetch_finishes(self, _stats, _processed, mock_save,
+                                                         _index, _graph, orch):
+        import threading
+        emails = _make_fake_emails(25)
+        first_batch_started = threading.Event()
+        started_before_fetch_done = []
+
+        def slow_fetch(ids):
+            yield from emails[:10]
+            # Hold back the rest until the first batch is being analyzed
+            started_before_fetch_done.append(first_batch_started.wait(timeout=5))
+            yield from emails[10:]
+
+        def analyze_batch(batch_json, batch_num, total):
+            if batch_num == 1:
+                first_batch_started.set()
+            return '{"observations": []}'
+
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.side_effect = analyze_batch
+        orch.memory_writer = MagicMock()
+        orch.memory_writer.run.return_value = "Done"
+        for step in ('refresh_actions', 'reconcile_actions', 'generate_insights'):
+            setattr(orch, step, MagicMock(return_value=""))
+
+        with patch('orchestrator.list_email_ids', return_value=[e["id"] for e in emails]), \
+             patch('orchestrator.iter_emails_by_ids', side_effect=slow_fetch):
+            orch.build_memory("test")
+
+        assert started_before_fetch_done == [True]
+        assert orch.email_reader.analyze_batch.call_count == 3
+        saved_ids = mock_save.call_args.args[0]
+        assert saved_ids == {e["id"] for e in emails}
+
+
+class TestBuildCancellation:
+    """A set cancel_event should stop the pipeline at its next checkpoint."""
+
+    @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
+    @patch('orchestrator.save_processed_email_ids')
+    @patch('orchestrator.get_processed_email_ids', return_value=set())
+    @patch('orchestrator.get_vault_stats', return_value={"total": 0})
+    def test_cancel_during_analysis_skips_later_steps(self, _stats, _processed, mock_save, orch):
+        import threading
+        emails = _make_fake_emails(25)
+        cancel_event = threading.Event()
+
+        def analyze_batch(batch_json, batch_num, total):
+            cancel_event.set()
+            return '{"observations": []}'
+
+        orch.email_reader = MagicMock()
+        orch.email_reader.analyze_batch.side_effect = analyze_batch
+        orch.memory_writer = MagicMock()
+
+        events = []
+        with patch('orchestrator.list_email_ids', return_value=[e["id"] for e in emails]), \
+             patch('orchestrator.iter_emails_by_ids', return_value=iter(emails)):
+            result = orch.build_memory("test", progress_callback=events.append,
+                                       cancel_event=cancel_event)
+
+        assert result == "Build cancelled."
+        assert events[-1] == {"stage": "error", "status": "cancelled",
+                              "message": "Build cancelled."}
+        orch.memory_writer.run.assert_not_called()
+        mock_save.assert_not_called()
+
+
+class TestProgressPublisher:
+    """Test that progress events are delivered off the pipeline's thread."""
+
+    def test_events_delivered_in_order_after_close(self):
+        """close() should wait until every event reached the callback, in order."""
+        received = []
+        publisher = ProgressPublisher(received.append)
+        for i in range(5):
+            publisher.emit({"stage": "email_reader", "n": i})
+        publisher.close()
+
+        assert [e["n"] for e in received] == [0, 1, 2, 3, 4]
+
+    def test_slow_callback_does_not_block_emit(self):
+        """emit() should return immediately even if the callback is slow."""
+        received = []
+
+        def slow_callback(event):
+            time.sleep(0.2)
+            received.append(event)
+
+        publisher = ProgressPublisher(slow_callback)
+        started = time.perf_counter()
+        for i in range(3):
+            publisher.emit({"n": i})
+        emit_time = time.perf_counter() - started
+        publisher.close()
+
+        assert emit_time < 0.1
+        assert len(received) == 3
+
+    def test_no_callback_is_noop(self):
+        """Without a callback, emit() and close() should do nothing."""
+        publisher = ProgressPublisher(None)
+        publisher.emit({"stage": "fetching"})
+        publisher.close()
+
+
+class TestObservationDedup:
+    """Test that observations repeated across batches are dropped."""
+
+    def test_repeated_observation_removed(self):
+        """The same observation in two batches should only appear once."""
+        obs = {"type": "decisions", "title": "Chose React", "content": "Picked React."}
+        batch_1 = json.dumps({"observations": [obs]})
+        batch_2 = json.dumps({"observations": [
+            obs,
+            {"type": "people", "title": "Sarah Chen — CTO", "content": "CTO at Acme."},
+        ]})
+
+        result = _dedupe_observations([batch_1, batch_2])
+
+        assert result[0] == batch_1
+        second = json.loads(result[1])["observations"]
+        assert len(second) == 1
+        assert second[0]["title"] == "Sarah Chen — CTO"
+
+    def test_same_title_different_content_kept(self):
+        """Two 'Me' observations with different details are both kept."""
+        batch_1 = json.dumps({"observations": [{"type": "people", "title": "Me", "content": "Engineer."}]})
+        batch_2 = json.dumps({"observations": [{"type": "people", "title": "Me", "content": "Lives in Austin."}]})
+
+        assert _dedupe_observations([batch_1, batch_2]) == [batch_1, batch_2]
+
+    def test_unparseable_result_passed_through(self):
+        """Non-JSON agent output should reach the writer untouched."""
+        raw = "Observations: the user chose React."
+        assert _dedupe_observations([raw, raw]) == [raw, raw]
+
+
+class TestEmailDedup:
+    """Test the fingerprint used to drop exact repeat emails before batching."""
+
+    def test_repeated_body_from_same_sender_matches(self):
+        """Same sender + same body → same key, whatever the message ID."""
+        email = _make_fake_emails(1)[0]
+        repeat = dict(email, id="msg_dup")
+
+        assert _email_key(email) == _email_key(repeat)
+
+    def test_same_body_different_sender_differs(self):
+        """Two people sending the same text are separate interactions."""
+        emails = _make_fake_emails(2)
+        emails[1]["body"] = emails[0]["body"]
+
+        assert _email_key(emails[0]) != _email_key(emails[1])
+
+    def test_empty_body_has_no_key(self):
+        """Emails without a body can't be compared, so they're never deduped."""
+        email = _make_fake_emails(1)[0]
+        email["body"] = ""
+
+        assert _email_key(email) is None
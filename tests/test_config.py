@@ -5,10 +5,6 @@
 
 import pytest
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from config.settings import (
     EMAIL_BATCH_SIZE,
     API_MAX_RETRIES,
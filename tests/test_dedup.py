@@ -1,14 +1,12 @@
 """Tests for the deduplication module (memory/dedup.py)."""
 
-import sys
 import shutil
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 import yaml
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from memory.dedup import (
     normalize_title,
     find_duplicate,
@@ -20,18 +18,15 @@ from memory.dedup import (
 
 # ── Test Helpers ──────────────────────────────────────────────────────
 
-def _setup_vault(tmp_path, monkeypatch):
-    """Create a temporary vault directory and patch VAULT_ROOT."""
-    vault = tmp_path / 'vault'
-    vault.mkdir()
-    for mtype in ('decisions', 'people', 'commitments', 'action_required'):
-        (vault / mtype).mkdir()
-    # Write a minimal _index.md
-    (vault / '_index.md').write_text(
-        '---\ntitle: "Vault Index"\n---\n\n| File | Type | Description | Date |\n|------|------|-------------|------|\n'
-    )
-    monkeypatch.setattr('memory.dedup.VAULT_ROOT', vault)
-    return vault
+@pytest.fixture
+def vault(tmp_path, monkeypatch, _vault_template):
+    """Copy the vault template (see conftest.py) into this test's tmp_path and patch VAULT_ROOT."""
+    vault_dir = tmp_path / 'vault'
+    shutil.copytree(_vault_template, vault_dir)
+    monkeypatch.setattr('memory.dedup.VAULT_ROOT', vault_dir)
+    # write_memory logs to the changelog — keep that inside tmp_path too
+    monkeypatch.setattr('memory.changelog.CHANGELOG_FILE', vault_dir / '_changelog.md')
+    return vault_dir
 
 
 def _write_vault_file(vault_dir, memory_type, filename, frontmatter, body=''):
@@ -79,9 +74,8 @@ class TestNormalizeTitle:
 class TestFindDuplicatePeople:
     """Test find_duplicate() for people memory type."""
 
-    def test_exact_name_match(self, tmp_path, monkeypatch):
+    def test_exact_name_match(self, vault):
         """Should match existing person file by name (case-insensitive)."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         _write_vault_file(vault, 'people', 'sarah-chen-a1b2.md', {
             'name': 'Sarah Chen',
             'date': '2026-02-20',
@@ -92,9 +86,8 @@ class TestFindDuplicatePeople:
         assert result is not None
         assert result.name == 'sarah-chen-a1b2.md'
 
-    def test_name_param_override(self, tmp_path, monkeypatch):
+    def test_name_param_override(self, vault):
         """Should use the name param if provided instead of parsing title."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         _write_vault_file(vault, 'people', 'me.md', {
             'name': 'John Doe',
             'date': '2026-02-20',
@@ -105,9 +98,8 @@ class TestFindDuplicatePeople:
         assert result is not None
         assert result.name == 'me.md'
 
-    def test_no_match_different_person(self, tmp_path, monkeypatch):
+    def test_no_match_different_person(self, vault):
         """Should return None when no person matches."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         _write_vault_file(vault, 'people', 'sarah-chen-a1b2.md', {
             'name': 'Sarah Chen',
             'date': '2026-02-20',
@@ -117,12 +109,48 @@ class TestFindDuplicatePeople:
         result = find_duplicate("Alice Johnson — Legal", "people")
         assert result is None
 
-    def test_empty_vault(self, tmp_path, monkeypatch):
+    def test_empty_vault(self, vault):
         """Should return None when vault folder is empty."""
-        _setup_vault(tmp_path, monkeypatch)
         result = find_duplicate("Anyone — Role", "people")
         assert result is None
 
+    def test_repeat_lookup_uses_name_index(self, vault):
+        """After the first lookup, an exact name hit skips the folder scan."""
+        import memory.vault
+        _write_vault_file(vault, 'people', 'sarah-chen-a1b2.md', {
+            'name': 'Sarah Chen',
+            'date': '2026-02-20',
+            'category': 'people',
+        })
+        find_duplicate("Sarah Chen — VP Engineering", "people")
+
+        with patch.object(memory.vault, '_list_md_raw',
+                          wraps=memory.vault._list_md_raw) as spy:
+            result = find_duplicate("Sarah Chen — CTO", "people")
+
+        assert result.name == 'sarah-chen-a1b2.md'
+        spy.assert_not_called()
+
+    def test_renamed_person_not_matched_by_old_name(self, vault):
+        """A file rewritten under a new name must not match the old one."""
+        from memory.dedup import _forget_frontmatter
+        path = _write_vault_file(vault, 'people', 'sarah-chen-a1b2.md', {
+            'name': 'Sarah Chen',
+            'date': '2026-02-20',
+            'category': 'people',
+        })
+        assert find_duplicate("Sarah Chen — VP Engineering", "people") == path
+
+        _write_vault_file(vault, 'people', 'sarah-chen-a1b2.md', {
+            'name': 'Sarah Lee',
+            'date': '2026-02-20',
+            'category': 'people',
+        })
+        _forget_frontmatter(path)
+
+        assert find_duplicate("Sarah Chen — VP Engineering", "people") is None
+        assert find_duplicate("Sarah Lee — VP Engineering", "people") == path
+
 
 # ============================================================================
 # DUPLICATE FINDING — NON-PEOPLE
@@ -131,9 +159,8 @@ class TestFindDuplicatePeople:
 class TestFindDuplicateNonPeople:
     """Test find_duplicate() for non-people memory types."""
 
-    def test_containment_match(self, tmp_path, monkeypatch):
+    def test_containment_match(self, vault):
         """Should match when one normalized title contains the other."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         _write_vault_file(vault, 'commitments', 'aitx-meetup-a1b2.md', {
             'title': 'AI/TX February Meetup',
             'date': '2026-02-20',
@@ -145,9 +172,8 @@ class TestFindDuplicateNonPeople:
         assert result is not None
         assert result.name == 'aitx-meetup-a1b2.md'
 
-    def test_fuzzy_match_above_threshold(self, tmp_path, monkeypatch):
+    def test_fuzzy_match_above_threshold(self, vault):
         """Should match when fuzzy ratio >= 0.70."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         _write_vault_file(vault, 'decisions', 'chose-react-for-frontend-a1b2.md', {
             'title': 'Chose React for Frontend Project',
             'date': '2026-02-20',
@@ -158,9 +184,8 @@ class TestFindDuplicateNonPeople:
         result = find_duplicate("React chosen for frontend project", "decisions")
         assert result is not None
 
-    def test_no_match_below_threshold(self, tmp_path, monkeypatch):
+    def test_no_match_below_threshold(self, vault):
         """Should return None when titles are dissimilar."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         _write_vault_file(vault, 'decisions', 'chose-react-a1b2.md', {
             'title': 'Chose React for Frontend',
             'date': '2026-02-20',
@@ -170,9 +195,8 @@ class TestFindDuplicateNonPeople:
         result = find_duplicate("Quarterly budget review approved", "decisions")
         assert result is None
 
-    def test_empty_vault(self, tmp_path, monkeypatch):
+    def test_empty_vault(self, vault):
         """Should return None when vault folder is empty."""
-        _setup_vault(tmp_path, monkeypatch)
         result = find_duplicate("Anything", "commitments")
         assert result is None
 
@@ -184,9 +208,8 @@ class TestFindDuplicateNonPeople:
 class TestMergeContents:
     """Test merge_contents()."""
 
-    def test_frontmatter_union_tags(self, tmp_path, monkeypatch):
+    def test_frontmatter_union_tags(self, vault):
         """Tags and related_to should be merged as set unions."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         existing = _write_vault_file(vault, 'commitments', 'meeting-a1b2.md', {
             'title': 'Weekly Meeting',
             'date': '2026-02-20',
@@ -204,9 +227,8 @@ class TestMergeContents:
         assert set(merged_fm['tags']) == {'work', 'meetings', 'schedule'}
         assert set(merged_fm['related_to']) == {'Alice', 'Bob'}
 
-    def test_preserves_existing_nonempty_values(self, tmp_path, monkeypatch):
+    def test_preserves_existing_nonempty_values(self, vault):
         """Should NOT overwrite existing non-empty scalar fields."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         existing = _write_vault_file(vault, 'commitments', 'meeting-a1b2.md', {
             'title': 'Weekly Meeting',
             'date': '2026-02-20',
@@ -224,9 +246,8 @@ class TestMergeContents:
         assert merged_fm['title'] == 'Weekly Meeting'
         assert merged_fm['priority'] == '🔴'
 
-    def test_fills_empty_fields(self, tmp_path, monkeypatch):
+    def test_fills_empty_fields(self, vault):
         """Should fill fields that are empty/falsy in existing."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         existing = _write_vault_file(vault, 'commitments', 'meeting-a1b2.md', {
             'title': 'Meeting',
             'date': '2026-02-20',
@@ -242,9 +263,8 @@ class TestMergeContents:
 
         assert merged_fm['deadline'] == '2026-03-01'
 
-    def test_people_appends_key_interactions(self, tmp_path, monkeypatch):
+    def test_people_appends_key_interactions(self, vault):
         """For people files, new Key Interactions should be appended."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         existing = _write_vault_file(vault, 'people', 'alice-a1b2.md', {
             'name': 'Alice',
             'date': '2026-02-20',
@@ -260,9 +280,8 @@ class TestMergeContents:
         assert '2026-02-23' in merged_body
         assert 'Second meeting' in merged_body
 
-    def test_generic_appends_different_content(self, tmp_path, monkeypatch):
+    def test_generic_appends_different_content(self, vault):
         """For non-people, substantially different content should be appended."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         existing = _write_vault_file(vault, 'decisions', 'react-a1b2.md', {
             'title': 'Chose React',
             'date': '2026-02-20',
@@ -279,9 +298,8 @@ class TestMergeContents:
         assert 'Additional context' in merged_body
         assert '---' in merged_body  # separator between old and new
 
-    def test_generic_skips_similar_content(self, tmp_path, monkeypatch):
+    def test_generic_skips_similar_content(self, vault):
         """For non-people, nearly identical content should NOT be appended."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         existing = _write_vault_file(vault, 'decisions', 'react-a1b2.md', {
             'title': 'Chose React',
             'date': '2026-02-20',
@@ -297,6 +315,29 @@ class TestMergeContents:
         # Should NOT have a --- separator (content is identical)
         assert merged_body.count('---') == 0
 
+    def test_merge_many_matches_sequential_merges(self, vault):
+        """Merging several updates at once unions every list and keeps each body."""
+        from memory.dedup import _merge_many
+        existing = _write_vault_file(vault, 'people', 'alice-a1b2.md', {
+            'name': 'Alice',
+            'date': '2026-02-18',
+            'category': 'people',
+            'tags': ['team'],
+        }, body='## Key Interactions\n\n### 2026-02-18\nKickoff.')
+
+        merged_fm, merged_body = _merge_many(existing, [
+            ('## Key Interactions\n\n### 2026-02-20\nContract review.',
+             {'tags': ['legal'], 'role': 'Counsel'}),
+            ('## Key Interactions\n\n### 2026-02-22\nSigned contract.',
+             {'tags': ['contracts', 'legal'], 'related_to': ['Bob']}),
+        ])
+
+        assert merged_fm['tags'] == ['contracts', 'legal', 'team']
+        assert merged_fm['related_to'] == ['Bob']
+        assert merged_fm['role'] == 'Counsel'
+        for entry in ('Kickoff', 'Contract review', 'Signed contract'):
+            assert entry in merged_body
+
 
 # ============================================================================
 # CLEANUP DUPLICATES
@@ -305,9 +346,8 @@ class TestMergeContents:
 class TestCleanupDuplicates:
     """Test cleanup_duplicates()."""
 
-    def test_merges_people_duplicates(self, tmp_path, monkeypatch):
+    def test_merges_people_duplicates(self, vault, monkeypatch):
         """Should merge multiple files for the same person into the oldest."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         monkeypatch.setattr('memory.dedup.VAULT_ROOT', vault)
         # Also patch the import inside cleanup_duplicates
         import memory.vault
@@ -349,9 +389,8 @@ class TestCleanupDuplicates:
         fm = yaml.safe_load(remaining[0].read_text().split('---')[1])
         assert set(fm['tags']) == {'team', 'legal', 'contracts'}
 
-    def test_empty_vault_returns_zeros(self, tmp_path, monkeypatch):
+    def test_empty_vault_returns_zeros(self, vault, monkeypatch):
         """Should return zero stats when vault has no duplicates."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         import memory.vault
         monkeypatch.setattr(memory.vault, 'VAULT_ROOT', vault)
 
@@ -360,9 +399,8 @@ class TestCleanupDuplicates:
         assert result['merged'] == 0
         assert result['deleted'] == 0
 
-    def test_no_false_positives(self, tmp_path, monkeypatch):
+    def test_no_false_positives(self, vault, monkeypatch):
         """Should NOT merge files for different people."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         import memory.vault
         monkeypatch.setattr(memory.vault, 'VAULT_ROOT', vault)
 
@@ -384,6 +422,135 @@ class TestCleanupDuplicates:
         remaining = list((vault / 'people').glob('*.md'))
         assert len(remaining) == 2
 
+    def test_reads_each_frontmatter_once_while_grouping(self, vault, monkeypatch):
+        """Frontmatter is parsed once per file, not again for sorting/merging."""
+        import memory.vault
+        import memory.dedup
+        monkeypatch.setattr(memory.vault, 'VAULT_ROOT', vault)
+
+        for i, date in enumerate(('2026-02-18', '2026-02-20', '2026-02-22')):
+            _write_vault_file(vault, 'decisions', f'chose-react-{i}.md', {
+                'title': 'Chose React for Frontend',
+                'date': date,
+                'category': 'decisions',
+            }, body=f'Decision note {i}.')
+
+        with patch.object(memory.dedup, '_parse_frontmatter',
+                          wraps=memory.dedup._parse_frontmatter) as spy:
+            result = cleanup_duplicates()
+
+        assert result['deleted'] == 2
+        # 3 up-front reads + 1 canonical re-read for the group's merge
+        assert spy.call_count == 3 + 1
+
+
+# ============================================================================
+# LEADER MATCHING (non-people grouping)
+# ============================================================================
+
+class TestFirstMatchingLeader:
+    """Test _first_matching_leader() keeps the first-match-in-order rule."""
+
+    def test_earlier_containment_beats_later_fuzzy(self):
+        from memory.dedup import _first_matching_leader
+        leaders = ['react', 'chose react for frontend']
+        assert _first_matching_leader('chose react for frontends', leaders) == 'react'
+
+    def test_earlier_fuzzy_beats_later_containment(self):
+        from memory.dedup import _first_matching_leader
+        leaders = ['chose react for frontend', 'react']
+        assert _first_matching_leader('chose react for frontends', leaders) == 'chose react for frontend'
+
+    def test_no_match(self):
+        from memory.dedup import _first_matching_leader
+        assert _first_matching_leader('quarterly budget approved', ['chose react', 'sprint demo']) is None
+        assert _first_matching_leader('anything', []) is None
+
+
+# ============================================================================
+# FRONTMATTER CACHE
+# ============================================================================
+
+class TestFrontmatterCache:
+    """Test that parsed frontmatter is reused until the file changes."""
+
+    def test_unchanged_file_not_reparsed(self, vault):
+        """A second read of an unchanged file should skip YAML parsing."""
+        from memory.dedup import _parse_frontmatter
+        path = _write_vault_file(vault, 'decisions', 'chose-react.md', {
+            'title': 'Chose React', 'date': '2026-02-20',
+        })
+
+        first = _parse_frontmatter(path)
+        with patch('memory.vault._load_yaml') as mock_load:
+            second = _parse_frontmatter(path)
+
+        mock_load.assert_not_called()
+        assert first == second == {'title': 'Chose React', 'date': '2026-02-20'}
+
+    def test_changed_file_is_reparsed(self, vault):
+        """Rewriting a file should invalidate its cached frontmatter."""
+        from memory.dedup import _parse_frontmatter
+        path = _write_vault_file(vault, 'decisions', 'chose-react.md', {
+            'title': 'Chose React',
+        })
+        assert _parse_frontmatter(path)['title'] == 'Chose React'
+
+        _write_vault_file(vault, 'decisions', 'chose-react.md', {
+            'title': 'Chose React and Vite',
+        })
+        assert _parse_frontmatter(path)['title'] == 'Chose React and Vite'
+
+    def test_returned_dict_is_a_copy(self, vault):
+        """Mutating the result must not leak into later reads."""
+        from memory.dedup import _parse_frontmatter
+        path = _write_vault_file(vault, 'decisions', 'chose-react.md', {
+            'title': 'Chose React', 'tags': ['frontend'],
+        })
+
+        _parse_frontmatter(path)['tags'].append('mutated')
+        assert _parse_frontmatter(path)['tags'] == ['frontend']
+
+
+class TestStatCacheScope:
+    """Test that file stats are reused within one build, and only there."""
+
+    def test_stat_reused_inside_scope(self, vault):
+        """Inside a scope, an unchanged file is stat'd only once."""
+        import memory.dedup as dedup
+        path = _write_vault_file(vault, 'decisions', 'chose-react.md', {
+            'title': 'Chose React',
+        })
+
+        with dedup.stat_cache_scope():
+            with patch('memory.dedup.os.stat', wraps=dedup.os.stat) as spy:
+                dedup._parse_frontmatter(path)
+                dedup._parse_frontmatter(path)
+        assert spy.call_count == 1
+
+    def test_stat_not_reused_outside_scope(self, vault):
+        import memory.dedup as dedup
+        path = _write_vault_file(vault, 'decisions', 'chose-react.md', {
+            'title': 'Chose React',
+        })
+
+        with patch('memory.dedup.os.stat', wraps=dedup.os.stat) as spy:
+            dedup._parse_frontmatter(path)
+            dedup._parse_frontmatter(path)
+        assert spy.call_count == 2
+
+    def test_rewrite_inside_scope_is_seen(self, vault):
+        """Rewriting a file through dedup forgets its cached stat."""
+        import memory.dedup as dedup
+        path = _write_vault_file(vault, 'decisions', 'chose-react.md', {
+            'title': 'Chose React',
+        })
+
+        with dedup.stat_cache_scope():
+            assert dedup._parse_frontmatter(path)['title'] == 'Chose React'
+            dedup._rewrite_file(path, {'title': 'Chose React and Vite'}, 'Body.')
+            assert dedup._parse_frontmatter(path)['title'] == 'Chose React and Vite'
+
 
 # ============================================================================
 # INTEGRATION TESTS — write_memory() with dedup
@@ -392,9 +559,8 @@ class TestCleanupDuplicates:
 class TestWriteMemoryDedup:
     """Test that write_memory() integrates with dedup correctly."""
 
-    def test_people_dedup_via_write_memory(self, tmp_path, monkeypatch):
+    def test_people_dedup_via_write_memory(self, vault, monkeypatch):
         """Writing the same person twice should update the existing file, not create a new one."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         import memory.vault
         monkeypatch.setattr(memory.vault, 'VAULT_ROOT', vault)
 
@@ -427,9 +593,8 @@ class TestWriteMemoryDedup:
         people_files = list((vault / 'people').glob('*.md'))
         assert len(people_files) == 1
 
-    def test_commitment_dedup_via_write_memory(self, tmp_path, monkeypatch):
+    def test_commitment_dedup_via_write_memory(self, vault, monkeypatch):
         """Writing similar commitments should merge into existing file."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         import memory.vault
         monkeypatch.setattr(memory.vault, 'VAULT_ROOT', vault)
 
@@ -466,9 +631,8 @@ class TestWriteMemoryDedup:
         assert 'networking' in fm['tags']
         assert 'ai' in fm['tags']
 
-    def test_dissimilar_memories_create_separate_files(self, tmp_path, monkeypatch):
+    def test_dissimilar_memories_create_separate_files(self, vault, monkeypatch):
         """Writing unrelated memories should create separate files."""
-        vault = _setup_vault(tmp_path, monkeypatch)
         import memory.vault
         monkeypatch.setattr(memory.vault, 'VAULT_ROOT', vault)
 
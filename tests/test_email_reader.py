@@ -7,10 +7,6 @@ import json
 import pytest
 from unittest.mock import patch, MagicMock
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from agents.email_reader import EmailReaderAgent
 
 
@@ -118,3 +114,28 @@ class TestEmailReaderSystemPrompt:
         """The read_emails tool should still be defined for backwards compatibility."""
         tool_names = [t["name"] for t in self.agent.tools]
         assert "read_emails" in tool_names
+
+    def test_prompt_and_tools_shared_across_instances(self):
+        """The prompt and tool schemas are built once, not per agent."""
+        other = EmailReaderAgent()
+        assert other.system_prompt is self.agent.system_prompt
+        assert other.tools is self.agent.tools
+
+
+class TestEmailReaderThreadSafety:
+    """Batches run on several threads through one agent instance."""
+
+    def test_history_is_per_thread(self):
+        """A history set on one thread should not be visible on another."""
+        import threading
+
+        agent = EmailReaderAgent()
+        agent.conversation_history = [{"role": "user", "content": "main thread"}]
+
+        seen = []
+        worker = threading.Thread(target=lambda: seen.append(list(agent.conversation_history)))
+        worker.start()
+        worker.join()
+
+        assert seen == [[]]
+        assert len(agent.conversation_history) == 1
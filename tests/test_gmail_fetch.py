@@ -0,0 +1,353 @@
+# tests/test_gmail_fetch.py
+#
+# Tests for downloading messages from Gmail (tools/gmail_tools.py).
+# A fake service stands in for the Gmail API, so nothing here touches
+# the network.
+
+import base64
+from email.utils import parseaddr
+
+import pytest
+
+import tools.gmail_tools as gmail_tools
+
+
+# ── Fake Gmail service ─────────────────────────────────────────────────
+
+class FakeBatch:
+    """
+    Stands in for googleapiclient's BatchHttpRequest.
+
+    Records every add() and, on execute(), calls the callback for each
+    request in reverse order (real batches don't promise any order).
+    """
+
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.added = []  # (request, request_id) in add() order
+
+    def add(self, request, request_id):
+        self.added.append((request, request_id))
+
+    def execute(self):
+        self.service.batches.append(self)
+        if len(self.service.batches) in self.service.failing_batches:
+            raise ConnectionError('batch dropped')
+        for request, request_id in reversed(self.added):
+            msg_id = request['id']
+            if msg_id in self.service.missing:
+                continue  # Gmail never answered this one
+            if msg_id in self.service.errors:
+                self.callback(request_id, None, self.service.errors[msg_id])
+            else:
+                self.callback(request_id, {'id': msg_id, 'kwargs': request}, None)
+
+
+class FakeService:
+    """
+    Just enough of the Gmail API service for _iter_messages.
+
+    Args:
+        missing:         Message IDs the batch never answers.
+        errors:          {msg_id: exception} reported for single messages.
+        failing_batches: 1-based numbers of the batches whose execute() raises.
+    """
+
+    def __init__(self, missing=(), errors=None, failing_batches=()):
+        self.missing = set(missing)
+        self.errors = errors or {}
+        self.failing_batches = set(failing_batches)
+        self.batches = []  # FakeBatch objects, in execute() order
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, **kwargs):
+        # The "request" is just the arguments it was built with
+        return kwargs
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    """Two messages per batch, so a handful of IDs spans several batches."""
+    monkeypatch.setattr(gmail_tools, 'GMAIL_BATCH_SIZE', 2)
+
+
+def _fetch(service, ids, need_body=True):
+    return list(gmail_tools._iter_messages(service, ids, need_body=need_body))
+
+
+# ── Batching ───────────────────────────────────────────────────────────
+
+class TestIterMessages:
+    def test_one_batch_per_chunk(self):
+        """Five IDs at two per batch are three batches of 2, 2 and 1."""
+        service = FakeService()
+        _fetch(service, ['a', 'b', 'c', 'd', 'e'])
+
+        assert [[r['id'] for r, _ in b.added] for b in service.batches] == [
+            ['a', 'b'], ['c', 'd'], ['e'],
+        ]
+
+    def test_request_ids_restart_per_chunk(self):
+        """Request IDs are positions within the chunk, even for repeated IDs."""
+        service = FakeService()
+        _fetch(service, ['a', 'a', 'b'])
+
+        assert [[rid for _, rid in b.added] for b in service.batches] == [
+            ['0', '1'], ['0'],
+        ]
+
+    def test_yields_in_input_order(self):
+        """Answers come back reversed, but results follow the ID list."""
+        ids = ['m1', 'm2', 'm3', 'm4', 'm5']
+        results = _fetch(FakeService(), ids)
+
+        assert [msg_id for msg_id, _, _ in results] == ids
+        assert [msg['id'] for _, msg, _ in results] == ids
+        assert all(error is None for _, _, error in results)
+
+    def test_full_or_metadata_format(self):
+        """need_body picks the whole message or just the headers."""
+        full = FakeService()
+        _fetch(full, ['a'])
+        meta = FakeService()
+        _fetch(meta, ['a'], need_body=False)
+
+        assert full.batches[0].added[0][0]['format'] == 'full'
+        request = meta.batches[0].added[0][0]
+        assert request['format'] == 'metadata'
+        assert request['metadataHeaders'] == gmail_tools._METADATA_HEADERS
+
+    def test_missing_response_is_an_error(self):
+        """A message the batch never answered is reported, not dropped."""
+        results = _fetch(FakeService(missing={'b'}), ['a', 'b', 'c'])
+
+        msg_id, msg, error = results[1]
+        assert msg_id == 'b' and msg is None
+        assert isinstance(error, RuntimeError)
+        assert str(error) == 'no response in batch'
+        assert results[0][2] is None and results[2][2] is None
+
+    def test_single_message_error_is_passed_through(self):
+        """A per-message failure is yielded with that message's ID."""
+        boom = ValueError('not found')
+        results = _fetch(FakeService(errors={'c': boom}), ['a', 'b', 'c', 'd'])
+
+        assert results[2] == ('c', None, boom)
+        assert [msg is not None for _, msg, _ in results] == [True, True, False, True]
+
+    def test_failed_batch_reports_every_id_in_its_chunk(self):
+        """If execute() raises, each of its messages gets the error; other chunks carry on."""
+        results = _fetch(FakeService(failing_batches={2}), ['a', 'b', 'c', 'd', 'e'])
+
+        assert [msg_id for msg_id, _, _ in results] == ['a', 'b', 'c', 'd', 'e']
+        failed = [(msg_id, msg) for msg_id, msg, error in results if error is not None]
+        assert failed == [('c', None), ('d', None)]
+        assert isinstance(results[2][2], ConnectionError)
+        assert results[2][2] is results[3][2]
+        assert results[4][1]['id'] == 'e'
+
+
+# ── Picking the body ───────────────────────────────────────────────────
+
+def _b64(text):
+    """Encode text the way Gmail does (base64url)."""
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii')
+
+
+def _part(mime_type, text=None, parts=None):
+    part = {'mimeType': mime_type, 'body': {'data': _b64(text)} if text else {}}
+    if parts is not None:
+        part['parts'] = parts
+    return part
+
+
+BODY_CASES = [
+    pytest.param(
+        {'body': {'data': _b64('simple')}},
+        'simple', id='simple-message'),
+    pytest.param(
+        {'parts': [_part('text/html', '<p>html</p>'), _part('text/plain', 'plain')]},
+        'plain', id='plain-beats-html'),
+    pytest.param(
+        {'parts': [_part('text/plain', 'first'), _part('text/plain', 'second')]},
+        'second', id='last-plain-wins'),
+    pytest.param(
+        {'parts': [_part('text/html', '<p>one</p>'), _part('text/html', '<p>two</p>')]},
+        '<p>two</p>', id='last-html-when-no-plain'),
+    pytest.param(
+        {'parts': [
+            _part('multipart/alternative', parts=[
+                _part('text/plain', 'nested plain'),
+                _part('text/html', '<p>nested html</p>'),
+            ]),
+            _part('text/html', '<p>sibling html</p>'),
+        ]},
+        'nested plain', id='nested-answer-beats-sibling-html'),
+    pytest.param(
+        {'parts': [
+            _part('multipart/alternative', parts=[_part('text/html', '<p>deep</p>')]),
+            _part('text/html', '<p>sibling</p>'),
+        ]},
+        '<p>deep</p>', id='nested-html-beats-sibling-html'),
+    pytest.param(
+        {'parts': [
+            _part('multipart/mixed', parts=[_part('image/png')]),
+            _part('multipart/alternative', parts=[_part('text/plain', 'second section')]),
+        ]},
+        'second section', id='first-nested-section-with-a-body'),
+    pytest.param(
+        {'parts': [
+            _part('multipart/related', 'own body', parts=[_part('text/plain', 'inner')]),
+            _part('text/html', '<p>sibling</p>'),
+        ]},
+        'own body', id='multipart-with-its-own-body'),
+    pytest.param(
+        {'parts': [
+            _part('multipart/alternative', parts=[
+                _part('multipart/related', parts=[_part('text/plain', 'three deep')]),
+            ]),
+        ]},
+        'three deep', id='deeply-nested'),
+    pytest.param(
+        {'parts': [_part('application/pdf', 'not text')]},
+        '', id='no-text-parts'),
+    pytest.param({}, '', id='empty-payload'),
+]
+
+
+class TestExtractBody:
+    @pytest.mark.parametrize('payload, expected', BODY_CASES)
+    def test_picks_the_right_part(self, payload, expected):
+        assert gmail_tools._extract_body(payload) == expected
+
+    @pytest.mark.parametrize('payload, expected', BODY_CASES)
+    def test_find_body_data_matches(self, payload, expected):
+        """_find_body_data returns the still-encoded data of that same part."""
+        data = gmail_tools._find_body_data(payload)
+        assert (data or '') == (_b64(expected) if expected else '')
+
+
+# ── Decoding only the start of a long body ─────────────────────────────
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Record the length of the data each _b64url_decode call was given."""
+    calls = []
+    real = gmail_tools._b64url_decode
+
+    def spy(data):
+        calls.append(len(data))
+        return real(data)
+
+    monkeypatch.setattr(gmail_tools, '_b64url_decode', spy)
+    return calls
+
+
+def _limited(data, limit):
+    return gmail_tools._extract_body({'body': {'data': data}}, limit=limit)
+
+
+class TestExtractBodyLimit:
+    # limit=10 keeps at most 40 bytes, which is 56 base64 characters
+    LIMIT = 10
+    CUT = 56
+
+    @pytest.mark.parametrize('size', range(36, 48))
+    def test_bodies_around_the_cut(self, decode_calls, size):
+        """Just below the cut the whole body is decoded; above it, only the cut."""
+        text = ''.join(chr(ord('a') + i % 26) for i in range(size))
+        data = _b64(text)
+
+        assert _limited(data, self.LIMIT) == text[:self.LIMIT]
+        if len(data) > self.CUT:
+            assert decode_calls == [self.CUT]
+        else:
+            assert decode_calls == [len(data)]
+
+    @pytest.mark.parametrize('char', ['é', '€', '😀'])
+    @pytest.mark.parametrize('offset', range(4))
+    def test_multibyte_character_across_the_cut(self, char, offset):
+        """Characters of 2-4 bytes come out whole, wherever the cut falls."""
+        text = 'x' * offset + char * 60
+        assert _limited(_b64(text), self.LIMIT) == text[:self.LIMIT]
+
+    def test_limit_none_decodes_everything(self, decode_calls):
+        text = 'long body ' * 50
+        data = _b64(text)
+        assert gmail_tools._extract_body({'body': {'data': data}}) == text
+        assert decode_calls == [len(data)]
+
+    def test_stray_characters_are_skipped(self):
+        """Non-base64 characters (line breaks etc.) don't change the text."""
+        data = _b64('hello world, this is a test')
+        noisy = '\r\n'.join(data[i:i + 4] for i in range(0, len(data), 4))
+        assert _limited(noisy, 5) == 'hello'
+
+    def test_short_decode_falls_back_to_full_body(self, decode_calls):
+        """Stray characters before the cut leave it short, so the full body is decoded."""
+        text = '😀' * 40  # every kept character needs all 4 of its bytes
+        data = _b64(text)
+        noisy = data[:8] + '****' + data[8:]
+
+        assert _limited(noisy, self.LIMIT) == text[:self.LIMIT]
+        assert decode_calls == [self.CUT, len(noisy)]
+
+    def test_bad_padding_at_the_cut_falls_back_to_full_body(self, decode_calls):
+        """If the trimmed data can't be decoded (binascii.Error), decode it all."""
+        text = '😀' * 40
+        data = _b64(text)
+        # Three stray characters leave a number of base64 characters
+        # before the cut that no padding can make valid
+        noisy = data[:8] + '***' + data[8:]
+
+        assert _limited(noisy, self.LIMIT) == text[:self.LIMIT]
+        assert decode_calls == [self.CUT, len(noisy)]
+
+
+# ── Splitting the From header ──────────────────────────────────────────
+
+@pytest.mark.parametrize('raw_from', [
+    # Bare addresses
+    'alice@example.com',
+    '<alice@example.com>',
+    'first.last+tag@mail.example.co.uk',
+    # Plain names
+    'Alice <alice@example.com>',
+    'Alice Smith <alice@example.com>',
+    'Alice  Smith <alice@example.com>',
+    'Alice<alice@example.com>',
+    # Quoted names
+    '"Alice Smith" <alice@example.com>',
+    '"Smith, Alice" <alice@example.com>',
+    '"" <alice@example.com>',
+    '"Alice \\"Al\\" Smith" <alice@example.com>',
+    '"O\'Brien (Sales)" <sales@example.com>',
+    # Unicode names
+    'José Álvarez <jose@example.com>',
+    '"山田 太郎" <taro@example.jp>',
+    '=?UTF-8?B?5bGx55Sw?= <taro@example.jp>',
+    # Comments
+    'alice@example.com (Alice Smith)',
+    'Alice (work) <alice@example.com>',
+    # Several addresses
+    'Alice <alice@example.com>, Bob <bob@example.com>',
+    'alice@example.com, bob@example.com',
+    # Odd or broken
+    '',
+    'Alice',
+    'Alice <alice@example.com',
+    ' Alice <alice@example.com> ',
+    'Alice <>',
+])
+def test_split_from_matches_parseaddr(raw_from):
+    """The fast path gives exactly what email.utils.parseaddr() would."""
+    assert gmail_tools._split_from(raw_from) == parseaddr(raw_from)
@@ -0,0 +1,62 @@
+# tests/test_gmail_token.py
+#
+# Tests for the saved Gmail login token (tools/gmail_tools.py): a token
+# pickled by older versions is converted to token.json on first use.
+
+import json
+import pickle
+import threading
+
+import pytest
+from google.oauth2.credentials import Credentials
+
+import tools.gmail_tools as gmail_tools
+
+
+@pytest.fixture
+def token_paths(tmp_path, monkeypatch):
+    """Point both token files at tmp_path and re-arm the one-time migration."""
+    token = tmp_path / 'token.json'
+    legacy = tmp_path / 'token.pickle'
+    monkeypatch.setattr(gmail_tools, 'TOKEN_PATH', token)
+    monkeypatch.setattr(gmail_tools, 'LEGACY_TOKEN_PATH', legacy)
+    monkeypatch.setattr(gmail_tools, '_legacy_token_checked', threading.Event())
+    return token, legacy
+
+
+def _creds():
+    return Credentials(token='access', refresh_token='refresh',
+                       token_uri='https://oauth2.googleapis.com/token',
+                       client_id='client', client_secret='secret',
+                       scopes=gmail_tools.SCOPES)
+
+
+class TestLegacyTokenMigration:
+    def test_pickle_is_converted_to_json(self, token_paths):
+        """An old token.pickle becomes token.json and is then deleted."""
+        token, legacy = token_paths
+        legacy.write_bytes(pickle.dumps(_creds()))
+
+        creds = gmail_tools._load_credentials()
+
+        assert creds.refresh_token == 'refresh'
+        assert json.loads(token.read_text())['refresh_token'] == 'refresh'
+        assert not legacy.exists()
+
+    def test_existing_json_token_wins(self, token_paths):
+        """With a token.json already there, the pickle is left alone."""
+        token, legacy = token_paths
+        gmail_tools.save_credentials(_creds())
+        legacy.write_bytes(b'not a pickle')
+
+        assert gmail_tools._load_credentials().token == 'access'
+        assert legacy.exists()
+
+    def test_unreadable_pickle_means_logged_out(self, token_paths, capsys):
+        """A pickle that can't be loaded is reported, and we stay logged out."""
+        token, legacy = token_paths
+        legacy.write_bytes(b'not a pickle')
+
+        assert gmail_tools._load_credentials() is None
+        assert not token.exists()
+        assert 'connect Gmail again' in capsys.readouterr().out
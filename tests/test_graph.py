@@ -0,0 +1,98 @@
+# tests/test_graph.py
+#
+# Tests for the knowledge graph rebuild: nodes, bidirectional edges,
+# backlink injection, and the per-file parse cache that lets a rebuild
+# skip files that haven't changed.
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import memory.graph
+from memory.graph import rebuild_graph
+
+
+def _write(path: Path, frontmatter: str, body: str = "Body."):
+    """Write a memory file with the given raw YAML frontmatter."""
+    path.write_text(f"---\n{frontmatter}\n---\n\n{body}\n", encoding='utf-8')
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    """A temporary vault with one person and one decision linking to them."""
+    root = tmp_path / 'vault'
+    for category in memory.graph.MEMORY_CATEGORIES:
+        (root / category).mkdir(parents=True)
+
+    _write(root / 'people' / 'alice-park-a1b2.md',
+           'title: "Alice Park — Designer"\npriority: "🟡"')
+    _write(root / 'decisions' / 'chose-react-c3d4.md',
+           'title: "Chose React"\npriority: "🟡"\nrelated_to:\n- Alice Park')
+
+    monkeypatch.setattr(memory.graph, 'VAULT_ROOT', root)
+    monkeypatch.setattr(memory.graph, 'GRAPH_FILE', root / '_graph.json')
+    return root
+
+
+class TestRebuildGraph:
+    def test_builds_nodes_and_bidirectional_edges(self, vault):
+        graph = rebuild_graph()
+
+        assert set(graph['nodes']) == {'people/alice-park-a1b2.md', 'decisions/chose-react-c3d4.md'}
+        assert {'from': 'decisions/chose-react-c3d4.md', 'to': 'people/alice-park-a1b2.md',
+                'relation': 'related_to'} in graph['edges']
+        assert {'from': 'people/alice-park-a1b2.md', 'to': 'decisions/chose-react-c3d4.md',
+                'relation': 'backlink'} in graph['edges']
+        assert (vault / '_graph.json').exists()
+
+    def test_injects_backlink_into_frontmatter(self, vault):
+        rebuild_graph()
+
+        text = (vault / 'people' / 'alice-park-a1b2.md').read_text(encoding='utf-8')
+        assert 'Chose React' in text
+
+
+class TestParseCache:
+    def test_unchanged_files_are_not_reparsed(self, vault):
+        """A second rebuild with no file changes parses nothing."""
+        # Backlink injection edits files on the first rebuilds; after
+        # that the vault is stable
+        for _ in range(3):
+            rebuild_graph()
+
+        with patch('memory.graph._load_yaml', wraps=memory.graph._load_yaml) as spy:
+            graph = rebuild_graph()
+
+        assert spy.call_count == 0
+        assert len(graph['nodes']) == 2
+
+    def test_changed_file_is_picked_up(self, vault):
+        """Editing one file re-parses just that file."""
+        for _ in range(3):
+            rebuild_graph()
+
+        _write(vault / 'decisions' / 'chose-react-c3d4.md',
+               'title: "Chose React and Vite"\npriority: "🔴"')
+
+        with patch('memory.graph._load_yaml', wraps=memory.graph._load_yaml) as spy:
+            graph = rebuild_graph()
+
+        assert spy.call_count == 1
+        assert graph['nodes']['decisions/chose-react-c3d4.md']['title'] == 'Chose React and Vite'
+
+    def test_deleted_file_drops_its_node(self, vault):
+        rebuild_graph()
+
+        (vault / 'decisions' / 'chose-react-c3d4.md').unlink()
+        graph = rebuild_graph()
+
+        assert list(graph['nodes']) == ['people/alice-park-a1b2.md']
+        assert graph['edges'] == []
+
+    def test_returned_nodes_do_not_alias_cache(self, vault):
+        """Mutating a returned node must not leak into the next rebuild."""
+        rebuild_graph()['nodes']['people/alice-park-a1b2.md']['title'] = 'Mutated'
+
+        graph = rebuild_graph()
+        assert graph['nodes']['people/alice-park-a1b2.md']['title'] == 'Alice Park — Designer'
@@ -1,12 +1,7 @@
 """Integration tests: Knowledge Index injection into MemoryWriter prompt."""
 
-import sys
-from pathlib import Path
-
 import yaml
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from memory.knowledge_index import build_knowledge_index
 
 
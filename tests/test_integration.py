@@ -7,10 +7,6 @@ import json
 import pytest
 from unittest.mock import patch, MagicMock, call
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 def _make_fake_emails(count: int) -> list[dict]:
     """Generate a list of fake email dicts for testing."""
@@ -32,15 +28,29 @@ def _make_fake_emails(count: int) -> list[dict]:
     ]
 
 
+@pytest.fixture(autouse=True)
+def later_steps():
+    """
+    Stub out the steps after the Memory Writer (graph, actions, insights):
+    these tests cover fetch → batch analyze → write.
+    """
+    from orchestrator import Orchestrator
+    with patch.object(Orchestrator, 'refresh_actions', return_value=""), \
+         patch.object(Orchestrator, 'reconcile_actions', return_value=""), \
+         patch.object(Orchestrator, 'generate_insights', return_value=""), \
+         patch('orchestrator.rebuild_graph', return_value={'nodes': {}, 'edges': []}), \
+         patch('orchestrator.build_knowledge_index', return_value=''):
+        yield
+
+
 class TestFullPipelineFlow:
     """Integration test for the complete build pipeline."""
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 5)
     @patch('orchestrator.get_vault_stats', return_value={"total": 3, "people": 2, "decisions": 1})
-    @patch('orchestrator.fetch_emails')
-    def test_full_pipeline_single_batch(self, mock_fetch, mock_stats):
+    def test_full_pipeline_single_batch(self, mock_stats, gmail):
         """3 emails with batch_size 5 → 1 batch → 1 analyze_batch call → 1 writer run."""
-        mock_fetch.return_value = _make_fake_emails(3)
+        gmail.emails.extend(_make_fake_emails(3))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -67,10 +77,9 @@ class TestFullPipelineFlow:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 3)
     @patch('orchestrator.get_vault_stats', return_value={"total": 10, "people": 5, "decisions": 3, "commitments": 2})
-    @patch('orchestrator.fetch_emails')
-    def test_full_pipeline_multiple_batches(self, mock_fetch, mock_stats):
+    def test_full_pipeline_multiple_batches(self, mock_stats, gmail):
         """10 emails with batch_size 3 → 4 batches."""
-        mock_fetch.return_value = _make_fake_emails(10)
+        gmail.emails.extend(_make_fake_emails(10))
 
         batch_observations = [
             json.dumps({"observations": [{"type": "people", "title": f"Person {i}"}]})
@@ -96,7 +105,9 @@ class TestFullPipelineFlow:
         assert orch.email_reader.analyze_batch.call_count == 4
 
         # Verify each batch got the right number of emails
-        for i, c in enumerate(orch.email_reader.analyze_batch.call_args_list):
+        # Batches run concurrently, so order the calls by batch number
+        calls = sorted(orch.email_reader.analyze_batch.call_args_list, key=lambda c: c.args[1])
+        for i, c in enumerate(calls):
             batch_json = c.args[0]
             batch_data = json.loads(batch_json)
             expected_size = 1 if i == 3 else 3  # Last batch has 1 email
@@ -109,10 +120,9 @@ class TestFullPipelineFlow:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_progress_events_order_and_content(self, mock_fetch, mock_stats):
+    def test_progress_events_order_and_content(self, mock_stats, gmail):
         """Verify the exact sequence of progress events."""
-        mock_fetch.return_value = _make_fake_emails(15)
+        gmail.emails.extend(_make_fake_emails(15))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -126,9 +136,11 @@ class TestFullPipelineFlow:
             events = []
             orch.build_memory("build", progress_callback=lambda e: events.append(e), max_emails=15)
 
-        # Expected event sequence for 15 emails / 10 batch_size = 2 batches:
+        # Expected event sequence for 15 emails / 10 batch_size = 2 batches
+        # (the action, reconciliation and insights steps are stubbed out):
         expected_stages = [
             ("fetching", "started"),
+            ("fetching", "in_progress"),       # IDs listed, fetching content
             ("fetching", "complete"),
             ("email_reader", "started"),
             ("email_reader", "in_progress"),   # Batch 1
@@ -136,6 +148,8 @@ class TestFullPipelineFlow:
             ("email_reader", "complete"),
             ("memory_writer", "started"),
             ("memory_writer", "complete"),
+            ("graph_rebuild", "started"),
+            ("graph_rebuild", "complete"),
             ("complete", "complete"),
         ]
 
@@ -144,10 +158,9 @@ class TestFullPipelineFlow:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_no_progress_callback(self, mock_fetch, mock_stats):
+    def test_no_progress_callback(self, mock_stats, gmail):
         """Pipeline should work fine without a progress callback."""
-        mock_fetch.return_value = _make_fake_emails(5)
+        gmail.emails.extend(_make_fake_emails(5))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -169,10 +182,9 @@ class TestEdgeCases:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 1, "people": 1})
-    @patch('orchestrator.fetch_emails')
-    def test_single_email(self, mock_fetch, mock_stats):
+    def test_single_email(self, mock_stats, gmail):
         """1 email should create exactly 1 batch."""
-        mock_fetch.return_value = _make_fake_emails(1)
+        gmail.emails.extend(_make_fake_emails(1))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -191,10 +203,9 @@ class TestEdgeCases:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 10, "people": 10})
-    @patch('orchestrator.fetch_emails')
-    def test_exact_batch_size(self, mock_fetch, mock_stats):
+    def test_exact_batch_size(self, mock_stats, gmail):
         """10 emails with batch_size 10 → exactly 1 batch."""
-        mock_fetch.return_value = _make_fake_emails(10)
+        gmail.emails.extend(_make_fake_emails(10))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -211,10 +222,9 @@ class TestEdgeCases:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 11, "people": 11})
-    @patch('orchestrator.fetch_emails')
-    def test_one_over_batch_size(self, mock_fetch, mock_stats):
+    def test_one_over_batch_size(self, mock_stats, gmail):
         """11 emails with batch_size 10 → 2 batches (10 + 1)."""
-        mock_fetch.return_value = _make_fake_emails(11)
+        gmail.emails.extend(_make_fake_emails(11))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -230,16 +240,15 @@ class TestEdgeCases:
         assert orch.email_reader.analyze_batch.call_count == 2
 
         # First batch: 10 emails, second batch: 1 email
-        calls = orch.email_reader.analyze_batch.call_args_list
+        calls = sorted(orch.email_reader.analyze_batch.call_args_list, key=lambda c: c.args[1])
         assert len(json.loads(calls[0].args[0])) == 10
         assert len(json.loads(calls[1].args[0])) == 1
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 3)
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_large_email_count(self, mock_fetch, mock_stats):
+    def test_large_email_count(self, mock_stats, gmail):
         """100 emails with batch_size 3 → 34 batches."""
-        mock_fetch.return_value = _make_fake_emails(100)
+        gmail.emails.extend(_make_fake_emails(100))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -257,10 +266,9 @@ class TestEdgeCases:
         assert orch.email_reader.analyze_batch.call_count == expected_batches
 
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_fetch_emails_raises_error(self, mock_fetch, mock_stats):
-        """If fetch_emails raises, the error should propagate."""
-        mock_fetch.side_effect = Exception("Gmail connection failed")
+    def test_fetch_emails_raises_error(self, mock_stats, gmail):
+        """If listing the inbox raises, the error should propagate."""
+        gmail.list_ids.side_effect = Exception("Gmail connection failed")
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -271,12 +279,43 @@ class TestEdgeCases:
             with pytest.raises(Exception, match="Gmail connection failed"):
                 orch.build_memory("build")
 
+    @patch('orchestrator.EMAIL_BATCH_SIZE', 5)
+    @patch('orchestrator.get_vault_stats', return_value={"total": 0})
+    def test_fetch_fails_after_batches_submitted(self, mock_stats, gmail):
+        """
+        If the download breaks off mid-way, the error propagates once the
+        batches already handed to the Email Reader have finished — and no
+        email is marked as processed, so the next build fetches them again.
+        """
+        emails = _make_fake_emails(12)
+        gmail.emails.extend(emails)
+
+        def broken_fetch(ids):
+            yield from emails[:10]   # Two full batches go out for analysis
+            raise ConnectionError("Gmail connection reset")
+
+        gmail.fetch.side_effect = broken_fetch
+
+        from orchestrator import Orchestrator
+        with patch.object(Orchestrator, '__init__', lambda self: None):
+            orch = Orchestrator()
+            orch.email_reader = MagicMock()
+            orch.email_reader.analyze_batch.return_value = '{}'
+            orch.memory_writer = MagicMock()
+
+            with pytest.raises(ConnectionError, match="connection reset"):
+                orch.build_memory("build", max_emails=12)
+
+        batch_nums = sorted(c.args[1] for c in orch.email_reader.analyze_batch.call_args_list)
+        assert batch_nums == [1, 2]
+        orch.memory_writer.run.assert_not_called()
+        gmail.save.assert_not_called()
+
     @patch('orchestrator.EMAIL_BATCH_SIZE', 10)
     @patch('orchestrator.get_vault_stats', return_value={"total": 0})
-    @patch('orchestrator.fetch_emails')
-    def test_analyze_batch_error_skips_batch(self, mock_fetch, mock_stats):
+    def test_analyze_batch_error_skips_batch(self, mock_stats, gmail):
         """If all batches fail, the pipeline returns an error message (not an exception)."""
-        mock_fetch.return_value = _make_fake_emails(5)
+        gmail.emails.extend(_make_fake_emails(5))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -294,10 +333,9 @@ class TestEdgeCases:
 
     @patch('orchestrator.EMAIL_BATCH_SIZE', 5)
     @patch('orchestrator.get_vault_stats', return_value={"total": 2})
-    @patch('orchestrator.fetch_emails')
-    def test_partial_batch_failure_continues(self, mock_fetch, mock_stats):
+    def test_partial_batch_failure_continues(self, mock_stats, gmail):
         """If one batch fails but others succeed, the pipeline continues with partial results."""
-        mock_fetch.return_value = _make_fake_emails(10)
+        gmail.emails.extend(_make_fake_emails(10))
 
         from orchestrator import Orchestrator
         with patch.object(Orchestrator, '__init__', lambda self: None):
@@ -1,12 +1,7 @@
 """Tests for the knowledge index builder (memory/knowledge_index.py)."""
 
-import sys
-from pathlib import Path
-
 import yaml
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from memory.knowledge_index import build_knowledge_index
 
 
@@ -10,94 +10,94 @@ import json
 import pytest
 import shutil
 from pathlib import Path
-from unittest.mock import patch
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from memory.vault import read_memory, write_memory, initialize_vault, VAULT_ROOT
 
 
-TEST_VAULT = Path('test_markdown_tmp')
+def _rel(filepath, root) -> str:
+    """Vault-relative, forward-slash path of a file returned by write_memory."""
+    return Path(filepath).relative_to(root).as_posix()
+
+
+def _assert_contains(text, *needles):
+    """
+    Assert every needle appears in text, naming the ones that don't.
+
+    One plain assert with its own message, rather than one assert per
+    needle at each call site, so pytest has a single statement to rewrite.
+    """
+    missing = [n for n in needles if n not in text]
+    assert not missing, f"missing from content: {missing!r}"
+
+
+def _use_vault(mp, root):
+    """
+    Point the vault — and everything write_memory touches alongside it
+    (dedup, graph, changelog) — at root, so nothing is shared through the
+    working directory and tests can run in parallel.
+    """
+    mp.setattr('memory.vault.VAULT_ROOT', root)
+    mp.setattr('memory.dedup.VAULT_ROOT', root)
+    mp.setattr('memory.graph.VAULT_ROOT', root)
+    mp.setattr('memory.graph.GRAPH_FILE', root / '_graph.json')
+    mp.setattr('memory.changelog.CHANGELOG_FILE', root / '_changelog.md')
 
 
 @pytest.fixture(autouse=True)
-def setup_test_vault():
-    """Create a temporary vault before each test, clean up after."""
-    with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-        initialize_vault()
-        yield
-    if TEST_VAULT.exists():
-        shutil.rmtree(TEST_VAULT)
+def vault(tmp_path, monkeypatch, _vault_template):
+    """
+    Give each test a fresh copy of the vault skeleton (see conftest.py)
+    under tmp_path.
+    pytest allocates and reaps tmp_path itself, so there's no cleanup.
+    """
+    vault_dir = tmp_path / 'vault'
+    shutil.copytree(_vault_template, vault_dir)
+    _use_vault(monkeypatch, vault_dir)
+    return vault_dir
+
+
+# One document containing every basic markdown feature. It is written and
+# read back once per class; each feature is then checked by its own case.
+_COMBINED_MD = (
+    "# Top Level\n\n## Section\n\n### Subsection\n\n#### Detail\n\n"
+    "This is **bold** and this is *italic* and this is ***both***.\n\n"
+    "- Item one\n- Item two\n- Item three\n\n1. First\n2. Second\n3. Third\n\n"
+    "> This is a quote from an email.\n\n"
+    "Use the `fetch` function to call the API.\n\n"
+    "Discussed this with [[Sarah Chen]] and [[Bob Smith]].\n\n"
+    "Section one\n\n---\n\nSection two"
+)
+
+
+@pytest.fixture(scope='class')
+def combined_doc(tmp_path_factory, _vault_template):
+    """Write _COMBINED_MD to its own vault and return the file's text."""
+    vault = tmp_path_factory.mktemp('combined') / 'vault'
+    shutil.copytree(_vault_template, vault)
+    with pytest.MonkeyPatch.context() as mp:
+        _use_vault(mp, vault)
+        filepath = write_memory(title="Markdown Features", memory_type="decisions",
+                                content=_COMBINED_MD)
+        return Path(filepath).read_text(encoding='utf-8')
 
 
 class TestMarkdownContentPreservation:
     """Test that vault content preserves all markdown structures."""
 
-    def test_headers_preserved(self):
-        """All header levels (h1-h4) should be preserved in content."""
-        md = "# Top Level\n\n## Section\n\n### Subsection\n\n#### Detail"
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(title="Header Test", memory_type="decisions", content=md)
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            # The content includes the # Title heading added by write_memory
-            assert "## Section" in result['content']
-            assert "### Subsection" in result['content']
-            assert "#### Detail" in result['content']
-
-    def test_bold_and_italic_preserved(self):
-        """Bold and italic markers should be preserved."""
-        md = "This is **bold** and this is *italic* and this is ***both***."
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(title="Format Test", memory_type="decisions", content=md)
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert "**bold**" in result['content']
-            assert "*italic*" in result['content']
-
-    def test_lists_preserved(self):
-        """Unordered and ordered lists should be preserved."""
-        md = "- Item one\n- Item two\n- Item three\n\n1. First\n2. Second\n3. Third"
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(title="List Test", memory_type="decisions", content=md)
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert "- Item one" in result['content']
-            assert "- Item two" in result['content']
-            assert "1. First" in result['content']
-
-    def test_blockquote_preserved(self):
-        """Blockquotes should be preserved."""
-        md = "> This is a quote from an email."
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(title="Quote Test", memory_type="decisions", content=md)
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert "> This is a quote" in result['content']
-
-    def test_code_preserved(self):
-        """Inline code should be preserved."""
-        md = "Use the `fetch` function to call the API."
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(title="Code Test", memory_type="decisions", content=md)
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert "`fetch`" in result['content']
-
-    def test_wiki_links_preserved(self):
-        """Wiki-links like [[Name]] should be preserved."""
-        md = "Discussed this with [[Sarah Chen]] and [[Bob Smith]]."
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(title="Link Test", memory_type="decisions", content=md)
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert "[[Sarah Chen]]" in result['content']
-            assert "[[Bob Smith]]" in result['content']
-
-    def test_horizontal_rule_preserved(self):
-        """Horizontal rules should be preserved."""
-        md = "Section one\n\n---\n\nSection two"
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(title="HR Test", memory_type="decisions", content=md)
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert "---" in result['content']
-
-    def test_person_template_structure(self):
+    @pytest.mark.parametrize('needle', [
+        "## Section", "### Subsection", "#### Detail",        # headers
+        "**bold**", "*italic*", "***both***",                 # emphasis
+        "- Item one", "- Item two", "1. First",               # lists
+        "> This is a quote",                                  # blockquote
+        "`fetch`",                                            # inline code
+        "[[Sarah Chen]]", "[[Bob Smith]]",                    # wiki-links
+        "Section one\n\n---\n\nSection two",                  # horizontal rule
+    ])
+    def test_feature_preserved(self, combined_doc, needle):
+        """Each markdown structure should be written to the file unchanged."""
+        _assert_contains(combined_doc, needle)
+
+    def test_person_template_structure(self, vault):
         """A realistic person memory should have all sections readable."""
         content = (
             "## Overview\n"
@@ -114,27 +114,29 @@ class TestMarkdownContentPreservation:
             "- Morning standup at 9am\n"
             "- Async communication\n"
         )
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Alex Johnson — Platform Lead",
-                memory_type="people",
-                content=content,
-                role="Platform Lead",
-                organization="TechCo",
-                email="alex@techco.com",
-            )
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-
-            assert result is not None
-            assert "## Overview" in result['content']
-            assert "## Key Interactions" in result['content']
-            assert "## Topics of Interest" in result['content']
-            assert "## Communication Style" in result['content']
-            assert "## Preferences" in result['content']
-            assert "- Distributed systems" in result['content']
-            assert "Morning standup" in result['content']
-
-    def test_me_file_content(self):
+        filepath = write_memory(
+            title="Alex Johnson — Platform Lead",
+            memory_type="people",
+            content=content,
+            role="Platform Lead",
+            organization="TechCo",
+            email="alex@techco.com",
+        )
+        # Only the body matters here, so check the file text directly
+        text = Path(filepath).read_text(encoding='utf-8')
+
+        _assert_contains(
+            text,
+            "## Overview",
+            "## Key Interactions",
+            "## Topics of Interest",
+            "## Communication Style",
+            "## Preferences",
+            "- Distributed systems",
+            "Morning standup",
+        )
+
+    def test_me_file_content(self, vault):
         """The special me.md file should be readable with rich content."""
         content = (
             "## Overview\n"
@@ -149,58 +151,57 @@ class TestMarkdownContentPreservation:
             "- Dark mode everywhere\n"
             "- Morning deep work blocks\n"
         )
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Me — Software Engineer",
-                memory_type="people",
-                content=content,
-            )
-            # Verify the file is me.md (not me-xxxx.md)
-            assert filepath.endswith('me.md')
-
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert result is not None
-            assert "## Overview" in result['content']
-            assert "Machine learning" in result['content']
-            assert "Dark mode" in result['content']
-
-    def test_me_file_with_real_name(self):
+        filepath = write_memory(
+            title="Me — Software Engineer",
+            memory_type="people",
+            content=content,
+        )
+        # Verify the file is me.md (not me-xxxx.md)
+        assert filepath.endswith('me.md')
+
+        text = Path(filepath).read_text(encoding='utf-8')
+        _assert_contains(
+            text,
+            "## Overview",
+            "Machine learning",
+            "Dark mode",
+        )
+
+    def test_me_file_with_real_name(self, vault):
         """When name param is provided, me.md frontmatter shows the real name."""
         content = "## Overview\nSoftware engineer at TechCo.\n"
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Me — Software Engineer",
-                memory_type="people",
-                content=content,
-                name="John Doe",
-            )
-            # Filename should still be me.md (routed by title)
-            assert filepath.endswith('me.md')
-
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert result is not None
-            # Frontmatter should show the real name, not "Me"
-            assert result['frontmatter']['name'] == "John Doe"
-            # The heading should use the real name too
-            assert "# John Doe" in result['content']
-
-    def test_me_file_without_name_shows_me(self):
+        filepath = write_memory(
+            title="Me — Software Engineer",
+            memory_type="people",
+            content=content,
+            name="John Doe",
+        )
+        # Filename should still be me.md (routed by title)
+        assert filepath.endswith('me.md')
+
+        result = read_memory(_rel(filepath, vault))
+        assert result is not None
+        # Frontmatter should show the real name, not "Me"
+        assert result['frontmatter']['name'] == "John Doe"
+        # The heading should use the real name too
+        assert "# John Doe" in result['content']
+
+    def test_me_file_without_name_shows_me(self, vault):
         """Without name param, me.md frontmatter falls back to 'Me'."""
         content = "## Overview\nSoftware engineer.\n"
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Me — Software Engineer",
-                memory_type="people",
-                content=content,
-            )
-            result = read_memory(str(Path(filepath).relative_to(TEST_VAULT)))
-            assert result['frontmatter']['name'] == "Me"
+        filepath = write_memory(
+            title="Me — Software Engineer",
+            memory_type="people",
+            content=content,
+        )
+        result = read_memory(_rel(filepath, vault))
+        assert result['frontmatter']['name'] == "Me"
 
 
 class TestFullAPIChainWithMarkdown:
     """Test the complete API chain with realistic markdown content."""
 
-    def test_api_returns_renderable_markdown(self):
+    def test_api_returns_renderable_markdown(self, vault, client):
         """The API should return content that contains markdown formatting."""
         content = (
             "## Decision Context\n\n"
@@ -216,40 +217,35 @@ class TestFullAPIChainWithMarkdown:
             "- [[Alex Johnson]] recommended it\n\n"
             "> \"Always pick the boring technology\" — Dan McKinley\n"
         )
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Database Selection — PostgreSQL",
-                memory_type="decisions",
-                content=content,
-                tags=["architecture", "database"],
-                related_to=["Alex Johnson"],
-            )
-
-            with patch('memory.vault.VAULT_ROOT', TEST_VAULT), \
-                 patch('web.app.initialize_vault'), \
-                 patch('web.app.Orchestrator'):
-                from web.app import app
-                from fastapi.testclient import TestClient
-                client = TestClient(app)
-
-                rel_path = str(Path(filepath).relative_to(TEST_VAULT)).replace('\\', '/')
-                resp = client.get(f"/api/memory/{rel_path}")
-                assert resp.status_code == 200
-                data = resp.json()
-
-                c = data['content']
-                # Verify markdown structures survive the full API chain
-                assert "## Decision Context" in c
-                assert "**database**" in c
-                assert "## Options Considered" in c
-                assert "1. PostgreSQL" in c
-                assert "*mature and reliable*" in c
-                assert "- Strong ACID" in c
-                assert "`SQL`" in c
-                assert "[[Alex Johnson]]" in c
-                assert "> " in c  # Blockquote preserved
-
-    def test_api_people_memory_with_all_sections(self):
+        filepath = write_memory(
+            title="Database Selection — PostgreSQL",
+            memory_type="decisions",
+            content=content,
+            tags=["architecture", "database"],
+            related_to=["Alex Johnson"],
+        )
+
+        rel_path = _rel(filepath, vault)
+        resp = client.get(f"/api/memory/{rel_path}")
+        assert resp.status_code == 200
+        data = resp.json()
+
+        c = data['content']
+        # Verify markdown structures survive the full API chain
+        _assert_contains(
+            c,
+            "## Decision Context",
+            "**database**",
+            "## Options Considered",
+            "1. PostgreSQL",
+            "*mature and reliable*",
+            "- Strong ACID",
+            "`SQL`",
+            "[[Alex Johnson]]",
+            "> ",  # Blockquote preserved
+        )
+
+    def test_api_people_memory_with_all_sections(self, vault, client):
         """People memory with full template should return all sections."""
         content = (
             "## Overview\nPlatform lead at TechCo.\n\n"
@@ -260,38 +256,33 @@ class TestFullAPIChainWithMarkdown:
             "## Communication Style\nConcise. Uses bullet points.\n\n"
             "## Preferences\n- Afternoon meetings\n"
         )
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Test Person — Platform Lead",
-                memory_type="people",
-                content=content,
-                role="Platform Lead",
-                organization="TechCo",
-                email="test@techco.com",
-            )
-
-            with patch('memory.vault.VAULT_ROOT', TEST_VAULT), \
-                 patch('web.app.initialize_vault'), \
-                 patch('web.app.Orchestrator'):
-                from web.app import app
-                from fastapi.testclient import TestClient
-                client = TestClient(app)
-
-                rel_path = str(Path(filepath).relative_to(TEST_VAULT)).replace('\\', '/')
-                resp = client.get(f"/api/memory/{rel_path}")
-                assert resp.status_code == 200
-                data = resp.json()
-
-                c = data['content']
-                assert "## Overview" in c
-                assert "## Key Interactions" in c
-                assert "## Topics of Interest" in c
-                assert "## Communication Style" in c
-                assert "## Preferences" in c
-                assert "- Kubernetes" in c
-
-                # Frontmatter should have people-specific fields
-                fm = data['frontmatter']
-                assert fm.get('name') == "Test Person"
-                assert fm.get('role') == "Platform Lead"
-                assert fm.get('email') == "test@techco.com"
+        filepath = write_memory(
+            title="Test Person — Platform Lead",
+            memory_type="people",
+            content=content,
+            role="Platform Lead",
+            organization="TechCo",
+            email="test@techco.com",
+        )
+
+        rel_path = _rel(filepath, vault)
+        resp = client.get(f"/api/memory/{rel_path}")
+        assert resp.status_code == 200
+        data = resp.json()
+
+        c = data['content']
+        _assert_contains(
+            c,
+            "## Overview",
+            "## Key Interactions",
+            "## Topics of Interest",
+            "## Communication Style",
+            "## Preferences",
+            "- Kubernetes",
+        )
+
+        # Frontmatter should have people-specific fields
+        fm = data['frontmatter']
+        assert fm.get('name') == "Test Person"
+        assert fm.get('role') == "Platform Lead"
+        assert fm.get('email') == "test@techco.com"
@@ -1,10 +1,8 @@
 """Tests for the ReconciliationAgent's heuristic matching and expiry logic."""
 
-import sys
-from pathlib import Path
 from datetime import datetime, timedelta
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 from agents.reconciliation_agent import heuristic_match, check_expiry
 
@@ -56,25 +54,26 @@ class TestHeuristicMatching:
         assert heuristic_match(action, []) is None
 
 
-class TestExpiryCheck:
-    """Test deadline-based expiry logic."""
-
-    def test_past_deadline_is_expired(self):
-        """Action with past deadline should be marked expired."""
-        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-        assert check_expiry(yesterday) is True
+@pytest.fixture(scope='module')
+def dates():
+    """Deadline strings relative to a single capture of "now"."""
+    now = datetime.now()
+    return {
+        'yesterday': (now - timedelta(days=1)).strftime('%Y-%m-%d'),
+        'today': now.strftime('%Y-%m-%d'),
+        'tomorrow': (now + timedelta(days=1)).strftime('%Y-%m-%d'),
+    }
 
-    def test_future_deadline_not_expired(self):
-        """Action with future deadline should not be expired."""
-        tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
-        assert check_expiry(tomorrow) is False
 
-    def test_no_deadline_not_expired(self):
-        """Action with no deadline should not be expired."""
-        assert check_expiry('') is False
-        assert check_expiry(None) is False
+class TestExpiryCheck:
+    """Test deadline-based expiry logic."""
 
-    def test_today_deadline_not_expired(self):
-        """Action due today should not be expired yet."""
-        today = datetime.now().strftime('%Y-%m-%d')
-        assert check_expiry(today) is False
+    @pytest.mark.parametrize('deadline, expected', [
+        ('yesterday', True),    # past deadline is expired
+        ('today', False),       # due today isn't expired yet
+        ('tomorrow', False),    # future deadline
+        ('', False),            # no deadline
+        (None, False),
+    ])
+    def test_expiry(self, dates, deadline, expected):
+        assert check_expiry(dates.get(deadline, deadline)) is expected
@@ -4,19 +4,22 @@
 # We mock the LLM clients to simulate API errors without making real calls.
 
 import time
+
 import pytest
 from unittest.mock import patch, MagicMock
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from anthropic import APIStatusError
 from agents.base_agent import BaseAgent
 
 
 def _make_api_error(status_code: int) -> APIStatusError:
-    """Create a mock APIStatusError with the given status code."""
+    """
+    Create a mock APIStatusError with the given status code.
+
+    A new instance every call: raising an exception records its traceback
+    and context on it, so an instance shared between tests would carry
+    state from one test into the next.
+    """
     mock_response = MagicMock()
     mock_response.status_code = status_code
     mock_response.headers = {}
@@ -27,69 +30,84 @@ def _make_api_error(status_code: int) -> APIStatusError:
         body={"error": {"type": "overloaded_error", "message": "Overloaded"}},
     )
 
+# What a successful API call returns. The code under test hands it straight
+# back to the caller without looking inside, so a bare sentinel will do.
+_SUCCESS = object()
 
-class TestAnthropicRetryLogic:
-    """Tests for _call_anthropic retry with exponential backoff."""
 
-    def setup_method(self):
-        """Create a fresh BaseAgent for each test."""
-        self.agent = BaseAgent()
-        self.agent.system_prompt = "test"
-        self.agent.tools = []
-        self.agent.conversation_history = [{"role": "user", "content": "test"}]
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch):
+    """
+    Make backoff free in every test, so one that forgets to patch sleep
+    can't block for seconds. Tests that inspect the delays still patch
+    time.sleep with a mock on top of this.
+    """
+    monkeypatch.setattr('agents.base_agent.time.sleep', lambda seconds: None)
 
-    @patch('agents.base_agent.anthropic_client')
-    def test_success_on_first_try(self, mock_client):
-        """API call succeeds immediately — no retries needed."""
-        mock_response = MagicMock()
-        mock_client.messages.create.return_value = mock_response
 
-        result = self.agent._call_anthropic()
+@pytest.fixture(scope='class')
+def _class_agent():
+    """One BaseAgent per test class."""
+    return BaseAgent()
 
-        assert result == mock_response
-        assert mock_client.messages.create.call_count == 1
 
-    @patch('agents.base_agent.time.sleep')
+@pytest.fixture
+def agent(_class_agent):
+    """The class's shared agent, with its per-call state reset for this test."""
+    _class_agent.system_prompt = "test"
+    _class_agent.tools = []
+    _class_agent.conversation_history = [{"role": "user", "content": "test"}]
+    _class_agent.on_retry = None
+    return _class_agent
+
+
+class TestAnthropicRetryLogic:
+    """Tests for _call_anthropic retry with exponential backoff."""
+
     @patch('agents.base_agent.anthropic_client')
-    def test_retry_on_529_then_succeed(self, mock_client, mock_sleep):
-        """529 error on first attempt, success on second."""
-        error_529 = _make_api_error(529)
-        mock_response = MagicMock()
-        mock_client.messages.create.side_effect = [error_529, mock_response]
+    def test_success_on_first_try(self, mock_client, agent):
+        """API call succeeds immediately — no retries needed."""
+        mock_client.messages.create.return_value = _SUCCESS
 
-        result = self.agent._call_anthropic()
+        result = agent._call_anthropic()
 
-        assert result == mock_response
-        assert mock_client.messages.create.call_count == 2
-        mock_sleep.assert_called_once()  # Should have slept once
+        assert result is _SUCCESS
+        assert mock_client.messages.create.call_count == 1
 
+    @pytest.mark.parametrize('status_code, expected_calls, should_raise', [
+        (529, 2, False),   # overloaded: retried, then succeeds
+        (429, 2, False),   # rate limited: retried, then succeeds
+        (400, 1, True),    # bad request: raised immediately
+        (500, 1, True),    # server error: not in our retryable set
+    ], ids=['529', '429', '400', '500'])
     @patch('agents.base_agent.time.sleep')
     @patch('agents.base_agent.anthropic_client')
-    def test_retry_on_429_then_succeed(self, mock_client, mock_sleep):
-        """429 rate limit error on first attempt, success on second."""
-        error_429 = _make_api_error(429)
-        mock_response = MagicMock()
-        mock_client.messages.create.side_effect = [error_429, mock_response]
+    def test_retry_policy(self, mock_client, mock_sleep, status_code, expected_calls,
+                          should_raise, agent):
+        """One error, then success — retryable codes retry once, others raise."""
+        mock_client.messages.create.side_effect = [_make_api_error(status_code), _SUCCESS]
 
-        result = self.agent._call_anthropic()
+        if should_raise:
+            with pytest.raises(APIStatusError):
+                agent._call_anthropic()
+        else:
+            assert agent._call_anthropic() is _SUCCESS
 
-        assert result == mock_response
-        assert mock_client.messages.create.call_count == 2
+        assert mock_client.messages.create.call_count == expected_calls
+        assert mock_sleep.call_count == expected_calls - 1
 
     @patch('agents.base_agent.random.random', return_value=0.5)
     @patch('agents.base_agent.time.sleep')
     @patch('agents.base_agent.anthropic_client')
-    def test_exponential_backoff_delays(self, mock_client, mock_sleep, mock_random):
+    def test_exponential_backoff_delays(self, mock_client, mock_sleep, mock_random, agent):
         """Verify backoff doubles with jitter: base * 2^attempt ± 25%."""
-        error_529 = _make_api_error(529)
-        mock_response = MagicMock()
         mock_client.messages.create.side_effect = [
-            error_529, error_529, error_529, mock_response
+            _make_api_error(529), _make_api_error(529), _make_api_error(529), _SUCCESS
         ]
 
-        result = self.agent._call_anthropic()
+        result = agent._call_anthropic()
 
-        assert result == mock_response
+        assert result is _SUCCESS
         assert mock_client.messages.create.call_count == 4
 
         # With random()=0.5, jitter = base*0.25*(2*0.5-1) = 0, so delays are exact
@@ -101,58 +119,29 @@ class TestAnthropicRetryLogic:
     @patch('config.settings.API_MAX_RETRIES', 3)
     @patch('agents.base_agent.time.sleep')
     @patch('agents.base_agent.anthropic_client')
-    def test_exhausted_retries_raises(self, mock_client, mock_sleep):
+    def test_exhausted_retries_raises(self, mock_client, mock_sleep, agent):
         """All retries exhausted — the error propagates to the caller."""
-        error_529 = _make_api_error(529)
-        mock_client.messages.create.side_effect = error_529
+        mock_client.messages.create.side_effect = _make_api_error(529)
 
         with pytest.raises(APIStatusError):
-            self.agent._call_anthropic()
+            agent._call_anthropic()
 
         # With API_MAX_RETRIES=3, should attempt 3 times
         assert mock_client.messages.create.call_count == 3
 
     @patch('agents.base_agent.time.sleep')
     @patch('agents.base_agent.anthropic_client')
-    def test_non_retryable_error_raises_immediately(self, mock_client, mock_sleep):
-        """A 400 Bad Request should NOT be retried — raise immediately."""
-        error_400 = _make_api_error(400)
-        mock_client.messages.create.side_effect = error_400
-
-        with pytest.raises(APIStatusError):
-            self.agent._call_anthropic()
-
-        # Should only try once (no retry for 400)
-        assert mock_client.messages.create.call_count == 1
-        mock_sleep.assert_not_called()
-
-    @patch('agents.base_agent.time.sleep')
-    @patch('agents.base_agent.anthropic_client')
-    def test_500_error_not_retried(self, mock_client, mock_sleep):
-        """500 Internal Server Error should NOT be retried (not in our retryable set)."""
-        error_500 = _make_api_error(500)
-        mock_client.messages.create.side_effect = error_500
-
-        with pytest.raises(APIStatusError):
-            self.agent._call_anthropic()
-
-        assert mock_client.messages.create.call_count == 1
-        mock_sleep.assert_not_called()
-
-    @patch('agents.base_agent.time.sleep')
-    @patch('agents.base_agent.anthropic_client')
-    def test_mixed_retryable_errors(self, mock_client, mock_sleep):
+    def test_mixed_retryable_errors(self, mock_client, mock_sleep, agent):
         """Mix of 429 and 529 errors before success."""
-        mock_response = MagicMock()
         mock_client.messages.create.side_effect = [
             _make_api_error(429),
             _make_api_error(529),
-            mock_response
+            _SUCCESS
         ]
 
-        result = self.agent._call_anthropic()
+        result = agent._call_anthropic()
 
-        assert result == mock_response
+        assert result is _SUCCESS
         assert mock_client.messages.create.call_count == 3
         assert mock_sleep.call_count == 2
 
@@ -160,43 +149,45 @@ class TestAnthropicRetryLogic:
 class TestProviderFallback:
     """Tests for OpenRouter → Anthropic fallback logic."""
 
-    def setup_method(self):
-        self.agent = BaseAgent()
-        self.agent.system_prompt = "test"
-        self.agent.tools = []
-        self.agent.conversation_history = [{"role": "user", "content": "test"}]
-
-    @patch('agents.base_agent.USE_OPENROUTER', True)
-    @patch('agents.base_agent.USE_ANTHROPIC', True)
-    @patch('agents.base_agent.openrouter_client')
-    @patch('agents.base_agent.anthropic_client')
-    def test_fallback_on_openrouter_failure(self, mock_anthropic, mock_openrouter, ):
+    @pytest.fixture
+    def providers(self, monkeypatch):
+        """
+        Patch both provider flags and clients for one test. Returns a
+        function taking the flags; it hands back the (openrouter,
+        anthropic) client mocks.
+        """
+        def configure(openrouter: bool, anthropic: bool):
+            mock_openrouter, mock_anthropic = MagicMock(), MagicMock()
+            monkeypatch.setattr('agents.base_agent.USE_OPENROUTER', openrouter)
+            monkeypatch.setattr('agents.base_agent.USE_ANTHROPIC', anthropic)
+            monkeypatch.setattr('agents.base_agent.openrouter_client', mock_openrouter)
+            monkeypatch.setattr('agents.base_agent.anthropic_client', mock_anthropic)
+            return mock_openrouter, mock_anthropic
+        return configure
+
+    def test_fallback_on_openrouter_failure(self, providers, agent):
         """When OpenRouter fails, should fall back to Anthropic."""
+        mock_openrouter, mock_anthropic = providers(openrouter=True, anthropic=True)
         mock_openrouter.chat.completions.create.side_effect = Exception("OpenRouter down")
-        mock_anthropic_response = MagicMock()
-        mock_anthropic.messages.create.return_value = mock_anthropic_response
+        mock_anthropic.messages.create.return_value = _SUCCESS
 
-        result = self.agent._call_llm()
+        result = agent._call_llm()
 
-        assert result == mock_anthropic_response
+        assert result is _SUCCESS
         mock_openrouter.chat.completions.create.assert_called_once()
         mock_anthropic.messages.create.assert_called_once()
 
-    @patch('agents.base_agent.USE_OPENROUTER', False)
-    @patch('agents.base_agent.USE_ANTHROPIC', True)
-    @patch('agents.base_agent.anthropic_client')
-    def test_anthropic_only(self, mock_anthropic):
+    def test_anthropic_only(self, providers, agent):
         """When only Anthropic is configured, use it directly."""
-        mock_response = MagicMock()
-        mock_anthropic.messages.create.return_value = mock_response
+        _, mock_anthropic = providers(openrouter=False, anthropic=True)
+        mock_anthropic.messages.create.return_value = _SUCCESS
 
-        result = self.agent._call_llm()
+        result = agent._call_llm()
 
-        assert result == mock_response
+        assert result is _SUCCESS
 
-    @patch('agents.base_agent.USE_OPENROUTER', False)
-    @patch('agents.base_agent.USE_ANTHROPIC', False)
-    def test_no_provider_raises(self):
+    def test_no_provider_raises(self, providers, agent):
         """When no provider is configured, raise RuntimeError."""
+        providers(openrouter=False, anthropic=False)
         with pytest.raises(RuntimeError, match="No LLM provider available"):
-            self.agent._call_llm()
+            agent._call_llm()
@@ -1,14 +1,12 @@
 # tests/test_vault_improvements.py
 """End-to-end integration tests for vault Priority 1 improvements."""
 
-import sys
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 import yaml
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from memory.knowledge_index import build_knowledge_index
 from memory.changelog import read_changelog
 from tools.email_filter import classify_email, filter_emails
@@ -153,3 +151,337 @@ class TestFilterAndIndex:
         # Changelog should have three CREATED entries
         created_count = changelog.count('CREATED')
         assert created_count == 3
+
+
+# ============================================================================
+# VAULT STATS CACHE: counts stay correct across writes and deletes
+# ============================================================================
+
+class TestVaultStatsCache:
+    def test_stats_reflect_new_write(self, tmp_path, monkeypatch):
+        """A cached result must not hide a memory written afterwards."""
+        _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import get_vault_stats, write_memory
+
+        assert get_vault_stats()['decisions'] == 0
+
+        with patch('memory.graph.rebuild_graph', return_value={'nodes': {}, 'edges': []}):
+            write_memory(
+                title="Chose Postgres",
+                memory_type="decisions",
+                content="Picked Postgres over MySQL.",
+            )
+
+        stats = get_vault_stats()
+        assert stats['decisions'] == 1
+        assert stats['total'] == 1
+
+    def test_stats_reflect_deleted_file(self, tmp_path, monkeypatch):
+        """Removing a file changes the folder mtime, so counts are recomputed."""
+        vault = _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import get_vault_stats
+
+        note = vault / 'commitments' / 'review-prs-a1b2.md'
+        note.write_text('---\ntitle: Review PRs\n---\n', encoding='utf-8')
+        assert get_vault_stats()['commitments'] == 1
+
+        note.unlink()
+        assert get_vault_stats()['commitments'] == 0
+
+    def test_returned_stats_are_a_copy(self, tmp_path, monkeypatch):
+        """Mutating the returned dict must not corrupt the cache."""
+        _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import get_vault_stats
+
+        get_vault_stats()['total'] = 999
+        assert get_vault_stats()['total'] == 0
+
+
+# ============================================================================
+# LISTING CACHE: unchanged files are not re-read, edits are picked up
+# ============================================================================
+
+class TestListMemoriesCache:
+    def test_unchanged_vault_is_not_reread(self, tmp_path, monkeypatch):
+        vault = _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import list_memories
+
+        (vault / 'decisions' / 'chose-postgres-a1b2.md').write_text(
+            '---\ntitle: Chose Postgres\n---\n', encoding='utf-8')
+        first = list_memories()
+
+        with patch('memory.vault.read_memory') as mock_read:
+            assert list_memories() == first
+        mock_read.assert_not_called()
+
+    def test_file_rewritten_in_place_is_reread(self, tmp_path, monkeypatch):
+        """Editing a file doesn't touch its folder's mtime, but must still show."""
+        vault = _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import list_memories_with_etag
+
+        note = vault / 'insights' / 'morning-meetings-a1b2.md'
+        note.write_text('---\ntitle: Morning meetings\nstatus: active\n---\n', encoding='utf-8')
+        memories, etag = list_memories_with_etag('insights')
+        assert memories[0]['status'] == 'active'
+
+        note.write_text('---\ntitle: Morning meetings\nstatus: dismissed\n---\n', encoding='utf-8')
+        memories, new_etag = list_memories_with_etag('insights')
+        assert memories[0]['status'] == 'dismissed'
+        assert new_etag != etag
+
+    def test_returned_entries_are_copies(self, tmp_path, monkeypatch):
+        """Mutating a returned entry must not corrupt the cache."""
+        vault = _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import list_memories
+
+        (vault / 'decisions' / 'chose-postgres-a1b2.md').write_text(
+            '---\ntitle: Chose Postgres\n---\n', encoding='utf-8')
+        list_memories()[0]['title'] = 'Changed'
+        assert list_memories()[0]['title'] == 'Chose Postgres'
+
+    def test_one_write_is_one_generation(self, tmp_path, monkeypatch):
+        """write_memory bumps the vault generation once, however many caches it clears."""
+        _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import write_memory, vault_generation, invalidate_memory_list
+
+        before = vault_generation()
+        write_memory(title="Chose Postgres", memory_type="decisions",
+                     content="Picked Postgres over MySQL.")
+        assert vault_generation() == before + 1
+
+        invalidate_memory_list()
+        assert vault_generation() == before + 1
+
+
+# ============================================================================
+# SEARCH CACHE: unchanged files are not re-read, edits and deletes show
+# ============================================================================
+
+class TestSearchCache:
+    def test_unchanged_vault_is_not_reread(self, tmp_path, monkeypatch):
+        vault = _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import search_vault
+
+        (vault / 'people' / 'sarah-chen-a1b2.md').write_text(
+            '---\nname: Sarah Chen\npriority: high\n---\n\nPrefers morning meetings.\n',
+            encoding='utf-8')
+        first = search_vault('MORNING meetings')
+        assert [(r['title'], r['priority']) for r in first] == [('Sarah Chen', 'high')]
+        assert 'morning meetings' in first[0]['snippet']
+
+        with patch('memory.vault.read_memory') as mock_read:
+            assert search_vault('MORNING meetings') == first
+        mock_read.assert_not_called()
+
+    def test_edited_and_deleted_files_are_picked_up(self, tmp_path, monkeypatch):
+        vault = _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import search_vault
+
+        note = vault / 'decisions' / 'chose-postgres-a1b2.md'
+        note.write_text('---\ntitle: Chose Postgres\n---\n\nPicked Postgres.\n', encoding='utf-8')
+        assert search_vault('mysql') == []
+
+        note.write_text('---\ntitle: Chose Postgres\n---\n\nPicked Postgres over MySQL.\n',
+                        encoding='utf-8')
+        assert [r['filepath'] for r in search_vault('mysql')] == ['decisions/chose-postgres-a1b2.md']
+
+        note.unlink()
+        assert search_vault('postgres') == []
+
+
+# ============================================================================
+# BATCH WRITES: many memories, one graph rebuild
+# ============================================================================
+
+class TestWriteMemoryBatch:
+    def test_writes_all_and_rebuilds_graph_once(self, tmp_path, monkeypatch):
+        """write_memory_batch should write every memory and rebuild the graph once."""
+        vault = _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import write_memory_batch
+
+        with patch('memory.graph.rebuild_graph', return_value={'nodes': {}, 'edges': []}) as mock_rebuild:
+            paths = write_memory_batch([
+                {"title": "Chose Postgres", "memory_type": "decisions",
+                 "content": "Picked Postgres over MySQL."},
+                {"title": "Quarterly Budget Approved", "memory_type": "decisions",
+                 "content": "Q2 budget approved."},
+                {"title": "Review PRs weekly", "memory_type": "commitments",
+                 "content": "Agreed to review PRs every Friday."},
+            ])
+
+        assert len(paths) == 3
+        assert all(Path(p).exists() for p in paths)
+        assert len(list((vault / 'decisions').glob('*.md'))) == 2
+        mock_rebuild.assert_called_once()
+
+    def test_update_graph_false_skips_rebuild(self, tmp_path, monkeypatch):
+        """Callers that rebuild the graph themselves can skip it."""
+        _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import write_memory_batch
+
+        with patch('memory.graph.rebuild_graph') as mock_rebuild:
+            write_memory_batch([
+                {"title": "Chose Postgres", "memory_type": "decisions",
+                 "content": "Picked Postgres over MySQL."},
+            ], update_graph=False)
+
+        mock_rebuild.assert_not_called()
+
+
+# ============================================================================
+# YAML LOADING: the fast loader must read frontmatter exactly like safe_load
+# ============================================================================
+
+class TestLoadYaml:
+    def test_matches_safe_load_on_written_frontmatter(self, tmp_path, monkeypatch):
+        """Frontmatter written by write_memory parses identically either way."""
+        _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import _load_yaml, write_memory
+
+        with patch('memory.graph.rebuild_graph', return_value={'nodes': {}, 'edges': []}):
+            path = write_memory(
+                title="Alice Park — Designer",
+                memory_type="people",
+                content="## Overview\n\nDesigner at Acme.",
+                name="Alice Park",
+                tags=["design", "collaborator"],
+            )
+
+        yaml_text = Path(path).read_text(encoding='utf-8').split('---', 2)[1]
+        assert _load_yaml(yaml_text) == yaml.safe_load(yaml_text)
+
+    def test_written_frontmatter_skips_yaml_parser(self, tmp_path, monkeypatch):
+        """The simple shape write_memory produces is parsed without PyYAML."""
+        _setup_full_vault(tmp_path, monkeypatch)
+        from memory.vault import _load_yaml, write_memory
+
+        with patch('memory.graph.rebuild_graph', return_value={'nodes': {}, 'edges': []}):
+            path = write_memory(
+                title="Alice Park — Designer",
+                memory_type="people",
+                content="## Overview\n\nDesigner at Acme.",
+                name="Alice Park",
+                tags=["design", "collaborator"],
+            )
+
+        yaml_text = Path(path).read_text(encoding='utf-8').split('---', 2)[1]
+        with patch('memory.vault.yaml.load') as mock_load:
+            data = _load_yaml(yaml_text)
+
+        mock_load.assert_not_called()
+        assert data['tags'] == ['design', 'collaborator']
+
+    @pytest.mark.parametrize('text', [
+        "count: 3\nactive: yes\n",
+        "date: 2026-02-19\n",
+        "owner:\n  name: Alice\n",
+        "summary: |\n  line one\n  line two\n",
+        "title: Chose React # decided in standup\n",
+        "related: [alice, bob]\n",
+    ])
+    def test_other_yaml_matches_safe_load(self, text):
+        """Anything beyond plain strings and string lists goes to PyYAML."""
+        from memory.vault import _load_yaml
+
+        assert _load_yaml(text) == yaml.safe_load(text)
+
+    @pytest.mark.parametrize('text', ["k" * 1024 + ": x\n", "k" * 1024 + ":\n- x\n"])
+    def test_longest_key_yaml_reads(self, text):
+        from memory.vault import _load_yaml
+
+        assert _load_yaml(text) == yaml.safe_load(text)
+
+    @pytest.mark.parametrize('text', ["k" * 1025 + ": x\n", "k" * 1025 + ":\n- x\n"])
+    def test_longer_key_fails_like_safe_load(self, text):
+        """PyYAML refuses keys over 1024 characters; so must the fast path."""
+        from memory.vault import _load_yaml
+
+        with pytest.raises(yaml.YAMLError):
+            yaml.safe_load(text)
+        with pytest.raises(yaml.YAMLError):
+            _load_yaml(text)
+
+    def test_rejects_unsafe_tags(self):
+        """Like safe_load, arbitrary Python objects must not be constructed."""
+        from memory.vault import _load_yaml
+
+        with pytest.raises(yaml.YAMLError):
+            _load_yaml("x: !!python/object/apply:os.getcwd []")
+
+
+# ============================================================================
+# FRONTMATTER READS: only the YAML block is read, with the same result
+# ============================================================================
+
+class TestReadFrontmatterText:
+    def test_matches_split_on_full_text(self, tmp_path):
+        from memory.vault import _read_frontmatter_text
+        path = tmp_path / 'note.md'
+        text = '---\ntitle: "Chose React"\ntags:\n- frontend\n---\n\n# Chose React\n\n' + 'Body. ' * 5000
+        path.write_text(text, encoding='utf-8')
+
+        assert _read_frontmatter_text(path) == text.split('---', 2)[1]
+
+    def test_frontmatter_longer_than_first_chunk(self, tmp_path):
+        from memory.vault import _read_frontmatter_text
+        path = tmp_path / 'note.md'
+        long_value = 'é' * 5000  # multi-byte characters straddling the 4 KiB mark
+        text = f'---\ntitle: "{long_value}"\n---\n\nBody.\n'
+        path.write_text(text, encoding='utf-8')
+
+        assert _read_frontmatter_text(path) == text.split('---', 2)[1]
+
+    def test_no_frontmatter(self, tmp_path):
+        from memory.vault import _read_frontmatter_text
+        path = tmp_path / 'note.md'
+        path.write_text('# Just a heading\n\nNo frontmatter here.\n', encoding='utf-8')
+
+        assert _read_frontmatter_text(path) is None
+
+
+# ============================================================================
+# MEMORY READS: delimiters found on raw bytes, with the same result as split
+# ============================================================================
+
+class TestSplitMemoryFile:
+    def _expected(self, text):
+        parts = text.split('---', 2)
+        return parts[1], parts[2].strip()
+
+    def test_large_file_matches_split(self, tmp_path):
+        from memory.vault import _split_memory_file
+        path = tmp_path / 'note.md'
+        text = '---\ntitle: "Café notes"\n---\n\n# Café notes\n\n' + 'Body é. ' * 5000
+        path.write_text(text, encoding='utf-8')
+
+        assert _split_memory_file(path) == self._expected(text)
+
+    def test_large_file_without_frontmatter(self, tmp_path):
+        from memory.vault import _split_memory_file
+        path = tmp_path / 'note.md'
+        text = '# Just a heading\n\n' + 'No frontmatter. ' * 5000
+        path.write_text(text, encoding='utf-8')
+
+        assert _split_memory_file(path) == (None, text)
+
+    @pytest.mark.parametrize('text', [
+        '---\ntitle: "Café notes"\n---\n\n# Café notes\n\nBody.\n',
+        '---\ntitle: Unclosed\n',
+        '# Just a heading\n',
+        '',
+    ])
+    def test_small_file_matches_split(self, tmp_path, text):
+        from memory.vault import _split_memory_file
+        path = tmp_path / 'note.md'
+        path.write_text(text, encoding='utf-8')
+
+        expected = self._expected(text) if text.count('---') >= 2 else (None, text)
+        assert _split_memory_file(path) == expected
+
+    def test_large_file_with_crlf_matches_text_mode_read(self, tmp_path):
+        from memory.vault import _split_memory_file
+        path = tmp_path / 'note.md'
+        text = '---\ntitle: Notes\n---\n\n' + 'Line.\n' * 5000
+        path.write_bytes(text.replace('\n', '\r\n').encode('utf-8'))
+
+        assert _split_memory_file(path) == self._expected(text)
@@ -5,104 +5,100 @@
 
 import json
 import pytest
-import shutil
 from pathlib import Path
-from unittest.mock import patch
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from memory.vault import read_memory, write_memory, initialize_vault, VAULT_ROOT, list_memories
 
 
-# Use a temporary vault for tests to avoid polluting the real vault
-TEST_VAULT = Path('test_vault_preview_tmp')
+def _rel(filepath, root) -> str:
+    """Vault-relative, forward-slash path of a file returned by write_memory."""
+    return Path(filepath).relative_to(root).as_posix()
 
 
 @pytest.fixture(autouse=True)
-def setup_test_vault():
-    """Create a temporary vault before each test, clean up after."""
-    with patch('memory.vault.VAULT_ROOT', TEST_VAULT), \
-         patch('memory.graph.VAULT_ROOT', TEST_VAULT), \
-         patch('memory.graph.GRAPH_FILE', TEST_VAULT / '_graph.json'):
-        initialize_vault()
-        yield
-    # Cleanup
-    if TEST_VAULT.exists():
-        shutil.rmtree(TEST_VAULT)
+def vault(tmp_path, monkeypatch):
+    """
+    Give each test its own vault under tmp_path, so nothing is shared
+    through the working directory and tests can run in parallel.
+    """
+    vault_dir = tmp_path / 'vault'
+    monkeypatch.setattr('memory.vault.VAULT_ROOT', vault_dir)
+    monkeypatch.setattr('memory.dedup.VAULT_ROOT', vault_dir)
+    monkeypatch.setattr('memory.graph.VAULT_ROOT', vault_dir)
+    monkeypatch.setattr('memory.graph.GRAPH_FILE', vault_dir / '_graph.json')
+    monkeypatch.setattr('memory.changelog.CHANGELOG_FILE', vault_dir / '_changelog.md')
+    initialize_vault()
+    return vault_dir
 
 
 class TestReadMemoryContent:
     """Test that read_memory correctly parses frontmatter and content."""
 
-    def test_read_memory_returns_content(self):
+    def test_read_memory_returns_content(self, vault):
         """read_memory should return the markdown body in 'content' field."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Test Decision — Choose React",
-                memory_type="decisions",
-                content="We decided to go with React because of its ecosystem.\n\n## Reasoning\n\n- Large community\n- Good tooling",
-                tags=["tech", "frontend"]
-            )
-
-            # Read it back — use relative path
-            rel_path = str(Path(filepath).relative_to(TEST_VAULT))
-            result = read_memory(rel_path)
-
-            assert result is not None
-            assert 'content' in result
-            assert 'frontmatter' in result
-            assert 'filepath' in result
-
-            # Content should contain the markdown body (not empty)
-            assert len(result['content']) > 0
-            assert "React" in result['content']
-            assert "## Reasoning" in result['content']
-            assert "- Large community" in result['content']
-
-    def test_read_memory_frontmatter_parsed(self):
+        filepath = write_memory(
+            title="Test Decision — Choose React",
+            memory_type="decisions",
+            content="We decided to go with React because of its ecosystem.\n\n## Reasoning\n\n- Large community\n- Good tooling",
+            tags=["tech", "frontend"]
+        )
+
+        # Read it back — use relative path
+        rel_path = _rel(filepath, vault)
+        result = read_memory(rel_path)
+
+        assert result is not None
+        assert 'content' in result
+        assert 'frontmatter' in result
+        assert 'filepath' in result
+
+        # Content should contain the markdown body (not empty)
+        assert len(result['content']) > 0
+        assert "React" in result['content']
+        assert "## Reasoning" in result['content']
+        assert "- Large community" in result['content']
+
+    def test_read_memory_frontmatter_parsed(self, vault):
         """Frontmatter should be parsed into a dict, not raw YAML."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Test Decision",
-                memory_type="decisions",
-                content="Some content here.",
-                tags=["test"],
-                priority="🟡"
-            )
-
-            rel_path = str(Path(filepath).relative_to(TEST_VAULT))
-            result = read_memory(rel_path)
-
-            assert isinstance(result['frontmatter'], dict)
-            assert result['frontmatter']['title'] == "Test Decision"
-            assert result['frontmatter']['category'] == "decisions"
-            assert 'test' in result['frontmatter']['tags']
-
-    def test_read_people_memory(self):
+        filepath = write_memory(
+            title="Test Decision",
+            memory_type="decisions",
+            content="Some content here.",
+            tags=["test"],
+            priority="🟡"
+        )
+
+        rel_path = _rel(filepath, vault)
+        result = read_memory(rel_path)
+
+        assert isinstance(result['frontmatter'], dict)
+        assert result['frontmatter']['title'] == "Test Decision"
+        assert result['frontmatter']['category'] == "decisions"
+        assert 'test' in result['frontmatter']['tags']
+
+    def test_read_people_memory(self, vault):
         """People memories use 'name' in frontmatter instead of 'title'."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Sarah Chen — CTO",
-                memory_type="people",
-                content="## Overview\nSarah is the CTO.\n\n## Key Interactions\n- Met at conference\n- Discussed architecture",
-                tags=["work"],
-                role="CTO",
-                organization="Acme Corp",
-                email="sarah@acme.com",
-            )
-
-            rel_path = str(Path(filepath).relative_to(TEST_VAULT))
-            result = read_memory(rel_path)
-
-            assert result is not None
-            assert result['frontmatter'].get('name') == "Sarah Chen"
-            assert result['frontmatter'].get('role') == "CTO"
-            # Content should have the markdown sections
-            assert "## Overview" in result['content']
-            assert "## Key Interactions" in result['content']
-
-    def test_read_memory_preserves_markdown(self):
+        filepath = write_memory(
+            title="Sarah Chen — CTO",
+            memory_type="people",
+            content="## Overview\nSarah is the CTO.\n\n## Key Interactions\n- Met at conference\n- Discussed architecture",
+            tags=["work"],
+            role="CTO",
+            organization="Acme Corp",
+            email="sarah@acme.com",
+        )
+
+        rel_path = _rel(filepath, vault)
+        result = read_memory(rel_path)
+
+        assert result is not None
+        assert result['frontmatter'].get('name') == "Sarah Chen"
+        assert result['frontmatter'].get('role') == "CTO"
+        # Content should have the markdown sections
+        assert "## Overview" in result['content']
+        assert "## Key Interactions" in result['content']
+
+    def test_read_memory_preserves_markdown(self, vault):
         """Content should preserve all markdown formatting."""
         markdown = (
             "## Section One\n\n"
@@ -115,232 +111,313 @@ class TestReadMemoryContent:
             "[[Related Person]] mentioned this."
         )
 
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Markdown Test",
-                memory_type="decisions",
-                content=markdown,
-                tags=["test"]
-            )
-
-            rel_path = str(Path(filepath).relative_to(TEST_VAULT))
-            result = read_memory(rel_path)
-
-            assert "## Section One" in result['content']
-            assert "**bold**" in result['content']
-            assert "*italic*" in result['content']
-            assert "### Subsection" in result['content']
-            assert "- Item 1" in result['content']
-            assert "> A blockquote" in result['content']
-            assert "[[Related Person]]" in result['content']
+        filepath = write_memory(
+            title="Markdown Test",
+            memory_type="decisions",
+            content=markdown,
+            tags=["test"]
+        )
+
+        rel_path = _rel(filepath, vault)
+        result = read_memory(rel_path)
+
+        assert "## Section One" in result['content']
+        assert "**bold**" in result['content']
+        assert "*italic*" in result['content']
+        assert "### Subsection" in result['content']
+        assert "- Item 1" in result['content']
+        assert "> A blockquote" in result['content']
+        assert "[[Related Person]]" in result['content']
 
     def test_read_nonexistent_memory(self):
         """Reading a nonexistent file should return None."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            result = read_memory("decisions/nonexistent.md")
-            assert result is None
+        result = read_memory("decisions/nonexistent.md")
+        assert result is None
+
+    def test_read_memory_cached_until_file_changes(self, vault, monkeypatch):
+        """An unchanged file is parsed once; an edited one is parsed again."""
+        import memory.vault
+        note = vault / 'decisions' / 'chose-postgres-a1b2.md'
+        note.write_text('---\ntitle: Chose Postgres\n---\n\nPicked Postgres.\n', encoding='utf-8')
+        first = read_memory('decisions/chose-postgres-a1b2.md')
+
+        first['frontmatter']['title'] = 'Changed by the caller'
+        with monkeypatch.context() as m:
+            m.setattr(memory.vault, '_load_yaml', None)  # Must not parse again
+            again = read_memory('decisions/chose-postgres-a1b2.md')
+        assert again['frontmatter'] == {'title': 'Chose Postgres'}
+        assert again['content'] == 'Picked Postgres.'
+
+        note.write_text('---\ntitle: Chose Postgres\n---\n\nPicked Postgres over MySQL.\n',
+                        encoding='utf-8')
+        assert read_memory('decisions/chose-postgres-a1b2.md')['content'] == 'Picked Postgres over MySQL.'
 
     def test_list_memories_returns_filepath(self):
         """list_memories should return filepaths usable by the API."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            write_memory(
-                title="Test List Decision",
-                memory_type="decisions",
-                content="Content here.",
-                tags=["test"]
-            )
+        write_memory(
+            title="Test List Decision",
+            memory_type="decisions",
+            content="Content here.",
+            tags=["test"]
+        )
 
-            memories = list_memories()
-            assert len(memories) > 0
+        memories = list_memories()
+        assert len(memories) > 0
 
-            mem = memories[0]
-            assert 'filepath' in mem
-            assert 'type' in mem
-            assert 'title' in mem
+        mem = memories[0]
+        assert 'filepath' in mem
+        assert 'type' in mem
+        assert 'title' in mem
 
-            # Filepath should be relative (e.g., "decisions/test-list-decision-xxxx.md")
-            assert '/' in mem['filepath'] or '\\' in mem['filepath']
-            assert not Path(mem['filepath']).is_absolute()
+        # Filepath should be relative (e.g., "decisions/test-list-decision-xxxx.md")
+        assert '/' in mem['filepath'] or '\\' in mem['filepath']
+        assert not Path(mem['filepath']).is_absolute()
 
-            # Should be readable via read_memory
-            result = read_memory(mem['filepath'])
-            assert result is not None
-            assert len(result['content']) > 0
+        # Should be readable via read_memory
+        result = read_memory(mem['filepath'])
+        assert result is not None
+        assert len(result['content']) > 0
 
 
 class TestAPIEndpointChain:
     """Test the full API chain using FastAPI's test client."""
 
-    def test_memory_endpoint_returns_content(self):
+    def test_memory_endpoint_returns_content(self, vault, client):
         """GET /api/memory/{type}/{file} should return frontmatter + content."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            # Write a test memory
-            filepath = write_memory(
-                title="API Test Decision",
-                memory_type="decisions",
-                content="## Details\n\nThis is the API test content.\n\n- Point one\n- Point two",
-                tags=["api-test"]
-            )
-
-            rel_path = str(Path(filepath).relative_to(TEST_VAULT))
-            parts = rel_path.replace('\\', '/').split('/')
-            memory_type = parts[0]
-            filename = parts[1]
-
-            # Import and test via FastAPI test client
-            from fastapi.testclient import TestClient
-
-            # Patch vault root in both vault module and the app's imported copy
-            with patch('memory.vault.VAULT_ROOT', TEST_VAULT), \
-                 patch('web.app.initialize_vault'), \
-                 patch('web.app.Orchestrator'):
-                from web.app import app
-                client = TestClient(app)
-
-                resp = client.get(f"/api/memory/{memory_type}/{filename}")
-
-                assert resp.status_code == 200
-                data = resp.json()
-
-                assert 'frontmatter' in data
-                assert 'content' in data
-                assert 'filepath' in data
-
-                # Content should NOT be empty
-                assert len(data['content']) > 0
-                assert "API test content" in data['content']
-                assert "## Details" in data['content']
-
-    def test_memory_endpoint_404_for_missing(self):
-        """GET /api/memory/{type}/{file} should return 404 for missing files."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT), \
-             patch('web.app.initialize_vault'), \
-             patch('web.app.Orchestrator'):
-            from web.app import app
-            from fastapi.testclient import TestClient
-            client = TestClient(app)
+        # Write a test memory
+        filepath = write_memory(
+            title="API Test Decision",
+            memory_type="decisions",
+            content="## Details\n\nThis is the API test content.\n\n- Point one\n- Point two",
+            tags=["api-test"]
+        )
+
+        rel_path = _rel(filepath, vault)
+        parts = rel_path.replace('\\', '/').split('/')
+        memory_type = parts[0]
+        filename = parts[1]
+
+        resp = client.get(f"/api/memory/{memory_type}/{filename}")
 
-            resp = client.get("/api/memory/decisions/nonexistent.md")
-            assert resp.status_code == 404
+        assert resp.status_code == 200
+        data = resp.json()
 
-    def test_memories_list_then_read(self):
+        assert 'frontmatter' in data
+        assert 'content' in data
+        assert 'filepath' in data
+
+        # Content should NOT be empty
+        assert len(data['content']) > 0
+        assert "API test content" in data['content']
+        assert "## Details" in data['content']
+
+    def test_memory_endpoint_404_for_missing(self, client):
+        """GET /api/memory/{type}/{file} should return 404 for missing files."""
+        resp = client.get("/api/memory/decisions/nonexistent.md")
+        assert resp.status_code == 404
+
+    def test_memory_endpoint_stays_inside_vault(self, vault, client):
+        """Unknown types and non-memory filenames are 404s, never files outside the vault."""
+        (vault.parent / 'secret.md').write_text('---\ntitle: Secret\n---\n\nKeep out.\n', encoding='utf-8')
+        assert client.get("/api/memory/%2E%2E/secret.md").status_code == 404
+        assert client.get("/api/memory/decisions/%2E%2E").status_code == 404
+        assert client.get("/api/memory/decisions/.hidden.md").status_code == 404
+
+    def test_memory_endpoint_not_modified(self, vault, client):
+        """GET /api/memory/{type}/{file} answers 304 to a matching If-None-Match until the file changes."""
+        note = vault / 'decisions' / 'chose-postgres-a1b2.md'
+        note.write_text('---\ntitle: Chose Postgres\n---\n\nPicked Postgres.\n', encoding='utf-8')
+
+        first = client.get("/api/memory/decisions/chose-postgres-a1b2.md")
+        etag = first.headers['etag']
+        assert etag.startswith('W/')
+        assert first.headers['cache-control'] == 'no-cache'
+
+        resp = client.get("/api/memory/decisions/chose-postgres-a1b2.md",
+                          headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b''
+
+        note.write_text('---\ntitle: Chose Postgres\n---\n\nPicked Postgres over MySQL.\n',
+                        encoding='utf-8')
+        resp = client.get("/api/memory/decisions/chose-postgres-a1b2.md",
+                          headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()['content'] == 'Picked Postgres over MySQL.'
+
+    def test_memories_list_then_read(self, client):
         """GET /api/memories then GET /api/memory/{path} — full chain."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            write_memory(
-                title="Chain Test",
-                memory_type="commitments",
-                content="## Commitment\n\nI committed to review PRs weekly.",
-                tags=["work"]
-            )
-
-            with patch('memory.vault.VAULT_ROOT', TEST_VAULT), \
-                 patch('web.app.initialize_vault'), \
-                 patch('web.app.Orchestrator'):
-                from web.app import app
-                from fastapi.testclient import TestClient
-                client = TestClient(app)
-
-                # Step 1: List memories
-                list_resp = client.get("/api/memories")
-                assert list_resp.status_code == 200
-                memories = list_resp.json()['memories']
-                assert len(memories) > 0
-
-                # Step 2: Use filepath from list to read the memory
-                mem = memories[0]
-                filepath = mem['filepath'].replace('\\', '/')
-                resp = client.get(f"/api/memory/{filepath}")
-
-                assert resp.status_code == 200
-                data = resp.json()
-                assert len(data['content']) > 0
-                assert "review PRs" in data['content']
+        write_memory(
+            title="Chain Test",
+            memory_type="commitments",
+            content="## Commitment\n\nI committed to review PRs weekly.",
+            tags=["work"]
+        )
+
+        # Step 1: List memories
+        list_resp = client.get("/api/memories")
+        assert list_resp.status_code == 200
+        memories = list_resp.json()['memories']
+        assert len(memories) > 0
+
+        # Step 2: Use filepath from list to read the memory
+        mem = memories[0]
+        filepath = mem['filepath'].replace('\\', '/')
+        resp = client.get(f"/api/memory/{filepath}")
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data['content']) > 0
+        assert "review PRs" in data['content']
+
+    def test_memories_list_not_modified(self, client):
+        """GET /api/memories answers 304 to a matching If-None-Match until a file changes."""
+        write_memory(
+            title="Chose Postgres",
+            memory_type="decisions",
+            content="Picked Postgres over MySQL.",
+        )
+
+        first = client.get("/api/memories")
+        etag = first.headers['etag']
+
+        resp = client.get("/api/memories", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b''
+
+        write_memory(
+            title="Review PRs weekly",
+            memory_type="commitments",
+            content="I committed to review PRs every Friday.",
+        )
+        resp = client.get("/api/memories", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers['etag'] != etag
+        assert resp.json()['count'] == 2
+
+    def test_memories_list_cached_until_write(self, client, monkeypatch):
+        """Repeated GET /api/memories reuse one vault scan until a memory is written."""
+        import web.app
+        calls = []
+        real = web.app.list_memories_with_etag
+
+        def counting(memory_type=None):
+            calls.append(memory_type)
+            return real(memory_type)
+
+        monkeypatch.setattr(web.app, 'list_memories_with_etag', counting)
+
+        write_memory(
+            title="Chose Postgres",
+            memory_type="decisions",
+            content="Picked Postgres over MySQL.",
+        )
+        assert client.get("/api/memories").json()['count'] == 1
+        assert client.get("/api/memories").json()['count'] == 1
+        assert len(calls) == 1
+
+        write_memory(
+            title="Review PRs weekly",
+            memory_type="commitments",
+            content="I committed to review PRs every Friday.",
+        )
+        assert client.get("/api/memories").json()['count'] == 2
+        assert len(calls) == 2
+
+    def test_build_status_not_modified(self, client, monkeypatch):
+        """GET /api/build/status answers 304 to a matching If-None-Match until the state changes."""
+        import web.app
+        first = client.get("/api/build/status")
+        etag = first.headers['etag']
+
+        resp = client.get("/api/build/status", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+        monkeypatch.setitem(web.app.build_state, "message", "Fetching emails...")
+        resp = client.get("/api/build/status", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()['message'] == "Fetching emails..."
 
 
 class TestActionRequiredStatusFields:
     """Test that action_required memories support status fields."""
 
-    def test_write_memory_with_status_fields(self):
+    def test_write_memory_with_status_fields(self, vault):
         """write_memory should include status, status_reason, status_updated in frontmatter."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Reply to Jake about project timeline",
-                memory_type="action_required",
-                content="Jake asked about Q2 timeline.",
-                quadrant="urgent-important",
-                status="active",
-                status_reason="",
-                status_updated="2026-02-23",
-            )
-            rel_path = str(Path(filepath).relative_to(TEST_VAULT))
-            result = read_memory(rel_path)
-
-            assert result is not None
-            fm = result['frontmatter']
-            assert fm['status'] == 'active'
-            assert fm['status_updated'] == '2026-02-23'
-
-    def test_write_memory_status_defaults(self):
+        filepath = write_memory(
+            title="Reply to Jake about project timeline",
+            memory_type="action_required",
+            content="Jake asked about Q2 timeline.",
+            quadrant="urgent-important",
+            status="active",
+            status_reason="",
+            status_updated="2026-02-23",
+        )
+        rel_path = _rel(filepath, vault)
+        result = read_memory(rel_path)
+
+        assert result is not None
+        fm = result['frontmatter']
+        assert fm['status'] == 'active'
+        assert fm['status_updated'] == '2026-02-23'
+
+    def test_write_memory_status_defaults(self, vault):
         """When no status is provided, default to 'active'."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Follow up on contract",
-                memory_type="action_required",
-                content="Need to review contract terms.",
-                quadrant="important-not-urgent",
-            )
-            rel_path = str(Path(filepath).relative_to(TEST_VAULT))
-            result = read_memory(rel_path)
-
-            fm = result['frontmatter']
-            assert fm['status'] == 'active'
-            assert fm['status_reason'] == ''
-
-    def test_write_memory_closed_status(self):
+        filepath = write_memory(
+            title="Follow up on contract",
+            memory_type="action_required",
+            content="Need to review contract terms.",
+            quadrant="important-not-urgent",
+        )
+        rel_path = _rel(filepath, vault)
+        result = read_memory(rel_path)
+
+        fm = result['frontmatter']
+        assert fm['status'] == 'active'
+        assert fm['status_reason'] == ''
+
+    def test_write_memory_closed_status(self, vault):
         """Should be able to write a memory with closed status."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            filepath = write_memory(
-                title="Send report to Sarah",
-                memory_type="action_required",
-                content="Monthly report due.",
-                quadrant="urgent-important",
-                status="closed",
-                status_reason="Replied to Sarah on 2026-02-22",
-                status_updated="2026-02-23",
-            )
-            rel_path = str(Path(filepath).relative_to(TEST_VAULT))
-            result = read_memory(rel_path)
-
-            fm = result['frontmatter']
-            assert fm['status'] == 'closed'
-            assert 'Replied to Sarah' in fm['status_reason']
+        filepath = write_memory(
+            title="Send report to Sarah",
+            memory_type="action_required",
+            content="Monthly report due.",
+            quadrant="urgent-important",
+            status="closed",
+            status_reason="Replied to Sarah on 2026-02-22",
+            status_updated="2026-02-23",
+        )
+        rel_path = _rel(filepath, vault)
+        result = read_memory(rel_path)
+
+        fm = result['frontmatter']
+        assert fm['status'] == 'closed'
+        assert 'Replied to Sarah' in fm['status_reason']
 
     def test_list_memories_includes_status(self):
         """list_memories should return status field for action_required items."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            write_memory(
-                title="Reply to Jake",
-                memory_type="action_required",
-                content="Timeline question.",
-                quadrant="urgent-important",
-                status="closed",
-                status_reason="Replied on 2026-02-22",
-            )
-            memories = list_memories("action_required")
-
-            assert len(memories) == 1
-            assert memories[0]['status'] == 'closed'
-            assert memories[0]['status_reason'] == 'Replied on 2026-02-22'
+        write_memory(
+            title="Reply to Jake",
+            memory_type="action_required",
+            content="Timeline question.",
+            quadrant="urgent-important",
+            status="closed",
+            status_reason="Replied on 2026-02-22",
+        )
+        memories = list_memories("action_required")
+
+        assert len(memories) == 1
+        assert memories[0]['status'] == 'closed'
+        assert memories[0]['status_reason'] == 'Replied on 2026-02-22'
 
     def test_list_memories_status_default_for_old_items(self):
         """Items without status field should default to 'active' in listing."""
-        with patch('memory.vault.VAULT_ROOT', TEST_VAULT):
-            write_memory(
-                title="Chose Python",
-                memory_type="decisions",
-                content="Selected Python for backend.",
-            )
-            memories = list_memories("decisions")
-
-            assert len(memories) == 1
-            assert memories[0].get('status') is None
+        write_memory(
+            title="Chose Python",
+            memory_type="decisions",
+            content="Selected Python for backend.",
+        )
+        memories = list_memories("decisions")
+
+        assert len(memories) == 1
+        assert memories[0].get('status') is None
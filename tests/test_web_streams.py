@@ -0,0 +1,418 @@
+# tests/test_web_streams.py
+#
+# Tests for the web server's live (SSE) streams: chat queries and the
+# build pipeline. The agents are replaced with stand-ins, so no test
+# here talks to Claude or Gmail.
+
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+
+import anyio.from_thread
+import pytest
+from fastapi.testclient import TestClient
+
+import web.app as web_app
+from orchestrator import Orchestrator
+
+
+@pytest.fixture
+def server():
+    """
+    A test client that serves every request on one event loop, the way
+    uvicorn does. (A bare TestClient starts a new loop per request, so a
+    job started by one request couldn't feed a stream on another.)
+    """
+    test_client = TestClient(web_app.app)
+    with anyio.from_thread.start_blocking_portal() as portal:
+        test_client.portal = portal
+        yield test_client
+
+
+def _events(response) -> list[dict]:
+    """The JSON payloads of a streamed response's "data:" lines."""
+    return [json.loads(line[len('data: '):])
+            for line in response.iter_lines() if line.startswith('data: ')]
+
+
+def _stream(test_client, url) -> list[dict]:
+    with test_client.stream('GET', url) as response:
+        assert response.status_code == 200
+        return _events(response)
+
+
+# ── Chat queries ───────────────────────────────────────────────────────
+
+class FakeQueryAgent:
+    """
+    Stands in for the Query Agent: "uses" the tools in self.tools, then
+    answers. Records the thread each question ran on.
+    """
+
+    def __init__(self, tools, barrier=None):
+        self.tools = tools
+        self.barrier = barrier
+        self.threads = []
+
+    def run(self, user_message, max_tool_rounds=10, on_tool_call=None):
+        self.threads.append(threading.current_thread().name)
+        if self.barrier is not None:
+            # Hold every question here until all of them are in flight
+            self.barrier.wait(timeout=5)
+        for name, args in self.tools:
+            args = {key: value.format(q=user_message) for key, value in args.items()}
+            if on_tool_call is not None:
+                on_tool_call(name, args)
+        return f'Answer to {user_message}'
+
+
+@pytest.fixture
+def query_agent(monkeypatch):
+    """Serve chat queries from a real Orchestrator wrapped around a FakeQueryAgent."""
+    orch = object.__new__(Orchestrator)
+    orch.query_agent = FakeQueryAgent([
+        ('search_vault', {'query': '{q}'}),
+        ('read_memory', {'filepath': 'people/{q}.md'}),
+    ])
+    monkeypatch.setattr(web_app, '_get_orchestrator', lambda: orch)
+    # Every tool call as its own event (see TestCoalescing for bursts)
+    monkeypatch.setattr(web_app, '_SSE_COALESCE_SECONDS', 0.0)
+    return orch.query_agent
+
+
+class TestQueryStream:
+    def test_tool_calls_then_answer(self, server, query_agent):
+        """Each tool call is reported as it happens, and the answer comes last."""
+        events = _stream(server, '/api/query/stream?question=Sarah')
+
+        assert events == [
+            {'stage': 'query', 'status': 'in_progress',
+             'message': 'Searching your memories for "Sarah"...'},
+            {'stage': 'query', 'status': 'in_progress',
+             'message': 'Reading people/Sarah.md...'},
+            {'stage': 'complete', 'status': 'complete', 'answer': 'Answer to Sarah'},
+        ]
+
+    @pytest.mark.parametrize('question', ['', '   '])
+    def test_empty_question_rejected(self, server, query_agent, question):
+        response = server.get('/api/query/stream', params={'question': question})
+
+        assert response.status_code == 400
+        assert query_agent.threads == []
+
+    def test_concurrent_queries_get_only_their_own_events(self, server, query_agent):
+        """Two questions in flight at once don't see each other's tool calls."""
+        query_agent.barrier = threading.Barrier(2)
+        results = {}
+
+        def ask(question):
+            results[question] = _stream(server, f'/api/query/stream?question={question}')
+
+        threads = [threading.Thread(target=ask, args=(q,)) for q in ('Alice', 'Bob')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        for question, other in (('Alice', 'Bob'), ('Bob', 'Alice')):
+            events = results[question]
+            assert len(events) == 3
+            assert all(question in e.get('message', e.get('answer')) for e in events)
+            assert not any(other in json.dumps(e) for e in events)
+
+    def test_queries_stay_off_the_job_pool(self, server, query_agent):
+        """A chat question runs on _QUERY_POOL, never on the pipeline jobs' pool."""
+        _stream(server, '/api/query/stream?question=Sarah')
+
+        assert query_agent.threads
+        assert query_agent.threads[0].startswith('query')
+
+    def test_stream_is_not_gzipped(self, server, query_agent):
+        """Even a long stream goes out uncompressed, so each event arrives as it's sent."""
+        query_agent.tools = [('search_vault', {'query': '{q}' * 100})] * 5
+        url = '/api/query/stream?question=' + 'x' * 50
+
+        with server.stream('GET', url, headers={'Accept-Encoding': 'gzip'}) as response:
+            events = _events(response)
+
+        assert 'content-encoding' not in response.headers
+        assert events[-1]['stage'] == 'complete'
+
+    def test_every_stream_endpoint_skips_gzip(self):
+        streams = {route.path for route in web_app.app.routes
+                   if 'stream' in getattr(route, 'path', '')}
+        assert streams == web_app._SSE_PATHS
+
+
+# ── Thinning out bursts of progress events ─────────────────────────────
+
+def _progress(message, stage='actions', status='in_progress'):
+    return {'stage': stage, 'status': status, 'message': message}
+
+
+class ScriptedOrchestrator:
+    """
+    Runs a script for /api/stream/refresh: each step is an event to emit,
+    or a number of seconds to sleep.
+    """
+
+    def __init__(self, script):
+        self.script = script
+
+    def refresh_actions(self, user_input, progress_callback):
+        for step in self.script:
+            if isinstance(step, dict):
+                progress_callback(step)
+            else:
+                time.sleep(step)
+
+
+@pytest.fixture
+def refresh(server, monkeypatch):
+    """refresh(*script) streams a refresh job that runs the script."""
+    def run(*script):
+        orch = ScriptedOrchestrator(script)
+        monkeypatch.setattr(web_app, '_get_orchestrator', lambda: orch)
+        return [e['message'] for e in _stream(server, '/api/stream/refresh')]
+    return run
+
+
+class TestCoalescing:
+    def test_burst_sends_only_the_newest(self, refresh, monkeypatch):
+        """Events repeating one stage and status: the first goes out, then only the newest."""
+        monkeypatch.setattr(web_app, '_SSE_COALESCE_SECONDS', 0.05)
+
+        messages = refresh(*[_progress(f'm{i}') for i in range(5)], 0.3,
+                           _progress('later'))
+
+        # m4 goes out when the interval is up; "later" is past it
+        assert messages == ['m0', 'm4', 'later']
+
+    def test_held_back_event_goes_before_a_different_one(self, refresh, monkeypatch):
+        monkeypatch.setattr(web_app, '_SSE_COALESCE_SECONDS', 60.0)
+
+        messages = refresh(_progress('a0'), _progress('a1'), _progress('a2'),
+                           _progress('b', status='complete'))
+
+        assert messages == ['a0', 'a2', 'b']
+
+    def test_held_back_event_goes_before_the_end(self, refresh, monkeypatch):
+        """A job that ends mid-burst still gets its last event out."""
+        monkeypatch.setattr(web_app, '_SSE_COALESCE_SECONDS', 60.0)
+
+        messages = refresh(_progress('a0'), _progress('a1'), _progress('a2'))
+
+        assert messages == ['a0', 'a2']
+
+    def test_different_stages_all_go_out(self, refresh, monkeypatch):
+        monkeypatch.setattr(web_app, '_SSE_COALESCE_SECONDS', 60.0)
+
+        messages = refresh(_progress('one', stage='x'), _progress('two', stage='y'),
+                           _progress('three', stage='x'))
+
+        assert messages == ['one', 'two', 'three']
+
+
+# ── Slow browsers ──────────────────────────────────────────────────────
+
+class TestDeliver:
+    def _full_queue(self):
+        queue = asyncio.Queue(maxsize=3)
+        for data in (b'p1', b'p2', b'p3'):
+            web_app._deliver(queue, data, keep=False)
+        return queue
+
+    @staticmethod
+    def _drain(queue):
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    def test_progress_event_dropped_when_full(self):
+        queue = self._full_queue()
+
+        web_app._deliver(queue, b'p4', keep=False)
+
+        assert self._drain(queue) == [b'p1', b'p2', b'p3']
+
+    def test_kept_event_replaces_the_oldest(self):
+        """A "complete"/"error" event, or the end of the stream, always gets in."""
+        queue = self._full_queue()
+
+        web_app._deliver(queue, b'complete', keep=True)
+        web_app._deliver(queue, None, keep=True)
+
+        assert self._drain(queue) == [b'p3', b'complete', None]
+
+    def test_room_left_nothing_dropped(self):
+        queue = asyncio.Queue(maxsize=3)
+
+        web_app._deliver(queue, b'p1', keep=False)
+        web_app._deliver(queue, b'complete', keep=True)
+
+        assert self._drain(queue) == [b'p1', b'complete']
+
+
+# ── The build stream ───────────────────────────────────────────────────
+
+class SlowBuild:
+    """
+    Stands in for Orchestrator.build_memory: reports one step, then waits
+    until the test sets self.finish (or the build is cancelled).
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.finish = threading.Event()
+        self.crash = False
+        self.runs = 0
+
+    def build_memory(self, user_input, progress_callback, cancel_event=None, **kwargs):
+        self.runs += 1
+        progress_callback({'stage': 'fetching', 'status': 'in_progress',
+                           'message': 'Fetching emails...'})
+        self.started.set()
+        while not self.finish.wait(0.01):
+            if cancel_event.is_set():
+                progress_callback({'stage': 'error', 'status': 'cancelled',
+                                   'message': 'Build cancelled.'})
+                return 'Build cancelled.'
+        if self.crash:
+            raise RuntimeError('Gmail is down')
+        progress_callback({'stage': 'complete', 'status': 'complete',
+                           'message': 'Done', 'stats': {'emails': 1}})
+        return 'Done'
+
+
+@pytest.fixture
+def slow_build(server, monkeypatch):
+    """A SlowBuild behind /api/stream/build, with the build state reset around the test."""
+    build = SlowBuild()
+    monkeypatch.setattr(web_app, '_get_orchestrator', lambda: build)
+    monkeypatch.setattr(web_app, 'build_state', dict(web_app.build_state))
+    monkeypatch.setattr(web_app, '_active_build', None)
+    yield build
+    build.finish.set()  # Never leave a job thread waiting
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def _stream_in_background(test_client, url):
+    """Read a stream on another thread; returns (thread, list the events land in)."""
+    events = []
+    thread = threading.Thread(target=lambda: events.extend(_stream(test_client, url)))
+    thread.start()
+    return thread, events
+
+
+class TestBuildStream:
+    def test_second_browser_joins_the_running_build(self, server, slow_build):
+        """A second tab gets the latest status right away, then the rest of the build."""
+        first, first_events = _stream_in_background(server, '/api/stream/build')
+        assert slow_build.started.wait(5)
+
+        second, second_events = _stream_in_background(server, '/api/stream/build')
+        _wait_until(lambda: len(web_app._active_build['listeners']) == 2)
+        slow_build.finish.set()
+        first.join(5)
+        second.join(5)
+
+        assert slow_build.runs == 1
+        assert [e['stage'] for e in first_events] == ['fetching', 'complete']
+        assert second_events == [
+            {'stage': 'fetching', 'status': 'running', 'message': 'Fetching emails...'},
+            {'stage': 'complete', 'status': 'complete', 'message': 'Done',
+             'stats': {'emails': 1}},
+        ]
+        assert web_app.build_state['status'] == 'complete'
+
+    def test_busy_slot_without_a_job_to_join_is_409(self, server, slow_build):
+        """A build we can't listen to (not a job of ours) turns a second build away."""
+        assert web_app._build_slot.acquire(blocking=False)
+        try:
+            response = server.get('/api/stream/build')
+        finally:
+            web_app._build_slot.release()
+
+        assert response.status_code == 409
+        assert slow_build.runs == 0
+
+    def test_slot_released_after_a_build(self, server, slow_build):
+        slow_build.finish.set()
+
+        for _ in range(2):
+            events = _stream(server, '/api/stream/build')
+            assert events[-1]['stage'] == 'complete'
+
+        assert slow_build.runs == 2
+
+    def test_slot_released_after_a_crash(self, server, slow_build):
+        slow_build.finish.set()
+        slow_build.crash = True
+
+        events = _stream(server, '/api/stream/build')
+
+        assert events[-1] == {'stage': 'error', 'status': 'error', 'message': 'Gmail is down'}
+        assert web_app.build_state['status'] == 'error'
+        assert web_app._build_slot.acquire(blocking=False)
+        web_app._build_slot.release()
+
+
+# ── Abandoned builds ───────────────────────────────────────────────────
+
+@pytest.fixture
+def unwatched_build(server, monkeypatch):
+    """
+    A running build, as _active_build would hold it, that nobody is
+    streaming. Unwatched for 0.2 seconds means abandoned.
+    """
+    monkeypatch.setattr(web_app, '_ABANDONED_AFTER_SECONDS', 0.2)
+    build = {'worker': concurrent.futures.Future(), 'listeners': set(),
+             'cancel': threading.Event(), 'seen_at': time.monotonic()}
+    monkeypatch.setattr(web_app, '_active_build', build)
+    monkeypatch.setattr(web_app, 'build_state', dict(web_app.build_state))
+    return build
+
+
+def _last_listener_leaves(test_client, build):
+    """Do what a stream's end does, on the server's event loop."""
+    test_client.portal.call(web_app._on_build_listener_left, build)
+
+
+class TestAbandonedBuild:
+    def test_cancelled_once_nobody_watches(self, server, unwatched_build):
+        _last_listener_leaves(server, unwatched_build)
+
+        assert not unwatched_build['cancel'].is_set()
+        assert unwatched_build['cancel'].wait(2)
+
+    def test_status_polls_keep_it_alive(self, server, unwatched_build):
+        """Each /api/build/status poll pushes the deadline back."""
+        _last_listener_leaves(server, unwatched_build)
+
+        for _ in range(10):  # 0.5 seconds of polling, well past the deadline
+            assert server.get('/api/build/status').status_code == 200
+            time.sleep(0.05)
+        assert not unwatched_build['cancel'].is_set()
+
+        # Polling stopped: now it's abandoned
+        assert unwatched_build['cancel'].wait(2)
+
+    def test_attached_stream_keeps_it_alive(self, server, unwatched_build):
+        unwatched_build['listeners'].add(asyncio.Queue())
+        _last_listener_leaves(server, unwatched_build)
+
+        time.sleep(0.5)
+        assert not unwatched_build['cancel'].is_set()
+
+    def test_finished_build_is_left_alone(self, server, unwatched_build):
+        unwatched_build['worker'].set_result(None)
+        _last_listener_leaves(server, unwatched_build)
+
+        time.sleep(0.5)
+        assert not unwatched_build['cancel'].is_set()
@@ -32,11 +32,14 @@ import json
 # We need to decode them back into readable text.
 import base64
 
-# "pickle" lets us save Python objects to a file and load them back later.
-# We use it to save the Gmail login token so you don't have to log in
-# every time you run the app.
+# "pickle" is only used once, to read a token saved by older versions
+# (see _migrate_legacy_token below)
 import pickle
 
+# "threading" gives each thread its own copy of the cached Gmail
+# connection (see get_gmail_service below).
+import threading
+
 # "datetime" and "timedelta" help us work with dates and time ranges.
 # We use them to calculate "30 days ago" for filtering emails.
 from datetime import datetime, timedelta
@@ -44,6 +47,10 @@ from datetime import datetime, timedelta
 # "Path" makes file path handling easy and cross-platform.
 from pathlib import Path
 
+# "re" (regular expressions) lets us match text patterns. We use it for
+# a quick way to split the most common "From" headers (see _split_from).
+import re
+
 # "parseaddr" is a helper that splits "John Doe <john@example.com>"
 # into two parts: the name ("John Doe") and the email ("john@example.com").
 from email.utils import parseaddr
@@ -76,16 +83,169 @@ from googleapiclient.discovery import build
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
 # "TOKEN_PATH" is where we save the login token after you authenticate.
-# It's a file called "token.pickle" in the config/ folder.
-TOKEN_PATH = Path('config/token.pickle')
+# It's a plain JSON file called "token.json" in the config/ folder.
+TOKEN_PATH = Path('config/token.json')
+
+# Older versions pickled the token to "token.pickle" instead. If one is
+# still there, it's converted to token.json the first time we need it.
+LEGACY_TOKEN_PATH = Path('config/token.pickle')
 
 # "CREDENTIALS_PATH" is where Google's OAuth credentials file should be.
 # You download this file from Google Cloud Console (see the tutorial).
 CREDENTIALS_PATH = Path('config/credentials.json')
 
+# "BODY_MAX_CHARS" is how much of each email's body we keep. The agents
+# only need the gist, and long bodies would bloat their prompts.
+BODY_MAX_CHARS = 1000
+
+# "GMAIL_BATCH_SIZE" is how many message downloads we pack into one HTTP
+# request (see _iter_messages below). Gmail accepts up to 100 per batch,
+# but recommends at most 50 — bigger batches tend to hit rate limits.
+GMAIL_BATCH_SIZE = 50
+
+# The headers _parse_message() keeps. When the body isn't needed, we ask
+# Gmail for just these (format='metadata') instead of the whole message.
+_METADATA_HEADERS = ['Subject', 'From', 'To', 'Date', 'Cc', 'Bcc']
+
+# "Partial response" masks: Gmail only sends back the fields listed here
+# instead of the whole message resource (sizes, history IDs, attachment
+# IDs, per-part headers...), so there's less JSON to download and parse.
+#
+# _find_body_data walks "parts" to any depth, but a mask has to spell out
+# each level. The first few levels keep just what it reads; below that,
+# plain "parts" (no sub-list) returns deeper parts in full, so unusually
+# deep messages still work.
+def _parts_fields(levels: int) -> str:
+    if levels == 0:
+        return 'mimeType,body/data,parts'
+    return f'mimeType,body/data,parts({_parts_fields(levels - 1)})'
+
+
+_FULL_FIELDS = (
+    'id,threadId,snippet,labelIds,'
+    f'payload(headers(name,value),body/data,parts({_parts_fields(3)}))'
+)
+_METADATA_FIELDS = 'id,threadId,snippet,labelIds,payload/headers(name,value)'
+
+# The same headers, lowercased, as a set — checking membership in a
+# frozenset is a single hash lookup, however many headers a message has.
+_WANTED_HEADERS = frozenset(name.lower() for name in _METADATA_HEADERS)
+
+# The "From" header shapes nearly every email uses:
+#   Jane Doe <jane@co.com>     "Doe, Jane" <jane@co.com>     jane@co.com
+# parseaddr() runs a full RFC 2822 tokenizer on every header. This
+# pattern only accepts forms where that tokenizer is known to give the
+# exact same answer (plain words separated by single spaces, a simple
+# quoted name, a plain address); anything else still goes to parseaddr.
+_ADDR_PATTERN = r"[A-Za-z0-9][A-Za-z0-9._%+-]*@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*"
+_WORD_PATTERN = r"[^\W_](?:[\w'-]*[^\W_])?"
+_FROM_RE = re.compile(
+    rf'(?:"([^"\\()\r\n]*)"|({_WORD_PATTERN}(?: {_WORD_PATTERN})*))? ?<({_ADDR_PATTERN})>\Z'
+    rf'|({_ADDR_PATTERN})\Z'
+)
+
+# Maps the two "base64url" characters Gmail uses ('-' and '_') onto the
+# standard base64 ones ('+' and '/'), so _b64url_decode can decode with
+# the plain base64 decoder in one step.
+_B64URL_TO_STD = bytes.maketrans(b'-_', b'+/')
+
 
 # ── AUTHENTICATION ─────────────────────────────────────────────────────
 
+# The Gmail service from the last get_gmail_service() call, cached so
+# repeat calls skip loading the token and building a new service.
+#
+# Each thread gets its own cache (the HTTP connection inside a service
+# isn't safe to share between threads). An entry is
+# (token file key, credentials, service) and is only reused while the
+# token file is unchanged — logging in or out through the web app
+# rewrites or deletes it — and the credentials are still valid.
+_service_cache = threading.local()
+
+
+# Set once the legacy token has been looked for, so every later token
+# check skips straight past _migrate_legacy_token.
+_legacy_token_checked = threading.Event()
+_legacy_token_lock = threading.Lock()
+
+
+def _migrate_legacy_token():
+    """
+    Convert a token.pickle left by an older version into token.json, once.
+
+    Without this, upgrading would quietly log everyone out. The pickle is
+    the user's own file, written by this program, so loading it one last
+    time is safe; afterwards it's deleted and only JSON is ever read.
+    """
+    if _legacy_token_checked.is_set():
+        return
+    with _legacy_token_lock:
+        if _legacy_token_checked.is_set():
+            return
+        try:
+            if TOKEN_PATH.exists() or not LEGACY_TOKEN_PATH.exists():
+                return
+            try:
+                with open(LEGACY_TOKEN_PATH, 'rb') as f:
+                    creds = pickle.load(f)
+                save_credentials(creds)
+            except Exception as e:
+                print(f"[WARN] Couldn't convert the old Gmail token {LEGACY_TOKEN_PATH} "
+                      f"({e}) — please connect Gmail again.")
+                return
+            LEGACY_TOKEN_PATH.unlink(missing_ok=True)
+            print(f"[OK] Converted the old Gmail token to {TOKEN_PATH}")
+        finally:
+            _legacy_token_checked.set()
+
+
+def _token_file_key():
+    """The token file's (mtime, size), or None if there is no token file."""
+    _migrate_legacy_token()
+    try:
+        st = os.stat(TOKEN_PATH)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_credentials():
+    """Load the saved login token, or return None if there isn't one."""
+    # The token is stored as JSON (see save_credentials below), so loading
+    # it never runs code from the file the way unpickling would.
+    #
+    # "read_bytes" grabs the whole (tiny) file in one read, without the
+    # buffered file object a "with open(...)" block would set up. Asking
+    # for forgiveness (FileNotFoundError) also saves a separate exists() check.
+    _migrate_legacy_token()
+    try:
+        raw = TOKEN_PATH.read_bytes()
+    except FileNotFoundError:
+        return None
+    return Credentials.from_authorized_user_info(json.loads(raw), SCOPES)
+
+
+def save_credentials(creds) -> None:
+    """
+    Save Gmail login credentials to TOKEN_PATH as JSON.
+
+    Args:
+        creds: The google.oauth2 Credentials to save.
+    """
+    # Create the config/ folder if it doesn't exist yet
+    TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # "to_json" writes the token, refresh token and expiry as plain text
+    TOKEN_PATH.write_text(creds.to_json(), encoding='utf-8')
+
+
+# The credentials is_authenticated() last loaded, as one
+# (token file key, credentials) entry — see _token_file_key. The web
+# frontend checks on every page load; with this, a check costs one
+# stat() until the token file changes. Kept apart from
+# get_gmail_service's credentials, which get refreshed in place.
+_auth_check_cache = {'entry': (None, None)}
+
+
 def is_authenticated() -> bool:
     """
     Check if we already have a valid Gmail login token.
@@ -96,32 +256,38 @@ def is_authenticated() -> bool:
 
     HOW IT WORKS:
     1. Check if the token file exists on disk
-    2. If yes, load it and check if it's still valid (or refreshable)
+    2. If yes, load it (unless it's unchanged since last time) and check
+       if it's still valid (or refreshable)
     3. Return True or False
 
     Returns:
         bool: True if we have a usable token, False if not.
     """
     # Step 1: Does the token file even exist?
-    if not TOKEN_PATH.exists():
+    key = _token_file_key()
+    if key is None:
         # No token file = never authenticated. Return False.
         return False
 
-    # Step 2: Try to load and validate the token
-    try:
-        # Open the token file and load the saved credentials
-        with open(TOKEN_PATH, 'rb') as f:
-            creds = pickle.load(f)
-
-        # A token is "usable" if:
-        # - It's still valid (not expired), OR
-        # - It's expired BUT has a "refresh token" (a special token that
-        #   lets us get a new one without re-authenticating)
-        return creds and (creds.valid or (creds.expired and creds.refresh_token))
-
-    except Exception:
-        # If anything goes wrong reading the file, treat it as not authenticated
-        return False
+    # Step 2: Load the token if the file changed since we last read it
+    cached_key, creds = _auth_check_cache['entry']
+    if cached_key != key:
+        try:
+            creds = _load_credentials()
+        except Exception:
+            # If anything goes wrong reading the file, treat it as not
+            # authenticated (until the file is rewritten)
+            creds = None
+        # One assignment, so a concurrent check never sees a key paired
+        # with the wrong credentials
+        _auth_check_cache['entry'] = (key, creds)
+
+    # A token is "usable" if:
+    # - It's still valid (not expired), OR
+    # - It's expired BUT has a "refresh token" (a special token that
+    #   lets us get a new one without re-authenticating)
+    # Validity depends on the clock, so it's checked every time.
+    return bool(creds and (creds.valid or (creds.expired and creds.refresh_token)))
 
 
 def get_gmail_service():
@@ -134,7 +300,7 @@ def get_gmail_service():
         1. Opens your web browser to Google's login page
         2. You sign in and click "Allow" to grant read-only access
         3. Google sends back a token (like a temporary password)
-        4. We save that token to config/token.pickle for next time
+        4. We save that token to config/token.json for next time
 
     SUBSEQUENT TIMES (saved token exists):
         1. Load the saved token from disk
@@ -145,17 +311,16 @@ def get_gmail_service():
         A Gmail API "service" object — think of this as an open connection
         to Gmail that lets us send commands like "fetch my emails."
     """
-    # "creds" will hold our login credentials. Start as None (nothing).
-    creds = None
+    # ── Reuse this thread's service if nothing has changed ─────
+    cached = getattr(_service_cache, 'entry', None)
+    if cached is not None:
+        token_key, cached_creds, cached_service = cached
+        if token_key == _token_file_key() and cached_creds.valid:
+            return cached_service
 
     # ── Try to load a saved token ──────────────────────────────
-    # Check if we previously saved a token from a past login
-    if TOKEN_PATH.exists():
-        # Open the file in "read binary" mode ('rb') because pickle
-        # files are binary (not plain text)
-        with open(TOKEN_PATH, 'rb') as token_file:
-            # "pickle.load" reconstructs the Python object we saved earlier
-            creds = pickle.load(token_file)
+    # "creds" holds our login credentials, or None if we never logged in
+    creds = _load_credentials()
 
     # ── Validate or refresh the token ──────────────────────────
     # Check if we have valid credentials. If not, we need to fix that.
@@ -199,12 +364,7 @@ def get_gmail_service():
             creds = flow.run_local_server(port=0)
 
         # ── Save the token for next time ───────────────────────
-        # Create the config/ folder if it doesn't exist yet
-        TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-        # Save the credentials to disk using pickle
-        with open(TOKEN_PATH, 'wb') as token_file:
-            pickle.dump(creds, token_file)
+        save_credentials(creds)
 
         print("[OK] Gmail authentication successful!")
 
@@ -214,13 +374,24 @@ def get_gmail_service():
     #   'gmail'  = which Google API to use (Gmail)
     #   'v1'     = which version of the API
     #   credentials = our login token
-    return build('gmail', 'v1', credentials=creds)
+    #   static_discovery / cache_discovery = read the API description
+    #       bundled with the library, instead of probing for a discovery
+    #       cache (App Engine memcache, oauth2client's file cache) first
+    #
+    # The service keeps one HTTP connection object whose keep-alive
+    # connections to Gmail are reused by every request and batch it sends.
+    # Caching the service (above) is what keeps that connection warm
+    # between calls, so later fetches skip the TCP/TLS handshake.
+    service = build('gmail', 'v1', credentials=creds,
+                    static_discovery=True, cache_discovery=False)
+    _service_cache.entry = (_token_file_key(), creds, service)
+    return service
 
 
 # ── FETCH EMAILS ───────────────────────────────────────────────────────
 
 def fetch_emails(max_results: int = 150, query: str = '',
-                 days_back: int = 60) -> list[dict]:
+                 days_back: int = 60, need_body: bool = True) -> list[dict]:
     """
     Fetch emails from Gmail and return them as a list of simple dictionaries.
 
@@ -242,6 +413,11 @@ def fetch_emails(max_results: int = 150, query: str = '',
         days_back:   How many days back to look. Default is 60 (two months).
                      "7" would mean just the last week.
 
+        need_body:   Whether to download each email's full body. When False,
+                     Gmail sends only the headers we use plus its short
+                     preview ("snippet"), which becomes the 'body' field —
+                     a much smaller download when the headers are enough.
+
     Returns:
         A list of dictionaries. Each dictionary represents one email:
         {
@@ -284,7 +460,8 @@ def fetch_emails(max_results: int = 150, query: str = '',
     results = service.users().messages().list(
         userId='me',           # 'me' means the currently logged-in user
         q=full_query,          # Our search query
-        maxResults=max_results  # How many to return at most
+        maxResults=max_results, # How many to return at most
+        fields='messages/id',  # We only need the IDs back
     ).execute()  # ".execute()" actually sends the request to Gmail
 
     # "messages" is a list of {id, threadId} dictionaries.
@@ -299,33 +476,12 @@ def fetch_emails(max_results: int = 150, query: str = '',
     print(f"   Found {len(messages)} emails. Fetching details...")
 
     # Step 4: Fetch the full details of each email
-    # Now we loop through each ID and download the complete email.
-    # "emails" will be our final list of email dictionaries.
-    emails = []
-
-    for msg_ref in messages:
-        try:
-            # Fetch the full email using its ID
-            # "format='full'" means we want headers AND body content
-            msg = service.users().messages().get(
-                userId='me',
-                id=msg_ref['id'],  # The unique ID from step 3
-                format='full'       # Get everything (headers + body)
-            ).execute()
-
-            # Parse the raw Gmail data into a clean, simple dictionary
-            # (see the _parse_message function below)
-            email_data = _parse_message(msg)
-
-            # If parsing succeeded, add this email to our list
-            if email_data:
-                emails.append(email_data)
-
-        except Exception as e:
-            # If something goes wrong with one email, skip it and continue
-            # with the rest. We don't want one bad email to stop everything.
-            print(f"   [WARN] Error fetching message {msg_ref['id']}: {e}")
-            continue
+    # The downloads are sent in batches (many emails per HTTP request),
+    # so we wait for one round trip per batch instead of one per email.
+    # Each one is parsed as it arrives (see _iter_parsed_emails below);
+    # "list" collects them into our final list of email dictionaries.
+    message_ids = [m['id'] for m in messages]
+    emails = list(_iter_parsed_emails(service, message_ids, need_body))
 
     print(f"[OK] Successfully fetched {len(emails)} emails")
 
@@ -373,6 +529,7 @@ def list_email_ids(max_results: int = 500, query: str = '',
             'userId': 'me',
             'q': full_query,
             'maxResults': page_size,
+            'fields': 'messages/id,nextPageToken',
         }
         if page_token:
             kwargs['pageToken'] = page_token
@@ -408,39 +565,139 @@ def fetch_emails_by_ids(message_ids: list[str]) -> list[dict]:
     Returns:
         A list of email dictionaries (same format as fetch_emails).
     """
+    return list(iter_emails_by_ids(message_ids))
+
+
+def iter_emails_by_ids(message_ids: list[str]):
+    """
+    Like fetch_emails_by_ids(), but yields each email as soon as it's fetched.
+
+    The orchestrator uses this to start analyzing the first batch while
+    the rest are still downloading, instead of waiting for all of them.
+
+    Args:
+        message_ids: List of Gmail message ID strings to fetch.
+
+    Yields:
+        Email dictionaries (same format as fetch_emails), in ID order.
+    """
     if not message_ids:
-        return []
+        return
 
     service = get_gmail_service()
 
     print(f"[FETCH] Fetching full content for {len(message_ids)} emails...")
 
-    emails = []
-    for msg_id in message_ids:
+    fetched = 0
+    # Failed emails are skipped — they never reach the caller, so they
+    # aren't added to processed IDs and get retried on the next build
+    for email_data in _iter_parsed_emails(service, message_ids):
+        fetched += 1
+        yield email_data
+
+    print(f"[OK] Successfully fetched {fetched} of {len(message_ids)} emails")
+
+
+def _iter_parsed_emails(service, message_ids: list[str], need_body: bool = True):
+    """
+    Download and parse messages in one pass, yielding each email dict.
+
+    Shared by fetch_emails() and iter_emails_by_ids(). Each message is
+    parsed as soon as its batch arrives, so callers can start working
+    on the first emails while later batches are still downloading.
+
+    Args:
+        service:     The Gmail API service from get_gmail_service().
+        message_ids: Gmail message IDs to download.
+        need_body:   Passed on to _iter_messages() and _parse_message().
+
+    Yields:
+        Email dictionaries, in ID order. Messages that fail to download
+        or parse are reported and skipped.
+    """
+    for msg_id, msg, error in _iter_messages(service, message_ids, need_body):
         try:
-            msg = service.users().messages().get(
-                userId='me',
-                id=msg_id,
-                format='full'
-            ).execute()
+            if error is not None:
+                raise error
 
-            email_data = _parse_message(msg)
-            if email_data:
-                emails.append(email_data)
+            # Parse the raw Gmail data into a clean, simple dictionary
+            # (see the _parse_message function below)
+            email_data = _parse_message(msg, need_body)
 
         except Exception as e:
-            # Skip individual failures — don't add to processed IDs
-            # so they'll be retried on the next build
+            # If something goes wrong with one email, skip it and continue
+            # with the rest. We don't want one bad email to stop everything.
             print(f"   [WARN] Error fetching message {msg_id}: {e}")
             continue
 
-    print(f"[OK] Successfully fetched {len(emails)} of {len(message_ids)} emails")
-    return emails
+        if email_data:
+            yield email_data
+
+
+def _iter_messages(service, message_ids: list[str], need_body: bool = True):
+    """
+    Download messages in batches, yielding each one in ID order.
+
+    Instead of one HTTP request (and one network round trip) per email,
+    up to GMAIL_BATCH_SIZE "get message" calls are packed into a single
+    batch request. Gmail runs them and sends all the answers back in one
+    response, so 150 emails cost 3 round trips instead of 150.
+
+    A batch that fails as a whole (e.g. the connection drops) is reported
+    as an error for each of its messages, just like individual failures —
+    the caller skips them and the rest carry on.
+
+    Args:
+        service:     The Gmail API service from get_gmail_service().
+        message_ids: Gmail message IDs to download.
+        need_body:   False fetches only the headers in _METADATA_HEADERS
+                     (plus the snippet) instead of the whole message.
+
+    Yields:
+        (msg_id, message, error) tuples — message is the raw Gmail
+        message dict (None on failure), error the exception (or None).
+    """
+    if need_body:
+        # Everything (headers + body)
+        get_kwargs = {'format': 'full', 'fields': _FULL_FIELDS}
+    else:
+        get_kwargs = {'format': 'metadata', 'metadataHeaders': _METADATA_HEADERS,
+                      'fields': _METADATA_FIELDS}
+
+    for start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+        chunk = message_ids[start:start + GMAIL_BATCH_SIZE]
+
+        # The batch calls us back once per message. Request IDs are the
+        # positions in the chunk (message IDs could repeat; these can't).
+        results = {}
+
+        def on_response(request_id, response, exception):
+            results[request_id] = (response, exception)
+
+        batch = service.new_batch_http_request(callback=on_response)
+        for i, msg_id in enumerate(chunk):
+            batch.add(
+                service.users().messages().get(userId='me', id=msg_id, **get_kwargs),
+                request_id=str(i),
+            )
+
+        try:
+            batch.execute()
+        except Exception as e:
+            for msg_id in chunk:
+                yield msg_id, None, e
+            continue
+
+        for i, msg_id in enumerate(chunk):
+            msg, error = results.get(str(i), (None, None))
+            if msg is None and error is None:
+                error = RuntimeError('no response in batch')
+            yield msg_id, msg, error
 
 
 # ── EMAIL PARSING ──────────────────────────────────────────────────────
 
-def _parse_message(msg: dict) -> dict | None:
+def _parse_message(msg: dict, need_body: bool = True) -> dict | None:
     """
     Convert a raw Gmail API message into a clean, simple dictionary.
 
@@ -452,7 +709,9 @@ def _parse_message(msg: dict) -> dict | None:
     by other functions in this file, not from outside.
 
     Args:
-        msg: The raw message dictionary from Gmail's API
+        msg:       The raw message dictionary from Gmail's API
+        need_body: False for messages fetched with format='metadata' —
+                   they have no body, so Gmail's snippet is used instead.
 
     Returns:
         A clean dictionary with the email's key fields, or None if parsing fails.
@@ -466,22 +725,26 @@ def _parse_message(msg: dict) -> dict | None:
 
     # Convert the list of headers into a simple dictionary.
     # We only care about certain headers (subject, from, to, date, cc, bcc).
-    header_dict = {}
-    for h in headers:
-        # Convert header name to lowercase for consistent matching
-        name = h['name'].lower()
-        if name in ('subject', 'from', 'to', 'date', 'cc', 'bcc'):
-            header_dict[name] = h['value']
+    # Names are lowercased for consistent matching; if a header appears
+    # twice, the last one wins.
+    header_dict = {
+        name: h['value']
+        for h in headers
+        if (name := h['name'].lower()) in _WANTED_HEADERS
+    }
 
     # ── Parse the "From" field ─────────────────────────────────
     # The "from" field often looks like: "John Doe <john@example.com>"
     # "parseaddr" splits this into name and email address separately.
-    from_name, from_email = parseaddr(header_dict.get('from', ''))
+    from_name, from_email = _split_from(header_dict.get('from', ''))
 
     # ── Extract the email body ─────────────────────────────────
     # The body might be plain text, HTML, or nested in multipart sections.
     # "_extract_body" handles all these cases (see below).
-    body = _extract_body(msg.get('payload', {}))
+    if need_body:
+        body = _extract_body(msg.get('payload', {}), limit=BODY_MAX_CHARS)
+    else:
+        body = msg.get('snippet', '')
 
     # ── Build and return the clean dictionary ──────────────────
     return {
@@ -494,12 +757,31 @@ def _parse_message(msg: dict) -> dict | None:
         'to': header_dict.get('to', ''),                         # Who it was sent to
         'date': header_dict.get('date', ''),                     # When it was sent
         'snippet': msg.get('snippet', ''),                       # Gmail's short preview
-        'body': body[:1000],                                     # Body text (truncated to 1000 chars)
+        'body': body[:BODY_MAX_CHARS],                           # Body text (truncated to 1000 chars)
         'labels': msg.get('labelIds', [])                        # Gmail labels (INBOX, etc.)
     }
 
 
-def _extract_body(payload: dict) -> str:
+def _split_from(raw_from: str) -> tuple[str, str]:
+    """
+    Split a "From" header into (name, email) — same result as parseaddr().
+
+    Common shapes are matched with _FROM_RE directly; anything unusual
+    (comments, escapes, odd spacing, several addresses...) falls back to
+    parseaddr() itself.
+    """
+    match = _FROM_RE.match(raw_from)
+    if match is None:
+        return parseaddr(raw_from)
+    quoted_name, plain_name, addr, bare_addr = match.groups()
+    if bare_addr is not None:
+        return '', bare_addr
+    if quoted_name is not None:
+        return quoted_name, addr
+    return plain_name or '', addr
+
+
+def _extract_body(payload: dict, limit: int | None = None) -> str:
     """
     Dig through Gmail's nested message structure to find the plain text body.
 
@@ -513,53 +795,117 @@ def _extract_body(payload: dict) -> str:
 
     Args:
         payload: The "payload" section of a Gmail message
+        limit:   Only return (and only decode) the first this-many
+                 characters. None decodes the whole body.
 
     Returns:
         The email body as a plain text string.
     """
+    data = _find_body_data(payload)
+    if not data:
+        return ''
+
+    # Gmail encodes the body as "base64url" — a safe way to transmit
+    # binary data as text. We need to decode it back to regular text
+    # (see _b64url_decode below).
+    raw = None
+
+    # ── Only decode what we'll keep ────────────────────────────
+    # A UTF-8 character is at most 4 bytes, so the first "limit"
+    # characters always fit in limit * 4 bytes — and base64 spends 4
+    # characters on every 3 bytes. Long HTML newsletters can be megabytes;
+    # this way we decode a few KB of them instead.
+    if limit is not None:
+        max_bytes = limit * 4
+        cut = (max_bytes + 2) // 3 * 4
+        if len(data) > cut:
+            try:
+                raw = _b64url_decode(data[:cut])
+            except ValueError:  # base64's binascii.Error is a ValueError
+                pass
+            if raw is not None and len(raw) < max_bytes:
+                # Stray non-base64 characters (which the decoder skips)
+                # made the trimmed data come up short
+                raw = None
+
+    if raw is None:
+        raw = _b64url_decode(data)
+
+    # "errors='replace'" means: if there's a character we can't decode,
+    # replace it with a ? instead of crashing
+    if limit is None:
+        return raw.decode('utf-8', errors='replace')
+    # Cutting mid-character only garbles what comes after "limit"
+    return raw[:limit * 4].decode('utf-8', errors='replace')[:limit]
+
+
+def _b64url_decode(data: str) -> bytes:
+    """
+    Decode Gmail's base64url text to bytes.
 
+    Swapping the two URL-safe characters on the ASCII bytes and calling
+    b64decode directly is what urlsafe_b64decode does internally, minus
+    its extra wrapper calls and type checks on every message.
+    """
+    return base64.b64decode(data.encode('ascii').translate(_B64URL_TO_STD),
+                            validate=False)
+
+
+def _find_body_data(payload: dict) -> str | None:
+    """
+    Pick the (still base64-encoded) body data _extract_body should decode.
+
+    Only the winning part is decoded, once, at the end — an HTML part
+    that loses to a plain-text one is never decoded at all.
+
+    Rules, at each level of the message:
+      - a part with its own body data is the answer (simple message)
+      - otherwise the last text/plain part wins
+      - else the first nested multipart section that has a body
+        (whatever that section picked — plain text or HTML)
+      - else the last text/html part
+
+    Nested sections are walked with an explicit stack instead of the
+    function calling itself, one "frame" per multipart level:
+    [parts, index of the next part, best text so far, best HTML so far].
+    """
     # ── Case 1: Simple message ─────────────────────────────────
     # Check if the body data is directly in the payload
     if payload.get('body', {}).get('data'):
-        # Gmail encodes the body as "base64url" — a safe way to transmit
-        # binary data as text. We need to decode it back to regular text.
-        return base64.urlsafe_b64decode(
-            payload['body']['data']
-        ).decode('utf-8', errors='replace')
-        # "errors='replace'" means: if there's a character we can't decode,
-        # replace it with a ? instead of crashing
+        return payload['body']['data']
 
     # ── Case 2: Multipart message ──────────────────────────────
-    # If no direct body, look through the "parts" list
-    parts = payload.get('parts', [])
-
-    # We'll collect both plain text and HTML, but prefer plain text
-    text_body = ''
-    html_body = ''
+    stack = [[payload.get('parts', []), 0, None, None]]
+
+    while True:
+        frame = stack[-1]
+        parts, index = frame[0], frame[1]
+
+        if index == len(parts):
+            # Finished this level — hand its answer up to the parent
+            stack.pop()
+            found = frame[2] or frame[3]
+            if not stack:
+                return found
+            if found:
+                parent = stack[-1]
+                parent[2] = parent[2] or found
+            continue
 
-    for part in parts:
+        frame[1] += 1
+        part = parts[index]
         # "mimeType" tells us what kind of content this part is
         mime_type = part.get('mimeType', '')
+        data = part.get('body', {}).get('data')
 
-        if mime_type == 'text/plain' and part.get('body', {}).get('data'):
-            # This part is plain text — decode it
-            text_body = base64.urlsafe_b64decode(
-                part['body']['data']
-            ).decode('utf-8', errors='replace')
-
-        elif mime_type == 'text/html' and part.get('body', {}).get('data'):
-            # This part is HTML — decode it (fallback if no plain text)
-            html_body = base64.urlsafe_b64decode(
-                part['body']['data']
-            ).decode('utf-8', errors='replace')
-
+        if mime_type == 'text/plain' and data:
+            frame[2] = data
+        elif mime_type == 'text/html' and data:
+            # Fallback if no plain text turns up
+            frame[3] = data
         elif mime_type.startswith('multipart/'):
-            # This part itself contains more parts — go deeper (recursion!)
-            # "Recursion" means a function calling itself, like opening a
-            # box that contains another box that contains another box.
-            nested = _extract_body(part)
-            if nested:
-                text_body = text_body or nested
-
-    # Return plain text if we found it, otherwise HTML, otherwise empty string
-    return text_body or html_body or ''
+            # This part itself contains more parts — go one level deeper
+            if data:
+                frame[2] = frame[2] or data
+            else:
+                stack.append([part.get('parts', []), 0, None, None])
@@ -24,44 +24,68 @@
 # ── IMPORTS ────────────────────────────────────────────────────────────
 import os
 import sys
-import json
 import asyncio
-import queue
+import contextvars
+import functools
+import hashlib
+import re
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from contextlib import asynccontextmanager
 
 # FastAPI framework imports
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict
+
+# sse-starlette formats Server-Sent Events and handles keepalive pings
+# and client disconnects for us
+from sse_starlette import EventSourceResponse
+
+# "orjson" is a fast (Rust-backed) JSON serializer, used for SSE events
+import orjson
 
 # Add project root to Python's path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Our project imports
-from orchestrator import Orchestrator
+import memory.vault
 from memory.vault import (
-    get_vault_stats, list_memories, read_memory,
-    search_vault, initialize_vault, MEMORY_TYPES,
+    get_vault_stats, list_memories_with_etag, read_memory,
+    search_vault, warm_search_cache, initialize_vault, vault_generation, MEMORY_TYPES,
     get_processed_email_ids, save_processed_email_ids
 )
 from tools.gmail_tools import (
-    get_gmail_service, is_authenticated, TOKEN_PATH, CREDENTIALS_PATH, SCOPES
+    get_gmail_service, is_authenticated, save_credentials,
+    TOKEN_PATH, CREDENTIALS_PATH, SCOPES
 )
 
 
 # ── GLOBAL STATE ───────────────────────────────────────────────────────
-# "orchestrator" is our singleton agent manager.
-# Created once at startup, shared across all requests.
+# "orchestrator" is our singleton agent manager, shared across all requests.
+# It's created by _get_orchestrator below, not at import: the orchestrator
+# module pulls in every agent and both LLM SDKs, which the vault-browsing
+# endpoints never need. A background warm-up after startup (see _prewarm)
+# usually creates it before the first build asks for it.
 orchestrator = None
+_orchestrator_lock = threading.Lock()
 
 # Build state — tracks whether a build pipeline is running so that
 # page refreshes can reconnect to the progress instead of restarting.
-# Protected by a threading.Lock for thread-safe reads/writes.
+#
+# No lock guards it. Only one thread writes at a time (the build
+# worker, or the event loop while starting a build), and every write
+# swaps in a fresh dict instead of mutating the current one. Readers
+# just grab `build_state` once and always see a complete snapshot.
+#
+# _build_slot decides who gets to start a build: acquire(blocking=False)
+# is an atomic test-and-set, so of two simultaneous "Build" clicks
+# exactly one wins and the other attaches to its progress stream.
 import time as _time
-_build_lock = threading.Lock()
+_build_slot = threading.Lock()
 build_state = {
     "status": "idle",       # idle | running | complete | error
     "stage": "",            # current pipeline stage
@@ -69,10 +93,31 @@ build_state = {
     "step": "",             # e.g. "2/5"
     "started_at": None,     # epoch timestamp
     "finished_at": None,    # epoch timestamp
+    "duration_ms": None,    # how long the build ran (monotonic clock)
     "stats": None,          # vault stats on completion
     "source": "",           # "auto" or "manual"
 }
 
+# Pipeline stages in order, for the "2/7"-style step counter. Looked up
+# once per progress event, so it's a dict rather than list.index().
+_STAGE_ORDER = ("fetching", "email_reader", "memory_writer", "graph_rebuild",
+                "action_agent", "reconciliation", "insights")
+_STAGE_IDX = {stage: i for i, stage in enumerate(_STAGE_ORDER)}
+_STAGE_TOTAL = len(_STAGE_ORDER)
+_STEP_DONE = f"{_STAGE_TOTAL}/{_STAGE_TOTAL}"
+
+# Response cache — the dashboard asks for auth status, stats and the
+# memory list on every page navigation, and each open tab multiplies
+# that. An answer is reused for a few seconds (per endpoint and query
+# parameters) so a burst of requests shares one disk walk. Entries also
+# end early when the vault changes: the key includes the vault's write
+# generation, and _bump_cache_version() runs after every background job
+# and every change made here in the web app.
+_RESPONSE_TTLS = {"auth_status": 3.0, "stats": 10.0, "memories": 10.0}
+_response_cache = {}    # (endpoint, params) -> (expires_at, version, value)
+_response_cache_lock = threading.Lock()
+_cache_version = 0
+
 
 # ── SERVER STARTUP ─────────────────────────────────────────────────────
 @asynccontextmanager
@@ -80,41 +125,172 @@ async def lifespan(app: FastAPI):
     """
     Run setup code when the server starts.
     
-    Creates the vault folders and the Orchestrator (which creates
-    all three AI agents). The "yield" pauses here while the server
-    runs. Everything before yield = startup, everything after = shutdown.
+    Creates the vault folders, then starts warming up the Orchestrator
+    and Gmail connection in the background (see _prewarm). The "yield"
+    pauses here while the server runs.
+    Everything before yield = startup, everything after = shutdown.
     """
-    global orchestrator
     initialize_vault()
-    orchestrator = Orchestrator()
+    # Not awaited: the server starts answering requests right away, and
+    # the first build finds everything ready (or finishes warming up)
+    warmup = asyncio.create_task(_prewarm())
     print("\n[OK] Email Memory Agent web server ready!")
     print("   Open http://localhost:8000 in your browser\n")
     yield
+    warmup.cancel()
+    # Don't wait for a running pipeline (or chat answer): it can take minutes
+    _JOB_POOL.shutdown(wait=False)
+    _QUERY_POOL.shutdown(wait=False)
+
+
+async def _prewarm():
+    """
+    Do the first build's (and search's) one-time setup work while the
+    server sits idle.
+
+    All steps run side by side in worker threads:
+      - Create the Orchestrator, which imports every agent and both LLM
+        SDKs and creates their clients
+      - Read every memory into the search cache, so the first search
+        (from the page or an agent) doesn't have to read the whole vault
+      - If Gmail is connected, build a Gmail service once. This imports
+        the Google API client, loads the API description and, if the
+        saved token has expired, refreshes it — a round trip to Google
+        the first build would otherwise wait for.
+
+    Failures are only logged; the first request will try again itself.
+    """
+    def warm_gmail():
+        # Never for a missing or unusable token: get_gmail_service()
+        # would open the browser consent flow
+        if is_authenticated():
+            get_gmail_service()
+
+    results = await asyncio.gather(
+        asyncio.to_thread(_get_orchestrator),
+        asyncio.to_thread(warm_gmail),
+        asyncio.to_thread(warm_search_cache),
+        return_exceptions=True,
+    )
+    for name, result in zip(("Orchestrator", "Gmail service", "search cache"), results):
+        if isinstance(result, Exception):
+            print(f"[WARN] Warm-up of {name} failed: {result}")
+
+
+def _get_orchestrator():
+    """
+    Return the shared Orchestrator, creating it on the first call.
+
+    The lock makes sure two requests arriving together (each in its own
+    worker thread) don't both build one.
+    """
+    global orchestrator
+    if orchestrator is None:
+        with _orchestrator_lock:
+            if orchestrator is None:
+                from orchestrator import Orchestrator
+                orchestrator = Orchestrator()
+    return orchestrator
 
 
-# Create the FastAPI app
+def _cache_lookup(endpoint: str, params: tuple):
+    """
+    Look up a cached response.
+
+    Returns (value, version): value is None on a miss (or if the entry
+    expired or anything changed since). Pass the version on to
+    _cache_store() along with the freshly computed value — it was taken
+    before the computation, so a change made meanwhile still wins.
+    """
+    version = (_cache_version, str(memory.vault.VAULT_ROOT), vault_generation())
+    with _response_cache_lock:
+        entry = _response_cache.get((endpoint, params))
+    if entry is not None and entry[0] > _time.monotonic() and entry[1] == version:
+        return entry[2], version
+    return None, version
+
+
+def _cache_store(endpoint: str, params: tuple, version: tuple, value):
+    """Remember a response for _RESPONSE_TTLS[endpoint] seconds."""
+    expires_at = _time.monotonic() + _RESPONSE_TTLS[endpoint]
+    with _response_cache_lock:
+        _response_cache[(endpoint, params)] = (expires_at, version, value)
+
+
+def _bump_cache_version():
+    """Make every cached response stale (after the vault or token changed)."""
+    global _cache_version
+    with _response_cache_lock:
+        _cache_version += 1
+
+
+class _ORJSONResponse(JSONResponse):
+    """
+    A JSONResponse that encodes with orjson instead of the json module.
+
+    Our own tiny version rather than FastAPI's ORJSONResponse, which newer
+    FastAPI releases deprecate.
+    """
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Create the FastAPI app. Every endpoint that returns a dict is sent
+# through _ORJSONResponse, which matters most for the memory listings.
 app = FastAPI(
     title="Email Memory Agent",
     description="Multi-agent system that builds a memory of you from your emails",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=_ORJSONResponse,
 )
 
+# Compress responses bigger than 1 KB when the browser accepts gzip.
+# Memory listings and search results repeat the same keys, tags and
+# type names over and over, so they shrink several times over.
+#
+# SSE streams are never compressed: gzip holds data back in its buffer,
+# so progress events would reach the browser late and in clumps. Newer
+# Starlette versions skip text/event-stream responses by themselves;
+# older ones don't, so the stream endpoints are left out here by path.
+_SSE_PATHS = frozenset({
+    "/api/stream/build", "/api/stream/refresh", "/api/stream/insights",
+    "/api/query/stream",
+})
+
+
+class _GZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes the SSE streams (_SSE_PATHS) through untouched."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in _SSE_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(_GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Serve static files (the frontend's HTML/CSS/JS)
 static_dir = Path(__file__).parent / "static"
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
 
 # ── REQUEST BODY MODELS ───────────────────────────────────────────────
-# These define what data the frontend sends in each request.
+# These define what data the frontend sends in each request. They're
+# frozen (handlers only read them) and ignore any extra fields.
 
 class BuildRequest(BaseModel):
     """Data for triggering a memory build."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     days_back: int = 60
     max_emails: int = 150
     gmail_query: str = ""
 
 class QueryRequest(BaseModel):
     """Data for asking a question."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     question: str
 
 
@@ -132,10 +308,22 @@ async def auth_status():
       - Has credentials but no token → "Connect Gmail" button
       - Authenticated → "Gmail Connected" badge
     """
-    return {
-        "authenticated": is_authenticated(),
-        "credentials_exist": CREDENTIALS_PATH.exists()
+    cached, version = _cache_lookup("auth_status", ())
+    if cached is not None:
+        return cached
+
+    # Both checks touch the disk, so run them side by side in worker
+    # threads instead of one after the other on the event loop.
+    authenticated, credentials_exist = await asyncio.gather(
+        asyncio.to_thread(is_authenticated),
+        asyncio.to_thread(CREDENTIALS_PATH.exists),
+    )
+    result = {
+        "authenticated": authenticated,
+        "credentials_exist": credentials_exist
     }
+    _cache_store("auth_status", (), version, result)
+    return result
 
 
 @app.post("/api/auth/google")
@@ -160,8 +348,8 @@ async def auth_google():
     
     # Run OAuth in a background thread (it blocks waiting for browser)
     try:
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, _run_oauth_flow)
+        await asyncio.to_thread(_run_oauth_flow)
+        _bump_cache_version()
         return {"status": "success", "message": "Gmail connected successfully!"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OAuth failed: {str(e)}")
@@ -173,14 +361,11 @@ def _run_oauth_flow():
     saves token. Runs in a background thread so the server doesn't freeze.
     """
     from google_auth_oauthlib.flow import InstalledAppFlow
-    import pickle
     
     flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_PATH), SCOPES)
     creds = flow.run_local_server(port=0)
     
-    TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(TOKEN_PATH, 'wb') as token_file:
-        pickle.dump(creds, token_file)
+    save_credentials(creds)
 
 
 @app.post("/api/auth/logout")
@@ -193,6 +378,7 @@ async def auth_logout():
     """
     if TOKEN_PATH.exists():
         TOKEN_PATH.unlink()
+    _bump_cache_version()
     return {"status": "success", "message": "Logged out successfully"}
 
 
@@ -204,11 +390,13 @@ async def auth_user_info():
     The frontend uses this to display the user's email address
     in the sidebar and logout header.
     """
-    if not is_authenticated():
+    # The check must finish before the profile fetch starts: with an
+    # unusable token, get_gmail_service() would open the browser consent
+    # flow instead of failing.
+    if not await asyncio.to_thread(is_authenticated):
         raise HTTPException(status_code=401, detail="Not authenticated")
     try:
-        loop = asyncio.get_event_loop()
-        info = await loop.run_in_executor(None, _get_user_profile)
+        info = await asyncio.to_thread(_get_user_profile)
         return info
     except Exception:
         return {"email": "", "authenticated": True}
@@ -221,30 +409,37 @@ def _get_user_profile():
     return {"email": profile.get("emailAddress", ""), "authenticated": True}
 
 
-# ============================================================================
-# FRONTEND ENDPOINT
-# ============================================================================
-
-@app.get("/", response_class=HTMLResponse)
-async def serve_frontend():
-    """Serve the main web interface (index.html)."""
-    return FileResponse(str(static_dir / "index.html"))
-
-
 # ============================================================================
 # BUILD STATE ENDPOINT — Check pipeline status without starting a build
 # ============================================================================
 
 @app.get("/api/build/status")
-async def get_build_status():
+async def get_build_status(request: Request, response: Response):
     """
     Return the current build pipeline state.
 
     The frontend polls this on page load to decide whether to start a
     new build or display the status of a running/completed one.
+
+    While a build runs, the page polls every 1.5 seconds and most polls
+    find nothing new. So the response carries an ETag made from the
+    state, and a poll that sends it back in "If-None-Match" gets an
+    empty "304 Not Modified" until something changes. "Cache-Control:
+    no-cache" makes the browser check with us on every poll.
     """
-    with _build_lock:
-        return dict(build_state)
+    snapshot = build_state
+    if _active_build is not None:
+        # A page polling the build counts as watching it
+        _active_build["seen_at"] = _time.monotonic()
+
+    encoded = orjson.dumps(snapshot, option=orjson.OPT_SORT_KEYS, default=str)
+    etag = '"' + hashlib.blake2b(encoded, digest_size=8).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in _if_none_match(request):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return snapshot
 
 
 # ============================================================================
@@ -265,120 +460,153 @@ async def stream_build(
         data: {"stage": "complete", "stats": {...}}
 
     HOW IT WORKS:
-    1. Pipeline runs in a BACKGROUND THREAD
-    2. Progress events go into a QUEUE (thread-safe mailbox)
-    3. An async generator reads from queue and yields SSE events
-    4. FastAPI streams those events to the browser in real-time
+    Pipeline runs in a BACKGROUND THREAD; each progress event updates
+    build_state and is streamed to the browser (see _start_job below).
 
     CONCURRENCY GUARD:
-    Only one build can run at a time. If a build is already running,
-    returns a 409 Conflict so the frontend can poll /api/build/status instead.
+    Only one build can run at a time. If a build is already running, this
+    browser joins its stream instead (the query parameters are ignored):
+    it gets the latest status straight away, then every event after it.
+
+    ABANDONED BUILDS:
+    Closing the tab doesn't stop the build right away — a reloaded page
+    picks it up again by polling /api/build/status. But once no browser
+    has streamed or polled it for _ABANDONED_AFTER_SECONDS, the build is
+    cancelled at its next checkpoint instead of spending LLM calls on a
+    result nobody is waiting for.
     """
-    # Prevent concurrent builds
-    with _build_lock:
-        if build_state["status"] == "running":
+    global _active_build, build_state
+
+    # Worked out before claiming the build slot, so that the new
+    # build_state below is put together from ready-made values
+    source = "auto" if gmail_query == "" and days_back == 180 else "manual"
+
+    # Prevent concurrent builds — whoever wins the slot starts the build
+    running = not _build_slot.acquire(blocking=False)
+    if running:
+        current = build_state
+        latest = {"stage": current["stage"], "status": "running",
+                  "message": current["message"]}
+        if _active_build is None or _active_build["worker"].done():
+            # Running, but not a job of ours that we can still listen to
             raise HTTPException(
                 status_code=409,
                 detail="A build is already in progress."
             )
-        # Mark build as running
-        build_state.update({
-            "status": "running",
-            "stage": "starting",
-            "message": "Starting pipeline...",
-            "step": "",
-            "started_at": _time.time(),
-            "finished_at": None,
-            "stats": None,
-            "source": "auto" if gmail_query == "" and days_back == 180 else "manual",
-        })
-
-    # Thread-safe queue: pipeline thread puts events in, SSE stream reads them out
-    event_queue = queue.Queue()
+        build = _active_build
+        events = asyncio.Queue(maxsize=_LISTENER_QUEUE_SIZE)
+        build["listeners"].add(events)
+        return _listen(build["listeners"], events, replay=latest,
+                       on_leave=lambda: _on_build_listener_left(build))
+
+    # Mark build as running. The wall clock is read once, here; the
+    # duration comes from the monotonic clock, which never jumps.
+    started_at = _time.time()
+    started_ns = _time.monotonic_ns()
+    build_state = {
+        "status": "running",
+        "stage": "starting",
+        "message": "Starting pipeline...",
+        "step": "",
+        "started_at": started_at,
+        "finished_at": None,
+        "duration_ms": None,
+        "stats": None,
+        "source": source,
+    }
 
     def _update_build_state(event):
         """Update the global build_state from a pipeline progress event."""
-        with _build_lock:
-            build_state["stage"] = event.get("stage", build_state["stage"])
-            build_state["message"] = event.get("message", build_state["message"])
-
-            # Compute step ratio from stage
-            stage_order = ["fetching", "email_reader", "memory_writer",
-                           "graph_rebuild", "action_agent", "reconciliation", "insights"]
-            stage_key = event.get("stage", "")
-            if stage_key in stage_order:
-                idx = stage_order.index(stage_key)
-                total = len(stage_order)
-                build_state["step"] = f"{idx + 1}/{total}"
-
-            if event.get("stage") == "complete":
-                build_state["status"] = "complete"
-                build_state["finished_at"] = _time.time()
-                build_state["stats"] = event.get("stats")
-                build_state["step"] = f"{len(stage_order)}/{len(stage_order)}"
-
-            if event.get("stage") == "error":
-                build_state["status"] = "error"
-                build_state["finished_at"] = _time.time()
-
-    def run_pipeline():
+        global build_state
+        # Copy, update, then swap in — readers never see a half-written state
+        state = dict(build_state)
+        stage = event.get("stage")
+        message = event.get("message")
+        if stage is not None:
+            state["stage"] = stage
+        if message is not None:
+            state["message"] = message
+
+        # Compute step ratio from stage
+        idx = _STAGE_IDX.get(stage)
+        if idx is not None:
+            state["step"] = f"{idx + 1}/{_STAGE_TOTAL}"
+
+        if stage in _TERMINAL_STAGES:
+            duration_ms = (_time.monotonic_ns() - started_ns) // 1_000_000
+            state["status"] = stage
+            state["duration_ms"] = duration_ms
+            state["finished_at"] = started_at + duration_ms / 1000
+            if stage == "complete":
+                state["stats"] = event.get("stats")
+                state["step"] = _STEP_DONE
+
+        build_state = state
+
+    def run_pipeline(emit):
         """
         Run the batched email→memory pipeline in a background thread.
 
         Uses orchestrator.build_memory() with a progress callback that
-        pushes events into the SSE queue AND updates global build_state.
+        sends events to the SSE stream AND updates global build_state.
         """
-        try:
-            def on_progress(event):
-                _update_build_state(event)
-                event_queue.put(event)
+        def on_progress(event):
+            _update_build_state(event)
+            emit(event)
 
-            orchestrator.build_memory(
+        try:
+            _get_orchestrator().build_memory(
                 user_input="Build my memory from emails",
                 progress_callback=on_progress,
                 max_emails=max_emails,
                 days_back=days_back,
-                gmail_query=gmail_query
+                gmail_query=gmail_query,
+                cancel_event=cancel_event
             )
 
         except Exception as e:
             error_event = {"stage": "error", "status": "error", "message": str(e)}
             _update_build_state(error_event)
-            event_queue.put(error_event)
+            emit(error_event)
+
         finally:
-            event_queue.put(None)  # Sentinel: signals "stream is done"
+            _build_slot.release()
 
-    async def event_generator():
-        """
-        Async generator that reads events from the queue and yields
-        them as SSE-formatted strings to the browser.
-        """
-        thread = threading.Thread(target=run_pipeline, daemon=True)
-        thread.start()
+    cancel_event = threading.Event()
+    try:
+        worker, listeners, events = _start_job(run_pipeline)
+    except BaseException:
+        _build_slot.release()
+        raise
+    build = _active_build = {"worker": worker, "listeners": listeners,
+                             "cancel": cancel_event, "seen_at": _time.monotonic()}
+    return _listen(listeners, events,
+                   on_leave=lambda: _on_build_listener_left(build))
 
-        while True:
-            try:
-                event = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: event_queue.get(timeout=0.5)
-                )
-            except queue.Empty:
-                yield ": keepalive\n\n"
-                continue
 
-            if event is None:
-                break
+def _on_build_listener_left(build: dict):
+    """A browser stopped streaming this build: start watching for abandonment."""
+    build["seen_at"] = _time.monotonic()
+    _watch_abandoned_build(build)
 
-            yield f"data: {json.dumps(event)}\n\n"
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
-    )
+def _watch_abandoned_build(build: dict):
+    """
+    Cancel the build once nobody has streamed or polled it for
+    _ABANDONED_AFTER_SECONDS; until then, check again when that time is up.
+
+    Runs on the event loop. A stream that is attached keeps the build
+    alive, and starts this watch again when it leaves.
+    """
+    if build["worker"].done() or build["listeners"]:
+        return
+    idle = _time.monotonic() - build["seen_at"]
+    if idle >= _ABANDONED_AFTER_SECONDS:
+        print("[*] Nobody is watching the build any more — cancelling it")
+        build["cancel"].set()
+        return
+    asyncio.get_running_loop().call_later(
+        _ABANDONED_AFTER_SECONDS - idle, _watch_abandoned_build, build)
 
 
 # ============================================================================
@@ -393,49 +621,16 @@ async def stream_refresh():
     Scans the full vault and knowledge graph to generate/update
     action items with Eisenhower classification.
     """
-    event_queue = queue.Queue()
-
-    def run_refresh():
+    def run_refresh(emit):
         try:
-            def on_progress(event):
-                event_queue.put(event)
-
-            orchestrator.refresh_actions(
+            _get_orchestrator().refresh_actions(
                 user_input="Refresh and prioritize action items",
-                progress_callback=on_progress
+                progress_callback=emit
             )
         except Exception as e:
-            event_queue.put({"stage": "error", "status": "error", "message": str(e)})
-        finally:
-            event_queue.put(None)
-
-    async def event_generator():
-        thread = threading.Thread(target=run_refresh, daemon=True)
-        thread.start()
+            emit({"stage": "error", "status": "error", "message": str(e)})
 
-        while True:
-            try:
-                event = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: event_queue.get(timeout=0.5)
-                )
-            except queue.Empty:
-                yield ": keepalive\n\n"
-                continue
-
-            if event is None:
-                break
-
-            yield f"data: {json.dumps(event)}\n\n"
-
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
-    )
+    return _stream_job(run_refresh)
 
 
 # ============================================================================
@@ -450,57 +645,251 @@ async def stream_insights():
     Cross-correlates the full vault and knowledge graph to discover
     hidden relationships, execution gaps, and strategic patterns.
     """
-    event_queue = queue.Queue()
-
-    def run_insights():
+    def run_insights(emit):
         try:
-            def on_progress(event):
-                event_queue.put(event)
-
-            orchestrator.generate_insights(
+            _get_orchestrator().generate_insights(
                 user_input="Generate insights from the vault",
-                progress_callback=on_progress
+                progress_callback=emit
             )
         except Exception as e:
-            event_queue.put({"stage": "error", "status": "error", "message": str(e)})
-        finally:
-            event_queue.put(None)
+            emit({"stage": "error", "status": "error", "message": str(e)})
+
+    return _stream_job(run_insights)
+
+
+# ── SSE PLUMBING ───────────────────────────────────────────────────────
+
+# The threads that run streamed jobs (build, refresh, insights). A pool
+# of its own, not asyncio's default executor: the threads are reused from
+# job to job — and so is the Gmail service each thread caches — and quick
+# endpoint work offloaded with asyncio.to_thread never waits behind a
+# long pipeline. One worker per kind of job, so none of them has to wait
+# for another to finish. Only the pipeline jobs run here — streamed chat
+# queries have _QUERY_POOL, so open chats can't keep a build waiting for
+# a thread.
+_JOB_POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix="job")
+
+# The threads that answer streamed chat questions (see stream_query).
+# Several chats can be open at once; a question beyond these waits for a
+# free thread rather than taking one from the pipelines or from
+# asyncio.to_thread's default executor.
+_QUERY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="query")
+
+# Jobs started by _start_job that are still running, held here until they
+# finish — even after every browser tab watching them has gone away.
+_running_jobs = set()
+
+# A progress event that repeats the previous one's stage and status
+# within this many seconds doesn't go out on its own: it waits out the
+# rest of the interval, and only the newest of such a burst is sent. The
+# page only ever shows the latest message anyway.
+_SSE_COALESCE_SECONDS = 0.05
+
+# Each browser's queue holds at most this many events. A browser that
+# reads slower than the job writes skips progress updates instead of
+# piling them up in memory; "complete" and "error" events, and the end
+# of the stream, always get through (see _deliver).
+_LISTENER_QUEUE_SIZE = 256
+_TERMINAL_STAGES = frozenset({"complete", "error"})
+
+# The build pipeline's job, while one is running: {"worker": future,
+# "listeners": set of queues, "cancel": threading.Event, "seen_at":
+# monotonic time a browser last streamed or polled it}. A second tab
+# asking for a build joins it through these listeners instead of
+# starting another.
+_active_build = None
+
+# How long a build may go unwatched (no stream attached, no status poll)
+# before it's cancelled. Long enough to ride out a page reload.
+_ABANDONED_AFTER_SECONDS = 30.0
+
+
+def _start_job(job, pool=_JOB_POOL):
+    """
+    Run job(emit) in a background thread, fanning its events out to
+    every listener.
 
-    async def event_generator():
-        thread = threading.Thread(target=run_insights, daemon=True)
-        thread.start()
+    HOW IT WORKS:
+    1. run_in_executor runs the job on pool (agents make blocking
+       calls) and gives us a future to watch
+    2. emit(event) serializes each event to JSON and hands it to the
+       event loop with call_soon_threadsafe, which drops it into every
+       listener's bounded asyncio.Queue (bursts of same-step events are
+       thinned out first, see _SSE_COALESCE_SECONDS; see _deliver for
+       what happens when a queue is full)
+    3. When the future finishes, a done-callback sends each listener None
+       (the "stream is done" sentinel) — after an error event if the job
+       crashed with an exception it didn't catch
+
+    The job starts right away, not when a browser starts reading: it must
+    not depend on any one client staying connected.
+
+    Must be called from inside a request handler (it needs the running loop).
+
+    Returns:
+        (worker future, set of listener queues, the first listener's queue)
+    """
+    loop = asyncio.get_running_loop()
+    first = asyncio.Queue(maxsize=_LISTENER_QUEUE_SIZE)
+    listeners = {first}
+
+    def publish(data, keep=False):
+        for listener in listeners:
+            _deliver(listener, data, keep)
+
+    # Coalescing state — only touched on the event loop
+    last = {"key": None, "sent_at": 0.0, "pending": None, "timer": None}
+
+    def flush():
+        """Send the held-back event, if there is one."""
+        if last["timer"] is not None:
+            last["timer"].cancel()
+            last["timer"] = None
+        if last["pending"] is not None:
+            data, last["pending"] = last["pending"], None
+            last["sent_at"] = loop.time()
+            publish(data, keep=last["key"][0] in _TERMINAL_STAGES)
+
+    def offer(key, data):
+        now = loop.time()
+        if key == last["key"] and now - last["sent_at"] < _SSE_COALESCE_SECONDS:
+            # Same step again, so soon: keep only the newest one for now
+            last["pending"] = data
+            if last["timer"] is None:
+                last["timer"] = loop.call_at(
+                    last["sent_at"] + _SSE_COALESCE_SECONDS, flush)
+            return
+        flush()  # Anything held back goes first, to keep the order
+        last["key"], last["sent_at"] = key, now
+        publish(data, keep=key[0] in _TERMINAL_STAGES)
+
+    def emit(event):
+        # Serialize here, in the job's thread, so the event loop only
+        # has to pass finished SSE messages along
+        key = (event.get("stage"), event.get("status"))
+        data = _encode_event(event)
+        try:
+            loop.call_soon_threadsafe(offer, key, data)
+        except RuntimeError:
+            pass  # The server shut down mid-job; nobody is listening
+
+    def on_done(worker):
+        # Runs on the event loop, after every event the job emitted.
+        # The job's agents may have changed the vault behind the
+        # response cache's back, so start it afresh.
+        _bump_cache_version()
+        flush()
+        if not worker.cancelled() and worker.exception() is not None:
+            publish(_encode_event({"stage": "error", "status": "error",
+                                   "message": str(worker.exception())}),
+                    keep=True)
+        publish(None, keep=True)
+
+    # Like asyncio.to_thread, run the job inside a copy of our context
+    # so context variables set by the request are visible to it
+    run = functools.partial(contextvars.copy_context().run, job, emit)
+    worker = loop.run_in_executor(pool, run)
+    _running_jobs.add(worker)
+    worker.add_done_callback(_running_jobs.discard)
+    worker.add_done_callback(on_done)
+    return worker, listeners, first
+
+
+def _deliver(listener: asyncio.Queue, data, keep: bool):
+    """
+    Put one event on a browser's queue without ever blocking the job.
 
-        while True:
-            try:
-                event = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: event_queue.get(timeout=0.5)
-                )
-            except queue.Empty:
-                yield ": keepalive\n\n"
-                continue
+    When the queue is full, a progress event is dropped: the next one
+    carries the newer state anyway. An event that must arrive (keep=True)
+    takes the place of the oldest queued one instead.
+    """
+    try:
+        listener.put_nowait(data)
+    except asyncio.QueueFull:
+        if keep:
+            listener.get_nowait()
+            listener.put_nowait(data)
 
-            if event is None:
-                break
 
-            yield f"data: {json.dumps(event)}\n\n"
+def _listen(listeners: set, events: asyncio.Queue, replay: dict = None,
+            on_leave=None) -> EventSourceResponse:
+    """
+    Stream a job's events from one listener queue to the browser as
+    Server-Sent Events.
+
+    EventSourceResponse sends a ": ping" comment every 15 seconds of
+    silence to keep proxies from closing the connection, and stops the
+    generator if the browser disconnects. Nothing polls: the generator
+    sleeps until an event actually arrives.
+
+    A disconnect only removes this listener and calls on_leave(); the
+    job itself keeps running (a build only stops once abandoned, see
+    stream_build).
+
+    Args:
+        listeners: The job's listener set (events is already in it)
+        events:    This browser's queue
+        replay:    An event to send first, for a browser joining late
+        on_leave:  Optional function() called on the event loop once
+                   this browser's stream ends, for whatever reason
+    """
+    async def event_generator():
+        try:
+            if replay is not None:
+                yield _encode_event(replay)
+            while True:
+                data = await events.get()
+                if data is None:
+                    break
+                yield data
+        finally:
+            listeners.discard(events)
+            if on_leave is not None:
+                on_leave()
 
-    return StreamingResponse(
+    return EventSourceResponse(
         event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
+        ping=15,
+        headers={"Cache-Control": "no-cache"},
     )
 
 
+# An SSE message is "data: <json>" followed by a blank line. The JSON
+# never contains a newline, so it always fits on the one "data:" line.
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+
+def _encode_event(event: dict) -> bytes:
+    """
+    Serialize a progress event into a complete SSE message, as bytes.
+
+    EventSourceResponse sends bytes exactly as given, so the message is
+    framed once, here (usually in the job's thread), instead of being
+    wrapped in a ServerSentEvent and re-encoded for every listener.
+    """
+    # default=str turns anything orjson can't encode (dates, paths)
+    # into text instead of failing; OPT_NON_STR_KEYS accepts stats dicts
+    # keyed by numbers or dates, which orjson rejects by default
+    return (_SSE_PREFIX
+            + orjson.dumps(event, default=str, option=orjson.OPT_NON_STR_KEYS)
+            + _SSE_SUFFIX)
+
+
+def _stream_job(job, pool=_JOB_POOL) -> EventSourceResponse:
+    """Start job(emit) and stream its events to this browser (see _start_job)."""
+    _, listeners, events = _start_job(job, pool)
+    return _listen(listeners, events)
+
+
 # ============================================================================
 # DISMISS INSIGHT ENDPOINT — Mark an insight as dismissed
 # ============================================================================
 
 class DismissRequest(BaseModel):
     """Data for dismissing an insight."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     filepath: str
 
 @app.post("/api/insights/dismiss")
@@ -513,6 +902,7 @@ async def dismiss_insight(req: DismissRequest):
     """
     import yaml as _yaml
     from pathlib import Path as _Path
+    from memory.vault import _load_yaml
 
     filepath = req.filepath
     full_path = _Path('vault') / filepath
@@ -530,7 +920,7 @@ async def dismiss_insight(req: DismissRequest):
         raise HTTPException(status_code=400, detail="Invalid memory file format")
 
     try:
-        fm = _yaml.safe_load(parts[1]) or {}
+        fm = _load_yaml(parts[1]) or {}
     except _yaml.YAMLError:
         raise HTTPException(status_code=400, detail="Invalid YAML frontmatter")
 
@@ -541,6 +931,7 @@ async def dismiss_insight(req: DismissRequest):
     yaml_str = _yaml.dump(fm, default_flow_style=False, sort_keys=False)
     updated = f"---\n{yaml_str.strip()}\n---{parts[2]}"
     full_path.write_text(updated, encoding='utf-8')
+    _bump_cache_version()
 
     return {"status": "success", "message": f"Insight dismissed: {filepath}"}
 
@@ -566,16 +957,53 @@ async def query_memory(req: QueryRequest):
 
     # Run the Query Agent in a background thread.
     # The agent calls Claude (which is a blocking HTTP request), so we
-    # use run_in_executor to keep the web server responsive.
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(None, orchestrator.query_memory, req.question)
+    # use asyncio.to_thread to keep the web server responsive.
+    result = await asyncio.to_thread(
+        lambda: _get_orchestrator().query_memory(req.question)
+    )
     return {"answer": result}
 
 
+@app.get("/api/query/stream")
+async def stream_query(question: str = ""):
+    """
+    Ask a question, with live progress updates via SSE.
+
+    The Query Agent's tool calls are streamed as they happen, so the chat
+    can say what it's doing ("Searching your memories for ...") instead
+    of showing bare typing dots for the whole answer:
+        data: {"stage": "query", "status": "in_progress", "message": "..."}
+        data: {"stage": "complete", "status": "complete", "answer": "..."}
+
+    Example: GET /api/query/stream?question=Who+do+I+email+most%3F
+    """
+    if not question.strip():
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+
+    def run_query(emit):
+        try:
+            answer = _get_orchestrator().query_memory(question, progress_callback=emit)
+            emit({"stage": "complete", "status": "complete", "answer": answer})
+        except Exception as e:
+            emit({"stage": "error", "status": "error", "message": str(e)})
+
+    # A chat question is short work, but several can be open at once:
+    # they get a pool of their own, never the pipeline jobs' pool
+    return _stream_job(run_query, pool=_QUERY_POOL)
+
+
 # ============================================================================
 # VAULT BROWSING ENDPOINTS — Read vault data directly
 # ============================================================================
 
+# Valid memory types, as a set for O(1) membership checks
+_MEMORY_TYPES_SET = frozenset(MEMORY_TYPES)
+
+# A memory filename from the URL: a single ".md" file name, never a
+# hidden file, "..", or anything with a path separator in it — so a
+# request can't read outside its memory type's folder.
+_is_memory_filename = re.compile(r"[^./\\][^/\\]*\.md").fullmatch
+
 @app.get("/api/stats")
 async def get_stats():
     """
@@ -583,46 +1011,92 @@ async def get_stats():
 
     Returns: {"total": 15, "by_type": {"decisions": 3, "people": 5, ...}}
     """
-    stats = get_vault_stats()
-    return {
+    cached, version = _cache_lookup("stats", ())
+    if cached is not None:
+        return cached
+
+    # Vault reads block, so they run in a worker thread to keep the
+    # event loop (and every open SSE stream) responsive
+    stats = await asyncio.to_thread(get_vault_stats)
+    result = {
         "total": stats.get("total", 0),
         # Build a dict of just the type counts (exclude "total")
         "by_type": {k: v for k, v in stats.items() if k != "total"}
     }
+    _cache_store("stats", (), version, result)
+    return result
 
 
 @app.get("/api/memories")
-async def get_memories(memory_type: str = None):
+async def get_memories(request: Request, response: Response, memory_type: str = None):
     """
     List all memories with basic info (title, type, date, tags).
 
     Optional query parameter "memory_type" filters to one category.
     Example: GET /api/memories?memory_type=people
+
+    The response carries an ETag. If the browser sends it back in
+    "If-None-Match" and no memory file has changed since, we answer
+    "304 Not Modified" with no body and the browser reuses its copy.
     """
     # Validate the memory type if provided
-    if memory_type and memory_type not in MEMORY_TYPES:
+    if memory_type and memory_type not in _MEMORY_TYPES_SET:
         raise HTTPException(status_code=400, detail=f"Invalid type. Must be one of: {MEMORY_TYPES}")
 
-    # Get the list of memories from the vault
-    memories = list_memories(memory_type)
+    # Get the list of memories from the vault (or the response cache)
+    cached, version = _cache_lookup("memories", (memory_type,))
+    if cached is None:
+        cached = await asyncio.to_thread(list_memories_with_etag, memory_type)
+        _cache_store("memories", (memory_type,), version, cached)
+    memories, etag = cached
+    if etag in _if_none_match(request):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return {"memories": memories, "count": len(memories)}
 
 
+def _if_none_match(request: Request) -> set[str]:
+    """The ETags listed in a request's If-None-Match header (weak or strong)."""
+    header = request.headers.get("if-none-match", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
 @app.get("/api/memory/{memory_type}/{filename}")
-async def get_memory_file(memory_type: str, filename: str):
+async def get_memory_file(request: Request, response: Response,
+                          memory_type: str, filename: str):
     """
     Read a specific memory file — returns both YAML metadata and markdown content.
 
     The URL path contains the memory type and filename:
     Example: GET /api/memory/people/sarah-chen-a1b2.md
 
+    The ETag comes from the file's modification time and size, so a
+    browser re-opening a memory it already has gets "304 Not Modified"
+    after a single stat — the file isn't read or sent again.
+
     Returns: {"frontmatter": {...}, "content": "...", "filepath": "..."}
     """
+    if memory_type not in _MEMORY_TYPES_SET or not _is_memory_filename(filename):
+        raise HTTPException(status_code=404, detail="Memory not found")
+
     filepath = f"{memory_type}/{filename}"
-    result = read_memory(filepath)
+    try:
+        st = await asyncio.to_thread(os.stat, memory.vault.VAULT_ROOT / filepath)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Memory not found")
+
+    # Weak: the JSON we send is derived from the file, not the file itself
+    tag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"ETag": "W/" + tag, "Cache-Control": "no-cache"}
+    if tag in _if_none_match(request):
+        return Response(status_code=304, headers=headers)
+
+    result = await asyncio.to_thread(read_memory, filepath)
 
     if result is None:
         raise HTTPException(status_code=404, detail="Memory not found")
+    response.headers.update(headers)
     return result
 
 
@@ -638,5 +1112,16 @@ async def search_memories(q: str = ""):
     if not q.strip():
         raise HTTPException(status_code=400, detail="Search query required")
 
-    results = search_vault(q)
+    results = await asyncio.to_thread(search_vault, q)
     return {"results": results, "count": len(results)}
+
+
+# ============================================================================
+# FRONTEND — The main web interface (index.html)
+# ============================================================================
+
+# Mounted last, so every API route above gets the first chance to match.
+# With html=True, "GET /" serves index.html. StaticFiles also answers a
+# reload with "304 Not Modified" when the browser's cached copy (checked
+# by ETag / Last-Modified) is still current.
+app.mount("/", StaticFiles(directory=str(static_dir), html=True), name="frontend")